@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Recall@k of two-stage candidate retrieval against exhaustive matching
+
+Usage: python -m benchmarks.candidate_recall [--pool 20000] [--projects 20]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.project_matching import ProjectMatchingEngine
+from src.ai_engine import AIMatchingEngine
+from src.candidate_retrieval import recall_at_k
+from src.ranking import top_k_indices
+from src.skill_index import skill_text
+from benchmarks import synthetic
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def advanced_engine_ranking(engine, records, project, k, candidate_limit):
+    if candidate_limit is None:
+        candidates = records
+    else:
+        ids = set(engine.shortlist_candidates(project['required_skills'], candidate_limit))
+        candidates = [record for record in records if record['id'] in ids]
+
+    skill_vectors = engine.skill_index.vectors_for([record['id'] for record in candidates])
+    scores = engine.calculate_match_scores(candidates, project, skill_vectors)
+    return [candidates[i]['id'] for i in top_k_indices(scores, k)]
+
+
+def report(name, recalls, exact_ms, staged_ms):
+    print(f"{name:<24} recall@k={np.mean(recalls):.3f} (min {np.min(recalls):.3f})  "
+          f"exhaustive={np.mean(exact_ms):8.1f} ms  two-stage={np.mean(staged_ms):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pool', type=int, default=20000)
+    parser.add_argument('--projects', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--candidate-limit', type=int, default=300)
+    args = parser.parse_args()
+
+    records = synthetic.freelancer_records(args.pool)
+    projects = synthetic.project_records(args.projects)
+    print(f"pool={args.pool} projects={args.projects} k={args.k} candidate_limit={args.candidate_limit}")
+
+    advanced = AdvancedMatchingEngine()
+    advanced.skill_index.fit({record['id']: skill_text(record['skills']) for record in records})
+    recalls, exact_ms, staged_ms = [], [], []
+    for project in projects:
+        exact, elapsed = timed(advanced_engine_ranking, advanced, records, project, args.k, None)
+        exact_ms.append(elapsed)
+        staged, elapsed = timed(advanced_engine_ranking, advanced, records, project, args.k, args.candidate_limit)
+        staged_ms.append(elapsed)
+        recalls.append(recall_at_k(exact, staged, args.k))
+    report('AdvancedMatchingEngine', recalls, exact_ms, staged_ms)
+
+    matching = ProjectMatchingEngine()
+    users = synthetic.project_matching_users(records)
+    # Profile refresh hooks keep the shortlist postings current in the app
+    for user in users:
+        matching.candidate_index.upsert(user['id'], user['skills'])
+    recalls, exact_ms, staged_ms = [], [], []
+    for project in projects:
+        project = synthetic.project_matching_project(project)
+        exact, elapsed = timed(matching.find_best_matches, project, users, args.k)
+        exact_ms.append(elapsed)
+        staged, elapsed = timed(matching.find_best_matches, project, users, args.k, args.candidate_limit)
+        staged_ms.append(elapsed)
+        recalls.append(recall_at_k([m['user_id'] for m in exact], [m['user_id'] for m in staged], args.k))
+    report('ProjectMatchingEngine', recalls, exact_ms, staged_ms)
+
+    ai_engine = AIMatchingEngine()
+    freelancers = synthetic.ai_engine_freelancers(records)
+    for freelancer in freelancers:
+        ai_engine.update_freelancer_index(freelancer)
+    recalls, exact_ms, staged_ms = [], [], []
+    for project in projects:
+        project = synthetic.ai_engine_project(project)
+        exact, elapsed = timed(ai_engine.find_best_matches, project, freelancers, args.k)
+        exact_ms.append(elapsed)
+        staged, elapsed = timed(ai_engine.find_best_matches, project, freelancers, args.k, args.candidate_limit)
+        staged_ms.append(elapsed)
+        recalls.append(recall_at_k([m['freelancer_id'] for m in exact], [m['freelancer_id'] for m in staged], args.k))
+    report('AIMatchingEngine', recalls, exact_ms, staged_ms)
+
+
+if __name__ == '__main__':
+    main()
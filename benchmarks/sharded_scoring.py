@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of sharded match scoring across worker process counts
+
+Usage: python -m benchmarks.sharded_scoring [--pool 200000] [--workers 1,2,4,8]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.sharded_scoring import ShardedMatchScorer
+from src.skill_index import skill_text
+from benchmarks import synthetic
+
+
+def fitted_engine(records, seed=0):
+    """
+    Engine with a fitted vectorizer and success model, so scoring runs the forest
+    """
+    engine = AdvancedMatchingEngine()
+    engine.skill_index.fit({record['id']: skill_text(record['skills']) for record in records})
+    rng = np.random.default_rng(seed)
+    X = rng.random((5000, 5))
+    engine.scaler.fit(X)
+    engine.success_model.fit(engine.scaler.transform(X), X[:, 2] * 0.6 + X[:, 3] * 0.4)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pool', type=int, default=200000)
+    parser.add_argument('--projects', type=int, default=5)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--min-rows-per-shard', type=int, default=20000)
+    args = parser.parse_args()
+
+    records = synthetic.freelancer_records(args.pool)
+    projects = synthetic.project_records(args.projects)
+    engine = fitted_engine(records)
+    skill_vectors = engine.skill_index.vectors_for([record['id'] for record in records])
+    print(f"pool={args.pool} projects={args.projects} k={args.k} cpus={os.cpu_count()}")
+
+    baseline = None
+    for workers in [int(value) for value in args.workers.split(',')]:
+        scorer = ShardedMatchScorer(engine, workers, args.min_rows_per_shard)
+        # Warm the pool so process start-up is not timed
+        scorer.score(records, projects[0], args.k, skill_vectors)
+
+        elapsed = []
+        for project in projects:
+            start = time.perf_counter()
+            scorer.score(records, project, args.k, skill_vectors)
+            elapsed.append((time.perf_counter() - start) * 1000)
+        scorer.shutdown()
+
+        mean_ms = np.mean(elapsed)
+        baseline = baseline or mean_ms
+        print(f"workers={workers:<3} shards={len(scorer.shard_bounds(args.pool)):<3} "
+              f"{mean_ms:9.1f} ms/project  speedup={baseline / mean_ms:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
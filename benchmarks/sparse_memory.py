@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Peak RSS of the matching text pipeline with dense and with sparse TF-IDF rows
+
+Each mode runs in its own process so its peak resident set size is measured
+in isolation. The dense mode reproduces the earlier code paths: one
+toarray() row per profile, dense cosine similarity and KMeans on a dense
+matrix. The sparse mode keeps every step on CSR matrices.
+
+Usage: python -m benchmarks.sparse_memory [--profiles 100000]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.ai_engine import AIMatchingEngine
+from benchmarks import synthetic
+
+
+def profile_texts(records):
+    return [
+        ' '.join(record['skills']) + f" {record['location']} freelancer with {record['experience_years']} years"
+        for record in records
+    ]
+
+
+def numeric_columns(records):
+    return np.array([
+        [record['experience_years'], record['hourly_rate'], record['completion_rate'], record['average_rating']]
+        for record in records
+    ], dtype=float)
+
+
+def run_dense(engine, texts, numeric, project_text):
+    vectors = np.vstack([engine.tfidf_vectorizer.transform([text]).toarray()[0] for text in texts])
+    project_vector = engine.tfidf_vectorizer.transform([project_text]).toarray()
+    similarity = cosine_similarity(vectors, project_vector).ravel()
+    features = np.hstack([vectors, numeric])
+    KMeans(n_clusters=10, n_init=1, random_state=0).fit(vectors)
+    return similarity, features.shape
+
+
+def run_sparse(engine, texts, numeric, project_text):
+    vectors = engine.extract_text_features_batch(texts)
+    similarity = cosine_similarity(vectors, engine.extract_text_features_sparse(project_text)).ravel()
+    features = engine.combine_features(vectors, numeric)
+    KMeans(n_clusters=10, n_init=1, random_state=0).fit(vectors)
+    return similarity, features.shape
+
+
+def measure(mode, profiles):
+    records = synthetic.freelancer_records(profiles)
+    texts = profile_texts(records)
+    numeric = numeric_columns(records)
+    engine = AIMatchingEngine()
+    engine.tfidf_vectorizer.fit(texts)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    run = run_dense if mode == 'dense' else run_sparse
+    similarity, shape = run(engine, texts, numeric, 'python django postgresql api')
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'mode': mode,
+        'profiles': profiles,
+        'feature_shape': list(shape),
+        'seconds': round(elapsed, 2),
+        'baseline_rss_mb': round(baseline_kb / 1024, 1),
+        'peak_rss_mb': round(peak_kb / 1024, 1),
+        'similarity_checksum': round(float(similarity.sum()), 6)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profiles', type=int, default=100000)
+    parser.add_argument('--mode', choices=['dense', 'sparse'])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.profiles)))
+        return
+
+    for mode in ('dense', 'sparse'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sparse_memory', '--profiles', str(args.profiles), '--mode', mode],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<7} peak RSS={result['peak_rss_mb']:8.1f} MB  (baseline {result['baseline_rss_mb']:.1f} MB)  "
+              f"time={result['seconds']:6.2f} s  features={result['feature_shape']}  "
+              f"checksum={result['similarity_checksum']}")
+
+
+if __name__ == '__main__':
+    main()
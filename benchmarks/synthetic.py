@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic freelancer pools and projects for the matching benchmarks
+"""
+
+import json
+import numpy as np
+
+SKILLS = [
+    'python', 'django', 'flask', 'react', 'vue', 'angular', 'node', 'typescript',
+    'sql', 'postgresql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws', 'gcp',
+    'azure', 'terraform', 'machine learning', 'deep learning', 'nlp', 'computer vision',
+    'tensorflow', 'pytorch', 'pandas', 'spark', 'java', 'kotlin', 'swift', 'go',
+    'rust', 'c++', 'php', 'laravel', 'ruby', 'rails', 'graphql', 'rest api',
+    'ui design', 'ux research', 'figma', 'seo', 'copywriting', 'data analysis',
+    'tableau', 'power bi', 'excel', 'blockchain', 'solidity', 'unity'
+]
+LOCATIONS = ['', 'cairo', 'dubai', 'riyadh', 'london', 'berlin']
+LEVELS = ['beginner', 'intermediate', 'advanced', 'expert']
+
+
+def freelancer_records(count, seed=0):
+    """
+    Freelancer dicts shaped like the rows find_matches_for_project builds
+    """
+    rng = np.random.default_rng(seed)
+    # Zipf-like skill popularity so some skills are common and some rare
+    popularity = 1.0 / np.arange(1, len(SKILLS) + 1)
+    popularity /= popularity.sum()
+    records = []
+    for i in range(count):
+        skills = list(rng.choice(SKILLS, rng.integers(1, 7), replace=False, p=popularity))
+        records.append({
+            'id': f'freelancer-{i}',
+            'skills': skills,
+            'experience_years': int(rng.integers(0, 15)),
+            'hourly_rate': int(rng.integers(10, 150)),
+            'availability_hours_per_week': int(rng.integers(5, 45)),
+            'location': str(rng.choice(LOCATIONS)),
+            'completion_rate': float(rng.uniform(0.5, 1.0)),
+            'average_rating': float(rng.uniform(2.5, 5.0))
+        })
+    return records
+
+
+def project_records(count, seed=1):
+    """
+    Project dicts for AdvancedMatchingEngine scoring
+    """
+    rng = np.random.default_rng(seed)
+    projects = []
+    for i in range(count):
+        projects.append({
+            'id': f'project-{i}',
+            'required_skills': list(rng.choice(SKILLS, rng.integers(2, 6), replace=False)),
+            'budget_max': int(rng.integers(1000, 50000)),
+            'estimated_hours': int(rng.integers(20, 400)),
+            'complexity_level': int(rng.integers(1, 5)),
+            'urgency_level': int(rng.integers(1, 4))
+        })
+    return projects
+
+
+def project_matching_users(records):
+    """
+    Convert freelancer records to the user dicts ProjectMatchingEngine expects
+    """
+    return [
+        {
+            'id': record['id'],
+            'skills': record['skills'],
+            'experience_years': record['experience_years'],
+            'hourly_rate': record['hourly_rate'],
+            'availability_hours': record['availability_hours_per_week'],
+            'rating': record['average_rating'],
+            'location': record['location']
+        }
+        for record in records
+    ]
+
+
+def project_matching_project(project):
+    """
+    Convert a project record to the dict ProjectMatchingEngine expects
+    """
+    return {
+        'id': project['id'],
+        'title': 'Benchmark project',
+        'required_skills': project['required_skills'],
+        'budget_range': project['budget_max'],
+        'duration_weeks': max(project['estimated_hours'] // 40, 1),
+        'complexity_level': LEVELS[min(project['complexity_level'], 4) - 1]
+    }
+
+
+class Profile:
+    """
+    Minimal stand-in for the ORM objects AIMatchingEngine reads
+    """
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+    def get_skills(self):
+        return json.loads(self.skills)
+
+    def get_required_skills(self):
+        return json.loads(self.required_skills)
+
+
+def ai_engine_freelancers(records, seed=2):
+    """
+    Convert freelancer records to AIMatchingEngine freelancer objects
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        Profile(
+            id=record['id'],
+            skills=json.dumps({skill: str(rng.choice(LEVELS)) for skill in record['skills']}),
+            hourly_rate=record['hourly_rate'],
+            projects_completed=int(rng.integers(0, 80)),
+            average_rating=record['average_rating']
+        )
+        for record in records
+    ]
+
+
+def ai_engine_project(project):
+    """
+    Convert a project record to an AIMatchingEngine project object
+    """
+    return Profile(
+        id=project['id'],
+        required_skills=json.dumps(project['required_skills']),
+        budget_min=project['budget_max'] // 2,
+        budget_max=project['budget_max'],
+        experience_level=LEVELS[min(project['complexity_level'], 4) - 1]
+    )
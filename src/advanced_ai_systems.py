@@ -1,41 +1,180 @@
-from .models import db, User, Project, Match
+from .models import db, Project, Match
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 import json
 import datetime
+import logging
+import pickle
+import time
 import uuid
+from .skill_index import SkillVectorIndex, skill_text
+from .feature_store import FreelancerFeatureStore
+from .ranking import top_k_indices
+from .match_cache import match_cache
+from .scoring_pipeline import ScoringPipeline
 
 class AdvancedMatchingEngine:
     """
     Advanced AI-powered matching engine for NeuraSynth Studios
     """
 
-    def __init__(self):
+    # Name of the fitted component set in the model artifact store
+    ARTIFACT_NAME = 'advanced_matching'
+
+    # Layout of the packed per-freelancer array used by batch scoring
+    FREELANCER_COLUMNS = (
+        'experience_years', 'hourly_rate', 'availability_hours_per_week', 'completion_rate',
+        'skill_similarity', 'location_preference', 'skill_failed', 'experience_missing',
+        'rate_missing', 'availability_missing', 'completion_missing'
+    )
+
+    # Completion rate of freelancers without one, at request time and in training
+    DEFAULT_COMPLETION_RATE = 0.8
+
+    def __init__(self, skill_index=None, feature_store=None):
         """
         Initialize the advanced matching engine
         """
-        self.feature_weights = {
-            'skill_similarity': 0.35,
-            'experience_match': 0.25,
-            'budget_compatibility': 0.20,
-            'availability_match': 0.10,
-            'location_preference': 0.05,
-            'success_prediction': 0.05
-        }
-        self.skill_vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
+        self.scoring_pipeline = ScoringPipeline(
+            'advanced_matching',
+            weights={
+                'skill_similarity': 0.35,
+                'experience_match': 0.25,
+                'budget_compatibility': 0.20,
+                'availability_match': 0.10,
+                'location_preference': 0.05,
+                'success_prediction': 0.05
+            },
+            clip=(0.0, 1.0),
+            parameter_names={
+                'skill': 'skill_similarity',
+                'experience': 'experience_match',
+                'budget': 'budget_compatibility',
+                'success_prediction': 'success_prediction'
+            }
         )
+        self.scoring_pipeline.register('profile_features', self._profile_features_stage)
+        self.skill_index = skill_index or SkillVectorIndex()
+        self.skill_vectorizer = self.skill_index.vectorizer
+        self.feature_store = feature_store or FreelancerFeatureStore()
+        self.logger = logging.getLogger(__name__)
         self.success_model = RandomForestRegressor(
             n_estimators=100,
             random_state=42
         )
         self.scaler = StandardScaler()
+        self.model_store = None
+        self.model_version = None
+        self.model_check_interval = 5.0
+        self._model_checked_at = 0.0
+        self.sharded_scorer = None
+
+    @property
+    def feature_weights(self):
+        """
+        Weights of the scoring pipeline, by feature name
+        """
+        return self.scoring_pipeline.weights
+
+    @feature_weights.setter
+    def feature_weights(self, weights):
+        self.scoring_pipeline.set_weights(weights)
+        match_cache.invalidate_pool()
+
+    def apply_optimizer_parameters(self, parameters):
+        """
+        Reweight scoring from PerformanceOptimizer matching_engine parameters
+        """
+        changed = self.scoring_pipeline.apply_parameters(parameters)
+        if changed:
+            match_cache.invalidate_pool()
+        return changed
+
+    def _profile_features_stage(self, batch):
+        """
+        Pipeline stage producing the six profile features of feature_block
+        """
+        return self.feature_block(**batch)
+
+    def enable_sharding(self, workers=None, min_rows_per_shard=20000):
+        """
+        Score large pools across worker processes in find_matches_for_project
+        """
+        from .sharded_scoring import ShardedMatchScorer
+        if self.sharded_scorer is not None:
+            self.sharded_scorer.shutdown(wait=False)
+        self.sharded_scorer = ShardedMatchScorer(self, workers, min_rows_per_shard)
+        return self.sharded_scorer
+
+    def attach_model_store(self, store, check_interval=5.0):
+        """
+        Use a ModelArtifactStore and load its current version, if any
+        """
+        self.model_store = store
+        self.model_check_interval = check_interval
+        return self.reload_models(force=True)
+
+    def save_models(self, version=None, metadata=None):
+        """
+        Save the fitted vectorizer, success model and scaler as a new version
+        """
+        version = self.model_store.save(
+            self.ARTIFACT_NAME,
+            {
+                'skill_vectorizer': self.skill_vectorizer,
+                'success_model': self.success_model,
+                'scaler': self.scaler
+            },
+            version=version,
+            metadata=metadata
+        )
+        self.model_version = version
+        return version
+
+    def reload_models(self, force=False):
+        """
+        Hot-swap to the store's current version if it has moved
+
+        Checks at most once per model_check_interval seconds unless forced.
+        Components are loaded memory mapped and swapped in only once all of
+        them are read. Returns True when a new version was loaded.
+        """
+        if self.model_store is None:
+            return False
+
+        now = time.monotonic()
+        if not force and now - self._model_checked_at < self.model_check_interval:
+            return False
+        self._model_checked_at = now
+
+        version = None
+        try:
+            version = self.model_store.current_version(self.ARTIFACT_NAME)
+            if not version or version == self.model_version:
+                return False
+
+            components = self.model_store.load(self.ARTIFACT_NAME, version)
+            self.skill_index.use_vectorizer(components['skill_vectorizer'])
+            self.skill_vectorizer = components['skill_vectorizer']
+            self.success_model = components['success_model']
+            self.scaler = components['scaler']
+            self.model_version = version
+
+            # Scores from the previous models must not be served again
+            match_cache.invalidate_pool()
+            return True
+
+        except (OSError, EOFError, ValueError, KeyError, AttributeError,
+                ImportError, pickle.UnpicklingError):
+            # Keep serving the models already loaded, but leave a trace of
+            # the artifact that could not be read
+            self.logger.exception(
+                f"Failed to load {self.ARTIFACT_NAME} models version {version}"
+            )
+            return False
 
     def extract_features(self, freelancer_data, project_data):
         """
@@ -97,7 +236,9 @@ class AdvancedMatchingEngine:
                 budget_adequacy = features['budget_compatibility']
                 timeline_realism = 1.0 - (project_data.get('urgency_level', 1) - 1) * 0.2
                 skill_match = features['skill_similarity']
-                freelancer_reliability = freelancer_data.get('completion_rate', 0.8)
+                freelancer_reliability = freelancer_data.get('completion_rate')
+                if freelancer_reliability is None:
+                    freelancer_reliability = self.DEFAULT_COMPLETION_RATE
                 project_clarity = 0.8
 
                 prediction_features = np.array([[
@@ -126,71 +267,506 @@ class AdvancedMatchingEngine:
 
         return features
 
+    def build_skill_index(self):
+        """
+        Build the freelancer skill index from the feature store
+
+        The vectorizer is fitted on the freelancer pool unless it has already
+        been fitted elsewhere and few enough new skills have arrived since.
+        """
+        self.feature_store.refresh()
+        documents = dict(zip(self.feature_store.user_ids, self.feature_store.skill_texts))
+        refit = not hasattr(self.skill_vectorizer, 'vocabulary_') or self.skill_index.needs_refit()
+        return self.skill_index.fit(documents, refit=refit)
+
+    def ensure_skill_index(self):
+        """
+        Build the skill index if it is missing or its vocabulary has gone stale
+        """
+        if not self.skill_index.is_fitted or self.skill_index.needs_refit():
+            self.build_skill_index()
+
+    def extract_features_batch(self, freelancers_data, project_data, skill_vectors=None):
+        """
+        Extract features for a whole candidate pool at once
+
+        Returns a dict of feature name -> NumPy array holding, row for row,
+        the values extract_features would produce for each freelancer.
+        skill_vectors may carry precomputed skill rows aligned with
+        freelancers_data, so only the project skills get vectorized.
+        """
+        if len(freelancers_data) == 0:
+            return {name: np.zeros(0) for name in self.feature_weights}
+
+        columns = self.freelancer_columns(freelancers_data, project_data, skill_vectors)
+        return self.features_from_columns(columns, project_data)
+
+    def freelancer_columns(self, freelancers_data, project_data, skill_vectors=None):
+        """
+        Pack the per-freelancer inputs of extract_features_batch into one array
+
+        One float row per freelancer, laid out as FREELANCER_COLUMNS, with
+        missing values as NaN plus a flag column each. Being a plain array,
+        it can be shared with worker processes and scored in slices by
+        features_from_columns.
+        """
+        def column(key, default):
+            values = [freelancer.get(key, default) for freelancer in freelancers_data]
+            return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+        freelancer_texts = [' '.join(freelancer.get('skills', [])) for freelancer in freelancers_data]
+        skill_similarity, skill_failed = self.skill_similarities(freelancer_texts, project_data, skill_vectors)
+
+        return self.pack_columns(
+            column('experience_years', 0),
+            column('hourly_rate', 0),
+            column('availability_hours_per_week', 40),
+            column('completion_rate', self.DEFAULT_COMPLETION_RATE),
+            skill_similarity,
+            self.location_preferences([freelancer.get('location', '') for freelancer in freelancers_data], project_data),
+            skill_failed
+        )
+
+    def store_columns(self, store, positions, project_data):
+        """
+        Packed columns for rows of a FreelancerFeatureStore
+
+        Same layout and values as freelancer_columns over the equivalent
+        dicts, read straight from the store arrays.
+        """
+        numeric = store.numeric[positions]
+        user_ids = [store.user_ids[position] for position in positions]
+        texts = [store.skill_texts[position] for position in positions]
+
+        skill_vectors = None
+        if self.skill_index.is_fitted:
+            skill_vectors = self.skill_index.vectors_for(user_ids, texts)
+        skill_similarity, skill_failed = self.skill_similarities(texts, project_data, skill_vectors)
+
+        return self.pack_columns(
+            numeric[:, store.NUMERIC_COLUMNS.index('experience_years')],
+            numeric[:, store.NUMERIC_COLUMNS.index('hourly_rate')],
+            numeric[:, store.NUMERIC_COLUMNS.index('availability_hours_per_week')],
+            numeric[:, store.NUMERIC_COLUMNS.index('completion_rate')],
+            skill_similarity,
+            self.location_preferences([store.locations[position] for position in positions], project_data),
+            skill_failed
+        )
+
+    def skill_similarities(self, freelancer_texts, project_data, skill_vectors=None):
+        """
+        Cosine similarity of each freelancer's skill text to the project skills
+
+        Returns (similarity, failed) arrays; failed marks rows where the
+        scalar path would have raised, e.g. with an unfitted vectorizer.
+        """
+        n = len(freelancer_texts)
+        project_skills = ' '.join(project_data.get('required_skills', []))
+
+        skill_similarity = np.zeros(n)
+        skill_failed = np.zeros(n, dtype=bool)
+        has_text = np.array([bool(text) for text in freelancer_texts], dtype=bool) & bool(project_skills)
+        if has_text.any():
+            rows = np.flatnonzero(has_text)
+            try:
+                if skill_vectors is not None:
+                    freelancer_vectors = skill_vectors[rows]
+                else:
+                    freelancer_vectors = self.skill_vectorizer.transform([freelancer_texts[i] for i in rows])
+                project_vector = self.skill_vectorizer.transform([project_skills])
+                skill_similarity[rows] = cosine_similarity(freelancer_vectors, project_vector).ravel()
+            except Exception:
+                skill_failed = has_text
+
+        return skill_similarity, skill_failed
+
+    def location_preferences(self, locations, project_data):
+        """
+        Location preference per freelancer location
+        """
+        location_preference = np.full(len(locations), 0.7)
+        project_location = project_data.get('location', '')
+        if project_location:
+            for i, freelancer_location in enumerate(locations):
+                if freelancer_location:
+                    location_preference[i] = 1.0 if freelancer_location == project_location else 0.5
+        return location_preference
+
+    def pack_columns(self, experience, rate, availability, completion_rate,
+                     skill_similarity, location_preference, skill_failed):
+        """
+        Lay out per-freelancer arrays as FREELANCER_COLUMNS
+
+        NaN marks a missing profile value and sets its flag column.
+        """
+        columns = np.zeros((len(experience), len(self.FREELANCER_COLUMNS)))
+        for name, values in (
+            ('experience_years', experience),
+            ('hourly_rate', rate),
+            ('availability_hours_per_week', availability),
+            ('completion_rate', completion_rate),
+            ('skill_similarity', skill_similarity),
+            ('location_preference', location_preference),
+            ('skill_failed', skill_failed),
+            ('experience_missing', np.isnan(experience)),
+            ('rate_missing', np.isnan(rate)),
+            ('availability_missing', np.isnan(availability)),
+            ('completion_missing', np.isnan(completion_rate))
+        ):
+            columns[:, self.FREELANCER_COLUMNS.index(name)] = values
+
+        return columns
+
+    def features_from_columns(self, columns, project_data):
+        """
+        Compute the feature arrays from packed freelancer columns
+
+        Any contiguous slice of the rows gives the same values as the full
+        array, which is what lets sharded scoring split the work.
+        """
+        features = self.scoring_pipeline.features({'columns': columns, 'projects_data': [project_data]})
+        return {name: values[:, 0] for name, values in features.items()}
+
+    def feature_block(self, columns, projects_data, skill_similarity=None, skill_failed=None,
+                      location_preference=None):
+        """
+        Feature arrays of shape (freelancers, projects) for several projects
+
+        The project-dependent inputs packed in columns are only valid for a
+        single project; for a block they are passed as (freelancers,
+        projects) arrays instead. The success model runs once over every
+        predictable pair.
+        """
+        n, m = len(columns), len(projects_data)
+        column = dict(zip(self.FREELANCER_COLUMNS, columns.T))
+        experience = column['experience_years'][:, None]
+        rate = column['hourly_rate'][:, None]
+        availability = column['availability_hours_per_week'][:, None]
+        completion_rate = np.where(
+            column['completion_missing'] != 0, self.DEFAULT_COMPLETION_RATE, column['completion_rate']
+        )[:, None]
+
+        if skill_similarity is None:
+            skill_similarity = column['skill_similarity'][:, None]
+            skill_failed = column['skill_failed'][:, None] != 0
+        if location_preference is None:
+            location_preference = column['location_preference'][:, None]
+        skill_similarity = np.array(np.broadcast_to(skill_similarity, (n, m)), dtype=float)
+        location_preference = np.array(np.broadcast_to(location_preference, (n, m)), dtype=float)
+
+        def project_values(key, default):
+            return [project_data.get(key, default) for project_data in projects_data]
+
+        complexity = project_values('complexity_level', 1)
+        urgency = project_values('urgency_level', 1)
+        budget_max = project_values('budget_max', 0)
+        estimated_hours = project_values('estimated_hours', 40)
+
+        # Rows where the scalar path would raise and fall back to neutral scores
+        fallback = (
+            np.asarray(skill_failed, dtype=bool) | (column['experience_missing'] != 0)[:, None] |
+            (column['availability_missing'] != 0)[:, None] | (column['rate_missing'] != 0)[:, None]
+        )
+        fallback = np.array(np.broadcast_to(fallback, (n, m)))
+
+        # Projects without complexity or urgency fall back for every freelancer
+        project_invalid = np.array([c is None or u is None for c, u in zip(complexity, urgency)])
+        fallback[:, project_invalid] = True
+        complexity = np.array([1 if invalid else c for c, invalid in zip(complexity, project_invalid)], dtype=float)
+        urgency = np.array([1 if invalid else u for u, invalid in zip(urgency, project_invalid)], dtype=float)
+
+        required_experience = complexity * 2
+        experience_match = np.minimum(experience / np.maximum(required_experience, 1), 1.0)
+
+        with np.errstate(invalid='ignore'):
+            rate_positive = rate > 0
+        budget_missing = np.array([budget is None for budget in budget_max])
+        budget_positive = np.array([budget is not None and budget > 0 for budget in budget_max])
+        hours_missing = np.array([hours is None for hours in estimated_hours])
+        hours_positive = np.array([hours is not None and hours > 0 for hours in estimated_hours])
+        fallback |= rate_positive & (budget_missing | (budget_positive & hours_missing))
+
+        budget_compatibility = np.full((n, m), 0.5)
+        priced = budget_positive & hours_positive
+        if priced.any():
+            budget = np.array([budget if ok else 0 for budget, ok in zip(budget_max, priced)], dtype=float)
+            hours = np.array([hours if ok else 1 for hours, ok in zip(estimated_hours, priced)], dtype=float)
+            pairs = rate_positive & priced
+            with np.errstate(invalid='ignore', divide='ignore'):
+                compatibility = np.minimum(budget / (rate * hours), 1.0)
+            budget_compatibility[pairs] = compatibility[pairs]
+
+        required_availability = urgency * 10
+        availability_match = np.minimum(availability / np.maximum(required_availability, 1), 1.0)
+
+        success_prediction = np.full((n, m), 0.7)
+        timeline_realism = 1.0 - (urgency - 1) * 0.2
+        project_clarity = 0.8
+        prediction_features = np.stack([
+            budget_compatibility,
+            np.broadcast_to(timeline_realism, (n, m)),
+            skill_similarity,
+            np.broadcast_to(completion_rate, (n, m)),
+            np.full((n, m), project_clarity)
+        ], axis=-1)
+
+        predictable = ~fallback
+        if predictable.any():
+            try:
+                prediction_features_scaled = self.scaler.transform(prediction_features[predictable])
+                predictions = self.success_model.predict(prediction_features_scaled)
+                success_prediction[predictable] = np.clip(predictions, 0, 1)
+            except Exception:
+                pass
+
+        features = {
+            'skill_similarity': skill_similarity,
+            'experience_match': np.array(np.broadcast_to(experience_match, (n, m))),
+            'budget_compatibility': budget_compatibility,
+            'availability_match': np.array(np.broadcast_to(availability_match, (n, m))),
+            'location_preference': location_preference,
+            'success_prediction': success_prediction
+        }
+
+        for values in features.values():
+            values[fallback] = 0.5
+
+        return features
+
+    def calculate_match_scores(self, freelancers_data, project_data, skill_vectors=None):
+        """
+        Calculate overall match scores for a whole candidate pool
+
+        Vectorized counterpart of calculate_match_score; returns one score per
+        freelancer in the order given.
+        """
+        features = self.extract_features_batch(freelancers_data, project_data, skill_vectors)
+        return self.weighted_scores(features, len(freelancers_data))
+
+    def weighted_scores(self, features, shape):
+        """
+        Combine feature arrays into clipped scores using feature_weights
+        """
+        return self.scoring_pipeline.combine(features, shape)
+
     def calculate_match_score(self, freelancer_data, project_data):
         """
         Calculate overall match score between freelancer and project
         """
         try:
             features = self.extract_features(freelancer_data, project_data)
+            return self.scoring_pipeline.score_one(features)
 
-            total_score = 0.0
-            for feature_name, weight in self.feature_weights.items():
-                feature_value = features.get(feature_name, 0.0)
-                total_score += feature_value * weight
+        except Exception as e:
+            return 0.0
 
-            total_score = max(0.0, min(1.0, total_score))
+    def shortlist_candidates(self, project_skills, candidate_limit):
+        """
+        Ids of the candidate_limit freelancers most similar to the project skills
 
-            return total_score
+        Stage one of two-stage matching: a single sparse product against the
+        skill index, no per-freelancer feature extraction.
+        """
+        user_ids, similarities = self.skill_index.similarity(skill_text(project_skills))
+        return [user_ids[i] for i in top_k_indices(similarities, candidate_limit)]
 
-        except Exception as e:
-            return 0.0
+    def save_matches(self, project_id, user_ids, scores, top_k=None):
+        """
+        Replace the stored matches of a project in one bulk write
 
-    def find_matches_for_project(self, project_id, max_matches=10):
+        Previous rows for the project are deleted and the new ones inserted
+        with a single executemany in the same transaction, so re-running
+        matching never piles up duplicates. With top_k set only the best
+        top_k matches are stored.
+        """
+        return self.save_matches_batch(user_ids, {project_id: scores}, top_k)[project_id]
+
+    def save_matches_batch(self, user_ids, scores_by_project, top_k=None):
+        """
+        Replace the stored matches of several projects in one transaction
+
+        scores_by_project maps project id to scores aligned with user_ids.
+        Either every project's matches are replaced or, on error, none are.
+        Returns the number of rows stored per project.
+        """
+        rows = []
+        counts = {}
+        for project_id, scores in scores_by_project.items():
+            indices = top_k_indices(scores, top_k) if top_k else range(len(user_ids))
+            counts[project_id] = len(indices)
+            rows.extend(
+                {
+                    'id': str(uuid.uuid4()),
+                    'project_id': project_id,
+                    'user_id': user_ids[i],
+                    'score': float(scores[i])
+                }
+                for i in indices
+            )
+
+        try:
+            match_table = Match.__table__
+            db.session.execute(match_table.delete().where(match_table.c.project_id.in_(list(counts))))
+            if rows:
+                db.session.execute(match_table.insert(), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return counts
+
+    def project_data(self, project):
+        """
+        Scoring inputs of a Project row
+        """
+        return {
+            'required_skills': project.required_skills.split(',') if project.required_skills else [],
+            'budget_max': project.budget_max,
+            'estimated_hours': project.estimated_hours,
+            'complexity_level': project.complexity_level,
+            'urgency_level': project.urgency_level
+        }
+
+    def find_matches_for_projects(self, project_ids, max_matches=10, persist_top_k=None, chunk_size=20000):
+        """
+        Find best freelancer matches for several projects in one pass
+
+        The whole freelancer pool is scored against every project as a
+        freelancers x projects block: one sparse product for skill
+        similarity and one success-model call per chunk of chunk_size
+        freelancers. Returns a dict of project id -> matches, with an empty
+        list for unknown projects. Matches of all projects are stored in one
+        transaction; errors propagate so a partial batch is never reported
+        as complete.
+        """
+        results = {project_id: [] for project_id in project_ids}
+
+        self.reload_models()
+
+        projects = Project.query.filter(Project.id.in_(list(results))).all()
+        if not projects:
+            return results
+        projects_data = [self.project_data(project) for project in projects]
+
+        store = self.feature_store
+        store.refresh()
+
+        self.ensure_skill_index()
+
+        n, m = len(store), len(projects)
+        freelancer_ids = list(store.user_ids)
+        texts = list(store.skill_texts)
+        project_texts = [' '.join(project_data['required_skills']) for project_data in projects_data]
+
+        has_text = (
+            np.array([bool(text) for text in texts], dtype=bool)[:, None] &
+            np.array([bool(text) for text in project_texts], dtype=bool)[None, :]
+        )
+        skill_similarity = np.zeros((n, m))
+        skill_failed = np.zeros((n, m), dtype=bool)
+        if has_text.any():
+            try:
+                if self.skill_index.is_fitted:
+                    freelancer_vectors = self.skill_index.vectors_for(freelancer_ids, texts)
+                else:
+                    freelancer_vectors = self.skill_vectorizer.transform(texts)
+                project_vectors = self.skill_vectorizer.transform(project_texts)
+                skill_similarity = np.where(has_text, cosine_similarity(freelancer_vectors, project_vectors), 0.0)
+            except Exception:
+                skill_failed = has_text
+
+        location_preference = np.column_stack([
+            self.location_preferences(store.locations, project_data) for project_data in projects_data
+        ]) if n else np.zeros((0, m))
+
+        columns = self.pack_columns(
+            store.column('experience_years'),
+            store.column('hourly_rate'),
+            store.column('availability_hours_per_week'),
+            store.column('completion_rate'),
+            np.zeros(n), np.full(n, 0.7), np.zeros(n)
+        )
+
+        match_scores = np.zeros((n, m))
+        for start in range(0, n, max(chunk_size, 1)):
+            stop = min(start + chunk_size, n)
+            features = self.scoring_pipeline.features({
+                'columns': columns[start:stop],
+                'projects_data': projects_data,
+                'skill_similarity': skill_similarity[start:stop],
+                'skill_failed': skill_failed[start:stop],
+                'location_preference': location_preference[start:stop]
+            })
+            match_scores[start:stop] = self.weighted_scores(features, (stop - start, m))
+
+        self.save_matches_batch(
+            freelancer_ids, {project.id: match_scores[:, j] for j, project in enumerate(projects)}, top_k=persist_top_k
+        )
+        for j, project in enumerate(projects):
+            scores = match_scores[:, j]
+            results[project.id] = [
+                {
+                    'freelancer_id': freelancer_ids[i],
+                    'match_score': float(scores[i])
+                }
+                for i in top_k_indices(scores, max_matches)
+            ]
+
+        return results
+
+    def find_matches_for_project(self, project_id, max_matches=10, candidate_limit=None, persist_top_k=None,
+                                 raise_errors=False):
         """
         Find best freelancer matches for a given project
+
+        With candidate_limit set, only the freelancers shortlisted from the
+        skill index get the full weighted scoring. persist_top_k limits how
+        many of the scored matches are written to the matches table. Errors
+        give an empty list unless raise_errors is set, so callers that track
+        the run can tell a failure from a project without matches.
         """
         try:
+            self.reload_models()
+
             project = Project.query.get(project_id)
             if not project:
                 return []
 
-            project_data = {
-                'required_skills': project.required_skills.split(','),
-                'budget_max': project.budget_max,
-                'estimated_hours': project.estimated_hours,
-                'complexity_level': project.complexity_level,
-                'urgency_level': project.urgency_level
-            }
+            project_data = self.project_data(project)
 
-            freelancers = User.query.filter_by(user_type='freelancer').all()
-            matches = []
-
-            for freelancer in freelancers:
-                freelancer_data = {
-                    'skills': freelancer.skills.split(','),
-                    'experience_years': freelancer.experience_years,
-                    'hourly_rate': freelancer.hourly_rate,
-                    'availability_hours_per_week': freelancer.availability_hours_per_week,
-                    'location': freelancer.location,
-                    'completion_rate': freelancer.completion_rate,
-                    'average_rating': freelancer.average_rating
-                }
+            store = self.feature_store
+            store.refresh()
 
-                match_score = self.calculate_match_score(freelancer_data, project_data)
+            self.ensure_skill_index()
 
-                match = Match(project_id=project_id, user_id=freelancer.id, score=match_score)
-                db.session.add(match)
+            if candidate_limit and self.skill_index.is_fitted and len(self.skill_index) > candidate_limit:
+                candidate_ids = self.shortlist_candidates(project_data['required_skills'], max(candidate_limit, max_matches))
+                positions = store.positions(candidate_ids)
+            else:
+                positions = np.arange(len(store))
 
-                matches.append({
-                    'freelancer_id': freelancer.id,
-                    'match_score': match_score
-                })
+            freelancer_ids = [store.user_ids[position] for position in positions]
+            columns = self.store_columns(store, positions, project_data)
 
-            db.session.commit()
+            if self.sharded_scorer is not None:
+                match_scores, best = self.sharded_scorer.score_columns(columns, project_data, max_matches)
+            else:
+                features = self.features_from_columns(columns, project_data)
+                match_scores = self.weighted_scores(features, len(columns))
+                best = top_k_indices(match_scores, max_matches)
 
-            matches.sort(key=lambda x: x['match_score'], reverse=True)
+            self.save_matches(project_id, freelancer_ids, match_scores, top_k=persist_top_k)
 
-            return matches[:max_matches]
+            return [
+                {
+                    'freelancer_id': freelancer_ids[i],
+                    'match_score': float(match_scores[i])
+                }
+                for i in best
+            ]
 
-        except Exception as e:
+        except Exception:
+            if raise_errors:
+                raise
             return []
@@ -8,11 +8,17 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.ensemble import RandomForestClassifier
 import pickle
 import os
+from .candidate_retrieval import CandidateSkillIndex, shortlist_indexed
+from .skill_registry import normalize_skill
+from .ranking import top_k_indices
+from .scoring_pipeline import ScoringPipeline
+from .profile_snapshot import ProfileSnapshotCache
 
 db = SQLAlchemy()
 
@@ -155,6 +161,62 @@ class AIMatchingEngine:
         self.tfidf_vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.matching_model = None
         self.is_trained = False
+        self.snapshots = ProfileSnapshotCache()
+        self.candidate_index = CandidateSkillIndex()
+        self.scoring_pipeline = ScoringPipeline(
+            'ai_matching',
+            weights={
+                'skill_match_score': 0.4,
+                'budget_match_score': 0.3,
+                'experience_match_score': 0.3
+            },
+            parameter_names={
+                'skill': 'skill_match_score',
+                'budget': 'budget_match_score',
+                'experience': 'experience_match_score'
+            }
+        )
+        self.scoring_pipeline.register('skill_match_score', self._skill_stage)
+        self.scoring_pipeline.register('budget_match_score', self._budget_stage)
+        self.scoring_pipeline.register('experience_match_score', self._experience_stage)
+    
+    def apply_optimizer_parameters(self, parameters):
+        """Reweight scoring from PerformanceOptimizer matching_engine parameters"""
+        return self.scoring_pipeline.apply_parameters(parameters)
+    
+    def update_freelancer_index(self, freelancer):
+        """Refresh the shortlist postings of a changed freelancer profile"""
+        snapshot = self.snapshots.freelancer(freelancer)
+        if snapshot.id is not None:
+            self.candidate_index.upsert(snapshot.id, snapshot.skills)
+    
+    def remove_freelancer_from_index(self, freelancer_id):
+        """Drop a freelancer from the shortlist postings and snapshot cache"""
+        self.candidate_index.remove(freelancer_id)
+        self.snapshots.invalidate('freelancer', freelancer_id)
+    
+    def _skill_stage(self, batch):
+        """Skill scores keep the per-freelancer level boost"""
+        project_set = batch['project'].skill_set
+        return np.array([
+            self.skill_match_from_sets(project_set, freelancer.skill_levels) for freelancer in batch['freelancers']
+        ], dtype=float)
+    
+    def _budget_stage(self, batch):
+        project = batch['project']
+        return self.budget_match_scores(
+            project.budget_min,
+            project.budget_max,
+            np.array([freelancer.hourly_rate for freelancer in batch['freelancers']], dtype=float)
+        )
+    
+    def _experience_stage(self, batch):
+        freelancers = batch['freelancers']
+        return self.experience_match_scores(
+            batch['project'].experience_level,
+            np.array([freelancer.projects_completed for freelancer in freelancers], dtype=float),
+            np.array([freelancer.average_rating for freelancer in freelancers], dtype=float)
+        )
     
     def extract_text_features(self, text):
         """Extract text features using TF-IDF"""
@@ -168,14 +230,54 @@ class AIMatchingEngine:
             # If vectorizer is not fitted, return zeros
             return np.zeros(1000)
     
+    def extract_text_features_sparse(self, text):
+        """Extract text features using TF-IDF, as a 1 x n_features CSR row"""
+        return self.extract_text_features_batch([text])
+    
+    def extract_text_features_batch(self, texts):
+        """Extract TF-IDF features for many texts as one CSR matrix"""
+        texts = [text or '' for text in texts]
+        vocabulary = getattr(self.tfidf_vectorizer, 'vocabulary_', None)
+        if not vocabulary:
+            # If vectorizer is not fitted, return empty rows
+            return sparse.csr_matrix((len(texts), self.tfidf_vectorizer.max_features or 1000))
+        
+        return sparse.csr_matrix(self.tfidf_vectorizer.transform(texts))
+    
+    def text_similarity(self, texts, text):
+        """Cosine similarity of each text to one text, without densifying the vectors"""
+        return cosine_similarity(
+            self.extract_text_features_batch(texts),
+            self.extract_text_features_sparse(text)
+        ).ravel()
+    
+    def combine_features(self, text_features, numeric_features):
+        """Append numeric columns to sparse text features, keeping the result CSR"""
+        numeric_features = np.asarray(numeric_features, dtype=float).reshape(text_features.shape[0], -1)
+        return sparse.hstack([text_features, sparse.csr_matrix(numeric_features)], format='csr')
+    
+    def snapshot_batch(self, project, freelancers):
+        """Matching batch of decoded profile snapshots, from the cache where still current"""
+        return {
+            'project': self.snapshots.project(project),
+            'freelancers': [self.snapshots.freelancer(freelancer) for freelancer in freelancers]
+        }
+    
     def calculate_skill_match(self, project_skills, freelancer_skills):
         """Calculate skill matching score"""
         if not project_skills or not freelancer_skills:
             return 0.0
         
-        # Convert to sets for intersection calculation
-        project_set = set(project_skills) if isinstance(project_skills, list) else set()
-        freelancer_set = set(freelancer_skills.keys()) if isinstance(freelancer_skills, dict) else set()
+        # Convert to sets of canonical skill names for intersection calculation
+        project_set = set(normalize_skill(skill) for skill in project_skills) if isinstance(project_skills, list) else set()
+        freelancer_levels = {
+            normalize_skill(skill): level for skill, level in freelancer_skills.items()
+        } if isinstance(freelancer_skills, dict) else {}
+        return self.skill_match_from_sets(project_set, freelancer_levels)
+    
+    def skill_match_from_sets(self, project_set, freelancer_levels):
+        """Skill matching score of canonical project skills against canonical skill levels"""
+        freelancer_set = set(freelancer_levels)
         
         if not project_set or not freelancer_set:
             return 0.0
@@ -190,20 +292,19 @@ class AIMatchingEngine:
         base_score = intersection / union
         
         # Boost score based on skill levels
-        if isinstance(freelancer_skills, dict):
-            level_boost = 0.0
-            matched_skills = project_set.intersection(freelancer_set)
-            for skill in matched_skills:
-                level = freelancer_skills.get(skill, 'beginner')
-                if level == 'expert':
-                    level_boost += 0.3
-                elif level == 'advanced':
-                    level_boost += 0.2
-                elif level == 'intermediate':
-                    level_boost += 0.1
-            
-            level_boost = level_boost / len(matched_skills) if matched_skills else 0.0
-            base_score = min(1.0, base_score + level_boost)
+        level_boost = 0.0
+        matched_skills = project_set.intersection(freelancer_set)
+        for skill in matched_skills:
+            level = freelancer_levels.get(skill, 'beginner')
+            if level == 'expert':
+                level_boost += 0.3
+            elif level == 'advanced':
+                level_boost += 0.2
+            elif level == 'intermediate':
+                level_boost += 0.1
+        
+        level_boost = level_boost / len(matched_skills) if matched_skills else 0.0
+        base_score = min(1.0, base_score + level_boost)
         
         return base_score
     
@@ -235,6 +336,30 @@ class AIMatchingEngine:
                 # Way over budget
                 return 0.1
     
+    def budget_match_scores(self, project_budget_min, project_budget_max, freelancer_rate, estimated_hours=40):
+        """Array version of calculate_budget_match; None or NaN counts as missing"""
+        budget_min, budget_max, rate = np.broadcast_arrays(
+            np.asarray(project_budget_min, dtype=float),
+            np.asarray(project_budget_max, dtype=float),
+            np.asarray(freelancer_rate, dtype=float)
+        )
+        missing = np.isnan(budget_min) | np.isnan(budget_max) | np.isnan(rate) | \
+            (budget_min == 0) | (budget_max == 0) | (rate == 0)
+        
+        freelancer_total = rate * estimated_hours
+        with np.errstate(divide='ignore', invalid='ignore'):
+            under_budget = 0.7 + (0.3 * (freelancer_total / budget_min))
+        
+        return np.select(
+            [missing,
+             (freelancer_total <= budget_max) & (freelancer_total >= budget_min),
+             freelancer_total < budget_min,
+             freelancer_total <= budget_max * 1.2,
+             freelancer_total <= budget_max * 1.5],
+            [0.5, 1.0, under_budget, 0.6, 0.3],
+            default=0.1
+        )
+    
     def calculate_experience_match(self, project_experience_level, freelancer_projects_completed, freelancer_rating):
         """Calculate experience matching score"""
         if not project_experience_level:
@@ -272,14 +397,36 @@ class AIMatchingEngine:
         else:  # beginner
             return base_score
     
+    def experience_match_scores(self, project_experience_level, freelancer_projects_completed, freelancer_rating):
+        """Array version of calculate_experience_match over per-freelancer columns"""
+        completed = np.asarray(freelancer_projects_completed, dtype=float)
+        rating = np.asarray(freelancer_rating, dtype=float)
+        if not project_experience_level:
+            return np.full(np.broadcast(completed, rating).shape, 0.5)
+        
+        projects_score = np.select(
+            [completed >= 50, completed >= 20, completed >= 10, completed >= 5],
+            [1.0, 0.8, 0.6, 0.4],
+            default=0.2
+        )
+        has_rating = ~np.isnan(rating) & (rating != 0)
+        rating_score = np.where(has_rating, rating / 5.0, 0.5)
+        base_score = (projects_score + rating_score) / 2
+        
+        if project_experience_level == 'expert':
+            return np.where((completed >= 30) & (rating >= 4.5), base_score, base_score * 0.7)
+        elif project_experience_level == 'intermediate':
+            return np.where(completed >= 10, base_score, base_score * 0.8)
+        return base_score
+    
     def calculate_overall_match(self, project, freelancer):
         """Calculate overall matching score between project and freelancer"""
-        # Extract features
-        project_skills = project.get_required_skills() if hasattr(project, 'get_required_skills') else []
-        freelancer_skills = freelancer.get_skills() if hasattr(freelancer, 'get_skills') else {}
+        # Decoded snapshots, reused while the profiles are unchanged
+        project = self.snapshots.project(project)
+        freelancer = self.snapshots.freelancer(freelancer)
         
         # Calculate individual scores
-        skill_score = self.calculate_skill_match(project_skills, freelancer_skills)
+        skill_score = self.skill_match_from_sets(project.skill_set, freelancer.skill_levels)
         budget_score = self.calculate_budget_match(
             project.budget_min, 
             project.budget_max, 
@@ -291,60 +438,120 @@ class AIMatchingEngine:
             freelancer.average_rating
         )
         
-        # Weighted combination
-        weights = {
-            'skill': 0.4,
-            'budget': 0.3,
-            'experience': 0.3
+        scores = {
+            'skill_match_score': skill_score,
+            'budget_match_score': budget_score,
+            'experience_match_score': experience_score
         }
         
-        overall_score = (
-            skill_score * weights['skill'] +
-            budget_score * weights['budget'] +
-            experience_score * weights['experience']
-        )
-        
+        # Weighted combination
         return {
-            'overall_score': overall_score,
-            'skill_match_score': skill_score,
-            'budget_match_score': budget_score,
-            'experience_match_score': experience_score,
+            'overall_score': self.scoring_pipeline.score_one(scores),
+            **scores,
             'confidence_score': min(skill_score, budget_score, experience_score)  # Lowest score as confidence
         }
     
-    def find_best_matches(self, project, freelancers, limit=10):
-        """Find best matching freelancers for a project"""
-        matches = []
+    def find_best_matches(self, project, freelancers, limit=10, candidate_limit=None):
+        """Find best matching freelancers for a project
         
-        for freelancer in freelancers:
-            match_result = self.calculate_overall_match(project, freelancer)
-            match_result['freelancer_id'] = freelancer.id
-            match_result['freelancer'] = freelancer
-            matches.append(match_result)
+        With candidate_limit set, only the freelancers shortlisted by the
+        persistent candidate_index get the full match calculation;
+        update_freelancer_index keeps it current. Only the shortlisted
+        freelancers are snapshotted, so the cost follows the shortlist
+        rather than the pool.
+        """
+        if candidate_limit is not None:
+            positions = shortlist_indexed(
+                self.candidate_index, freelancers,
+                lambda freelancer: getattr(freelancer, 'id', None),
+                lambda freelancer: self.snapshots.freelancer(freelancer).skills,
+                self.snapshots.project(project).required_skills,
+                max(candidate_limit, limit)
+            )
+            freelancers = [freelancers[position] for position in positions]
         
-        # Sort by overall score
-        matches.sort(key=lambda x: x['overall_score'], reverse=True)
+        if not freelancers:
+            return []
+        batch = self.snapshot_batch(project, freelancers)
         
-        return matches[:limit]
+        # Every stage scores the whole list at once
+        overall_scores, features = self.scoring_pipeline.score(batch, len(freelancers))
+        
+        results = []
+        for i in top_k_indices(overall_scores, limit):
+            skill_score, budget_score, experience_score = (
+                float(features['skill_match_score'][i]),
+                float(features['budget_match_score'][i]),
+                float(features['experience_match_score'][i])
+            )
+            results.append({
+                'overall_score': float(overall_scores[i]),
+                'skill_match_score': skill_score,
+                'budget_match_score': budget_score,
+                'experience_match_score': experience_score,
+                'confidence_score': min(skill_score, budget_score, experience_score),
+                'freelancer_id': freelancers[i].id,
+                'freelancer': freelancers[i]
+            })
+        return results
     
     def predict_project_success(self, project, freelancer):
         """Predict the likelihood of project success"""
+        return float(self.predict_project_success_batch(project, [freelancer])[0])
+    
+    def predict_project_success_batch(self, project, freelancers, match_scores=None):
+        """Success probabilities of many freelancers for one project
+        
+        match_scores may hold match components already computed for these
+        freelancers, either as arrays keyed like the pipeline features or
+        as the result dicts of find_best_matches; only the components it
+        lacks are scored, in one pipeline pass.
+        """
         # This is a simplified prediction model
         # In a real implementation, this would use a trained ML model
+        if not freelancers:
+            return np.zeros(0)
         
-        match_scores = self.calculate_overall_match(project, freelancer)
+        if isinstance(match_scores, list):
+            match_scores = {
+                name: np.array([match[name] for match in match_scores], dtype=float)
+                for name in ('skill_match_score', 'budget_match_score', 'experience_match_score')
+            }
+        batch = self.snapshot_batch(project, freelancers)
+        freelancers = batch['freelancers']
+        scores = dict(match_scores or {})
+        missing = [name for name in ('skill_match_score', 'budget_match_score', 'experience_match_score') if name not in scores]
+        if missing:
+            scores.update(self.scoring_pipeline.features(batch, missing))
         
-        # Factors that influence success
-        factors = {
-            'skill_match': match_scores['skill_match_score'] * 0.3,
-            'experience': match_scores['experience_match_score'] * 0.25,
-            'budget_fit': match_scores['budget_match_score'] * 0.2,
-            'freelancer_rating': (freelancer.average_rating / 5.0) * 0.15,
-            'freelancer_completion_rate': min(1.0, freelancer.projects_completed / 10) * 0.1
-        }
+        # Unrated or new freelancers count as 0 rather than turning into NaN
+        ratings = np.array([freelancer.average_rating or 0 for freelancer in freelancers], dtype=float)
+        completed = np.array([freelancer.projects_completed or 0 for freelancer in freelancers], dtype=float)
         
-        success_probability = sum(factors.values())
-        return min(1.0, success_probability)
+        # Factors that influence success, summed in this order
+        factors = (
+            np.asarray(scores['skill_match_score'], dtype=float) * 0.3,
+            np.asarray(scores['experience_match_score'], dtype=float) * 0.25,
+            np.asarray(scores['budget_match_score'], dtype=float) * 0.2,
+            (ratings / 5.0) * 0.15,
+            np.minimum(1.0, completed / 10) * 0.1
+        )
+        success_probability = np.zeros(len(freelancers))
+        for factor in factors:
+            success_probability += factor
+        return np.minimum(1.0, success_probability)
+    
+    def predict_pairings_success(self, pairings):
+        """Success probabilities of (project, freelancer) pairings, batched per project"""
+        probabilities = np.zeros(len(pairings))
+        groups = {}
+        for position, (project, freelancer) in enumerate(pairings):
+            groups.setdefault(id(project), (project, [], []))
+            groups[id(project)][1].append(position)
+            groups[id(project)][2].append(freelancer)
+        for project, positions, freelancers in groups.values():
+            probabilities[positions] = self.predict_project_success_batch(project, freelancers)
+        return probabilities
     
     def generate_recommendations(self, user, user_type='freelancer'):
         """Generate AI-powered recommendations for users"""
@@ -32,6 +32,27 @@ def create_app(config_name='default'):
     db.init_app(app)
     CORS(app, origins=app.config.get('CORS_ORIGINS', '*'))
 
+    from .match_cache import match_cache
+    match_cache.configure(
+        max_entries=app.config.get('MATCH_CACHE_MAX_ENTRIES'),
+        ttl_seconds=app.config.get('MATCH_CACHE_TTL_SECONDS')
+    )
+
+    if app.config.get('MODEL_ARTIFACT_DIR'):
+        from .model_store import ModelArtifactStore
+        from .utils import ai_matching_engine
+        ai_matching_engine.attach_model_store(ModelArtifactStore(app.config['MODEL_ARTIFACT_DIR']))
+
+    if app.config.get('MATCH_SCORING_WORKERS', 0) > 1:
+        from .utils import ai_matching_engine
+        ai_matching_engine.enable_sharding(
+            workers=app.config['MATCH_SCORING_WORKERS'],
+            min_rows_per_shard=app.config.get('MATCH_ROWS_PER_SHARD', 20000)
+        )
+
+    from .match_training import train_match_model_command
+    app.cli.add_command(train_match_model_command)
+
     # Register blueprints
     from .main import main as main_blueprint
     app.register_blueprint(main_blueprint)
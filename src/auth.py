@@ -4,6 +4,7 @@ import datetime
 import uuid
 import json
 from .models import db, User
+from .user import refresh_freelancer_profile
 
 auth = Blueprint('auth', __name__)
 
@@ -45,6 +46,7 @@ class AuthManager:
             user = User(email=email, password=password, user_type=user_type)
             db.session.add(user)
             db.session.commit()
+            refresh_freelancer_profile(user)
 
             return {
                 'success': True,
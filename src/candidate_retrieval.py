@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Candidate Retrieval for NeuraSynth Matching
+Cheap first-stage shortlisting so full match scoring only runs on likely candidates
+"""
+
+import heapq
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Set
+from .skill_registry import normalize_skill
+
+
+def _skill_set(skills) -> FrozenSet[str]:
+    return frozenset(normalize_skill(skill) for skill in skills or [] if skill)
+
+
+def _rank(counts: Dict[int, int], required_count: int, skill_count: Callable[[int], int],
+          size: int, limit: int) -> List[int]:
+    """
+    The limit best positions by skill match, padded in position order, sorted
+
+    counts holds the overlap of every position sharing a required skill.
+    """
+    def skill_match(position):
+        overlap = counts[position]
+        jaccard = overlap / (required_count + skill_count(position) - overlap)
+        coverage = overlap / required_count
+        return 0.6 * jaccard + 0.4 * coverage
+
+    ranked = heapq.nsmallest(limit, counts, key=lambda position: (-skill_match(position), position))
+
+    if len(ranked) < limit:
+        for position in range(size):
+            if position not in counts:
+                ranked.append(position)
+                if len(ranked) == limit:
+                    break
+
+    return sorted(ranked)
+
+
+class InvertedSkillIndex:
+    """
+    Posting lists from skill to the positions of the candidates holding it
+
+    Candidates are ranked by the Jaccard/coverage blend of their skills
+    against the required ones, touching only the postings of those skills.
+    """
+
+    def __init__(self, candidate_skills: Optional[Iterable[Iterable[str]]] = None):
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.skill_counts: List[int] = []
+        self.size = 0
+        if candidate_skills is not None:
+            for skills in candidate_skills:
+                self.add(skills)
+
+    def add(self, skills: Iterable[str]) -> int:
+        """
+        Index the next candidate and return its position
+        """
+        position = self.size
+        normalized = _skill_set(skills)
+        for skill in normalized:
+            self.postings[skill].append(position)
+        self.skill_counts.append(len(normalized))
+        self.size += 1
+        return position
+
+    def overlap_counts(self, required_skills: Iterable[str]) -> Dict[int, int]:
+        """
+        Number of required skills held by every candidate with at least one
+        """
+        counts = defaultdict(int)
+        for skill in _skill_set(required_skills):
+            for position in self.postings.get(skill, ()):
+                counts[position] += 1
+        return counts
+
+    def shortlist(self, required_skills: Iterable[str], limit: int) -> List[int]:
+        """
+        Positions of the limit candidates with the best skill match
+
+        Returned in index order so the second stage breaks ties the same way
+        an exhaustive pass would. When too few candidates share a skill, the
+        list is padded with the remaining ones in index order so the second
+        stage still sees a full shortlist.
+        """
+        if limit >= self.size:
+            return list(range(self.size))
+
+        required = _skill_set(required_skills)
+        counts = self.overlap_counts(required)
+        return _rank(counts, len(required), self.skill_counts.__getitem__, self.size, limit)
+
+
+class CandidateSkillIndex:
+    """
+    Posting lists from skill to candidate ids, kept across requests
+
+    Unlike InvertedSkillIndex, which is built for one candidate list, this
+    index lives on an engine and is kept current with upsert and remove
+    from the hooks that refresh profiles. shortlist then ranks any pool of
+    indexed ids by touching only the postings of the required skills.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self.skills: Dict[Hashable, FrozenSet[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self.skills
+
+    def upsert(self, candidate_id, skills):
+        """
+        Index a new candidate or refresh a changed one's skills
+        """
+        normalized = _skill_set(skills)
+        with self._lock:
+            previous = self.skills.get(candidate_id)
+            if previous == normalized:
+                return
+            if previous is not None:
+                self._unpost(candidate_id, previous)
+            for skill in normalized:
+                self.postings[skill].add(candidate_id)
+            self.skills[candidate_id] = normalized
+
+    def remove(self, candidate_id):
+        """
+        Drop a candidate from the index
+        """
+        with self._lock:
+            previous = self.skills.pop(candidate_id, None)
+            if previous is not None:
+                self._unpost(candidate_id, previous)
+
+    def _unpost(self, candidate_id, skills):
+        for skill in skills:
+            posting = self.postings[skill]
+            posting.discard(candidate_id)
+            if not posting:
+                del self.postings[skill]
+
+    def shortlist(self, candidate_ids: Sequence[Hashable], required_skills: Iterable[str], limit: int) -> List[int]:
+        """
+        Positions in candidate_ids of the limit indexed candidates with the best skill match
+
+        Ranked and padded like InvertedSkillIndex.shortlist. Ids missing
+        from the index count as holding no skills.
+        """
+        if limit >= len(candidate_ids):
+            return list(range(len(candidate_ids)))
+
+        positions = {candidate_id: position for position, candidate_id in enumerate(candidate_ids)}
+        required = _skill_set(required_skills)
+        counts = defaultdict(int)
+        with self._lock:
+            for skill in required:
+                for candidate_id in self.postings.get(skill, ()):
+                    position = positions.get(candidate_id)
+                    if position is not None:
+                        counts[position] += 1
+            skill_counts = {position: len(self.skills[candidate_ids[position]]) for position in counts}
+        return _rank(counts, len(required), skill_counts.__getitem__, len(candidate_ids), limit)
+
+
+def shortlist_positions(candidate_skills: Sequence[Iterable[str]], required_skills: Iterable[str],
+                        limit: Optional[int]) -> List[int]:
+    """
+    Stage one of two-stage matching over an in-memory candidate list
+
+    Returns every position when limit is None or covers the whole pool.
+    """
+    if limit is None or limit >= len(candidate_skills):
+        return list(range(len(candidate_skills)))
+    return InvertedSkillIndex(candidate_skills).shortlist(required_skills, limit)
+
+
+def shortlist_indexed(index: CandidateSkillIndex, candidates: Sequence, candidate_id: Callable,
+                      candidate_skills: Callable, required_skills: Iterable[str], limit: Optional[int]) -> List[int]:
+    """
+    Stage one of two-stage matching against an engine's persistent index
+
+    Candidates seen for the first time are indexed on the way; known ones
+    are trusted to be current, since profile refresh hooks upsert them.
+    A pool with candidates lacking an id falls back to shortlist_positions.
+    """
+    if limit is None or limit >= len(candidates):
+        return list(range(len(candidates)))
+
+    ids = [candidate_id(candidate) for candidate in candidates]
+    if any(id_ is None for id_ in ids):
+        return shortlist_positions([candidate_skills(candidate) for candidate in candidates], required_skills, limit)
+    for candidate, id_ in zip(candidates, ids):
+        if id_ not in index:
+            index.upsert(id_, candidate_skills(candidate))
+    return index.shortlist(ids, required_skills, limit)
+
+
+def recall_at_k(exact_ids: Sequence, approximate_ids: Sequence, k: int) -> float:
+    """
+    Share of the exhaustive top-k that the two-stage top-k also returns
+    """
+    expected = set(list(exact_ids)[:k])
+    if not expected:
+        return 1.0
+    return len(expected.intersection(list(approximate_ids)[:k])) / len(expected)
@@ -8,6 +8,31 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS') or '*'
 
+    # Freelancers shortlisted from the skill index before full match scoring
+    MATCH_CANDIDATE_LIMIT = 300
+
+    # Number of best matches stored per project; None stores every scored match
+    MATCH_PERSIST_TOP_K = None
+
+    # Largest number of projects accepted by the batch matching endpoint
+    MATCH_BATCH_MAX_PROJECTS = 100
+
+    # Match result cache; None TTL keeps entries until evicted or invalidated
+    MATCH_CACHE_MAX_ENTRIES = 1024
+    MATCH_CACHE_TTL_SECONDS = 300
+
+    # Fitted model artifacts, off unless a directory is set; workers pick up
+    # a new CURRENT version on their own
+    MODEL_ARTIFACT_DIR = os.environ.get('MODEL_ARTIFACT_DIR')
+
+    # Processes that score very large freelancer pools in shards; 0 scores in process
+    MATCH_SCORING_WORKERS = 0
+    MATCH_ROWS_PER_SHARD = 20000
+
+    # Background matching workers; eager mode runs jobs inline
+    MATCHING_WORKERS = 2
+    MATCHING_JOBS_EAGER = False
+
     @staticmethod
     def init_app(app):
         """Initializes the application with the given configuration."""
@@ -22,6 +47,8 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
+    MATCHING_JOBS_EAGER = True
+    MODEL_ARTIFACT_DIR = None
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'sqlite://'
 
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Freelancer Feature Store for NeuraSynth
+Columnar NumPy view of freelancer profiles, loaded and refreshed with Core SELECTs
+"""
+
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from scipy import sparse
+from .models import db, User
+from .skill_index import skill_text
+from .skill_registry import SkillRegistry, skill_registry
+
+
+class FreelancerFeatureStore:
+    """
+    Freelancer columns held as arrays instead of ORM objects
+
+    Numeric profile fields live in one float matrix (NaN where the column
+    is NULL) and skills as sorted id arrays from the shared skill
+    registry. The store loads with a
+    single SELECT and afterwards only fetches users whose updated_at is at
+    or past the last seen watermark. Hard deletes leave no row to fetch,
+    so they are caught by counting the freelancers at most once every
+    delete_check_interval seconds.
+    """
+
+    NUMERIC_COLUMNS = (
+        'experience_years', 'hourly_rate', 'availability_hours_per_week',
+        'completion_rate', 'average_rating'
+    )
+
+    SELECT_COLUMNS = (
+        User.id, User.user_type, User.skills, User.location, User.experience_years,
+        User.hourly_rate, User.availability_hours_per_week, User.completion_rate,
+        User.average_rating, User.updated_at
+    )
+
+    def __init__(self, registry: Optional[SkillRegistry] = None, delete_check_interval: float = 60):
+        self.registry = skill_registry if registry is None else registry
+        self.delete_check_interval = delete_check_interval
+        self.delete_checked_at: Optional[float] = None
+        self.user_ids: List[str] = []
+        self.row_index: Dict[str, int] = {}
+        self.numeric = np.zeros((0, len(self.NUMERIC_COLUMNS)))
+        self.locations: List[str] = []
+        self.skills: List[List[str]] = []
+        self.skill_texts: List[str] = []
+        self.skill_ids: List[np.ndarray] = []
+        self.watermark: Optional[datetime] = None
+        self.is_loaded = False
+        self._skill_matrix = None
+        self._skill_bitsets = None
+        self._bind = None
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def __contains__(self, user_id):
+        return user_id in self.row_index
+
+    @property
+    def skill_vocabulary(self) -> Dict[str, int]:
+        return self.registry.ids
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        One numeric column, aligned with user_ids
+        """
+        return self.numeric[:, self.NUMERIC_COLUMNS.index(name)]
+
+    def intern_skills(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Sorted ids of a skill list, adding unseen skills to the registry
+        """
+        return self.registry.skill_ids(skills, add=True)
+
+    def skill_matrix(self) -> sparse.csr_matrix:
+        """
+        Binary CSR matrix of freelancers by interned skill id
+        """
+        with self._lock:
+            if self._skill_matrix is None or self._skill_matrix.shape[1] != len(self.registry):
+                self._skill_matrix = self.registry.skill_matrix(self.skill_ids)
+            return self._skill_matrix
+
+    def skill_bitsets(self) -> np.ndarray:
+        """
+        Packed uint64 skill bitsets of every freelancer, aligned with user_ids
+        """
+        with self._lock:
+            if self._skill_bitsets is None:
+                self._skill_bitsets = self.registry.bitsets(self.skill_ids)
+            return self._skill_bitsets
+
+    def positions(self, user_ids: Iterable[str]) -> np.ndarray:
+        """
+        Row positions of the given ids, skipping unknown ones, in index order
+        """
+        with self._lock:
+            return np.array(sorted(
+                self.row_index[user_id] for user_id in user_ids if user_id in self.row_index
+            ), dtype=np.intp)
+
+    def _row_values(self, row):
+        skills = row.skills.split(',') if row.skills else []
+        numeric = [
+            np.nan if value is None else value
+            for value in (row.experience_years, row.hourly_rate, row.availability_hours_per_week,
+                          row.completion_rate, row.average_rating)
+        ]
+        return skills, numeric
+
+    def load(self) -> int:
+        """
+        Rebuild the store from the users table with one SELECT
+        """
+        with self._lock:
+            rows = db.session.execute(
+                db.select(*self.SELECT_COLUMNS).where(User.user_type == 'freelancer')
+            ).all()
+
+            self.user_ids = []
+            self.locations = []
+            self.skills = []
+            self.skill_texts = []
+            self.skill_ids = []
+            numeric = []
+            watermark = None
+
+            for row in rows:
+                skills, values = self._row_values(row)
+                self.user_ids.append(row.id)
+                self.locations.append(row.location or '')
+                self.skills.append(skills)
+                self.skill_texts.append(skill_text(skills))
+                self.skill_ids.append(self.intern_skills(skills))
+                numeric.append(values)
+                if row.updated_at is not None and (watermark is None or row.updated_at > watermark):
+                    watermark = row.updated_at
+
+            self.numeric = np.array(numeric, dtype=float).reshape(len(rows), len(self.NUMERIC_COLUMNS))
+            self.row_index = {user_id: row for row, user_id in enumerate(self.user_ids)}
+            self.watermark = watermark
+            self._skill_matrix = None
+            self._skill_bitsets = None
+            self._bind = weakref.ref(db.engine)
+            self.delete_checked_at = time.monotonic()
+            self.is_loaded = True
+            self.logger.info(f"Loaded feature store with {len(rows)} freelancers")
+            return len(rows)
+
+    def refresh(self) -> int:
+        """
+        Apply users changed since the watermark; returns how many were seen
+
+        Rows at the watermark itself are fetched again, since other rows may
+        have been committed with the same timestamp. A count check, run at
+        most every delete_check_interval seconds, catches hard deletes and
+        falls back to a full load.
+        """
+        with self._lock:
+            if not self.is_loaded or self._bind() is not db.engine:
+                return self.load()
+
+            statement = db.select(*self.SELECT_COLUMNS)
+            if self.watermark is not None:
+                statement = statement.where(User.updated_at >= self.watermark)
+            else:
+                statement = statement.where(User.updated_at.isnot(None))
+            rows = db.session.execute(statement).all()
+
+            removed = set()
+            added = []
+            skills_changed = False
+            for row in rows:
+                if row.updated_at is not None and (self.watermark is None or row.updated_at > self.watermark):
+                    self.watermark = row.updated_at
+                if row.user_type != 'freelancer':
+                    if row.id in self.row_index:
+                        removed.add(row.id)
+                    continue
+
+                skills, values = self._row_values(row)
+                position = self.row_index.get(row.id)
+                if position is None:
+                    added.append((row, skills, values))
+                    continue
+                self.numeric[position] = values
+                self.locations[position] = row.location or ''
+                # Rows at the watermark come back unchanged on every refresh
+                if skills != self.skills[position]:
+                    self.skills[position] = skills
+                    self.skill_texts[position] = skill_text(skills)
+                    self.skill_ids[position] = self.intern_skills(skills)
+                    skills_changed = True
+
+            if removed:
+                self._remove(removed)
+            if added:
+                self._append(added)
+            # The cached skill matrix and bitsets only depend on the skill rows
+            if removed or added or skills_changed:
+                self._skill_matrix = None
+                self._skill_bitsets = None
+
+            if time.monotonic() - self.delete_checked_at >= self.delete_check_interval:
+                self.delete_checked_at = time.monotonic()
+                freelancers = db.session.execute(
+                    db.select(db.func.count()).select_from(User).where(User.user_type == 'freelancer')
+                ).scalar()
+                if freelancers != len(self.user_ids):
+                    self.load()
+
+            return len(rows)
+
+    def _append(self, added):
+        for row, skills, values in added:
+            self.row_index[row.id] = len(self.user_ids)
+            self.user_ids.append(row.id)
+            self.locations.append(row.location or '')
+            self.skills.append(skills)
+            self.skill_texts.append(skill_text(skills))
+            self.skill_ids.append(self.intern_skills(skills))
+        self.numeric = np.vstack([self.numeric, np.array([values for _, _, values in added], dtype=float)])
+
+    def _remove(self, user_ids):
+        keep = [row for row, user_id in enumerate(self.user_ids) if user_id not in user_ids]
+        self.numeric = self.numeric[keep]
+        self.user_ids = [self.user_ids[row] for row in keep]
+        self.locations = [self.locations[row] for row in keep]
+        self.skills = [self.skills[row] for row in keep]
+        self.skill_texts = [self.skill_texts[row] for row in keep]
+        self.skill_ids = [self.skill_ids[row] for row in keep]
+        self.row_index = {user_id: row for row, user_id in enumerate(self.user_ids)}
+
+
+# Shared store of freelancer columns, refreshed before each matching run
+freelancer_feature_store = FreelancerFeatureStore()
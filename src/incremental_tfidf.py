@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental TF-IDF for NeuraSynth
+Hashed term counts with a running document-frequency table, trainable in batches
+"""
+
+from typing import Iterable, Iterator, List
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+def batched(items: Iterable, batch_size: int) -> Iterator[List]:
+    """
+    Split any iterable, including a generator, into lists of batch_size
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class IncrementalTfidfVectorizer:
+    """
+    TF-IDF over a fixed hashed feature space, fitted one batch at a time
+
+    The hashing step is stateless, so the only learned state is the
+    document count and one document-frequency counter per feature. Memory
+    stays at n_features counters no matter how many documents are seen,
+    and new documents can be folded in later with partial_fit. IDF uses
+    the same smoothed formula as TfidfVectorizer.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, stop_words='english', ngram_range=(1, 2)):
+        self.n_features = n_features
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words=stop_words,
+            ngram_range=ngram_range,
+            alternate_sign=False,
+            norm=None
+        )
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._idf = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.n_documents > 0
+
+    def partial_fit(self, texts: List[str]) -> 'IncrementalTfidfVectorizer':
+        """
+        Count the documents each hashed term appears in
+        """
+        counts = self.hasher.transform(texts)
+        counts.sum_duplicates()
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        self._idf = None
+        return self
+
+    def fit(self, texts: List[str]) -> 'IncrementalTfidfVectorizer':
+        """
+        Forget earlier batches and fit on texts
+        """
+        self.document_frequency[:] = 0
+        self.n_documents = 0
+        self._idf = None
+        return self.partial_fit(texts)
+
+    def idf(self) -> np.ndarray:
+        """
+        Smoothed inverse document frequency per hashed feature
+        """
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1.0
+        return self._idf
+
+    def transform(self, texts: List[str]):
+        """
+        L2-normalized TF-IDF rows for texts
+        """
+        counts = self.hasher.transform(texts)
+        counts.sum_duplicates()
+        counts.data *= self.idf()[counts.indices]
+        return normalize(counts)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Market Data Service for NeuraSynth
+Rolling-window aggregates over project creation and completion events
+"""
+
+import bisect
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .market_statistics import percentile
+from .skill_registry import skill_registry
+
+BUDGET_PERCENTILES = (25, 50, 75, 90)
+
+
+def skill_set_key(skills) -> Tuple[str, ...]:
+    """
+    Order- and alias-insensitive key of a required skill list
+    """
+    names = (str(skill) for skill in skill_registry.parse(skills))
+    return tuple(sorted({skill_registry.canonical(name) for name in names if name.strip()}))
+
+
+class _Bucket:
+    """
+    Events of one time slice, kept so they can be subtracted when the slice expires
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.created: List[Tuple[Tuple[str, ...], str, float, float]] = []
+        self.finished: List[Tuple[Tuple[str, ...], bool]] = []
+
+
+class MarketDataService:
+    """
+    Market aggregates maintained over a rolling window of project events
+
+    Events are filed into bucket_seconds slices. When a slice falls out
+    of the window_seconds window its events are subtracted again, so
+    every aggregate reflects only recent projects. Creations feed
+    trending-skill counts and per-type budget and duration statistics.
+    Completions and other final outcomes feed completion rates per skill
+    set and per skill. Reads first expire slices against the clock, so
+    aggregates age out even when no new events arrive. Reading an
+    aggregate costs O(1) or O(required skills); no history is scanned.
+    """
+
+    def __init__(self, window_seconds: float = 90 * 86400, bucket_seconds: float = 86400,
+                 min_outcomes: int = 5, clock: Optional[Callable[[], datetime]] = None):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.min_outcomes = min_outcomes
+        self.clock = clock or datetime.utcnow
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._buckets: deque = deque()
+            self.skill_counts: Counter = Counter()
+            self.budget_totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+            self.duration_totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+            self.budgets: Dict[str, List[float]] = defaultdict(list)
+            self.skill_set_outcomes: Dict[Tuple[str, ...], List[int]] = defaultdict(lambda: [0, 0])
+            self.skill_outcomes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+            self.latest_index: Optional[int] = None
+
+    def _index(self, at: Optional[datetime]) -> int:
+        return int((at or self.clock()).timestamp() // self.bucket_seconds)
+
+    @property
+    def _window_buckets(self) -> int:
+        return max(1, int(self.window_seconds // self.bucket_seconds))
+
+    def _bucket(self, index: int) -> Optional[_Bucket]:
+        """
+        Bucket for an event slice, advancing the window; None for events already outside it
+        """
+        if self.latest_index is None or index > self.latest_index:
+            self.latest_index = index
+            self._expire()
+        if index <= self.latest_index - self._window_buckets:
+            return None
+
+        # Events mostly arrive in order, so the bucket is usually the last one
+        for bucket in reversed(self._buckets):
+            if bucket.index == index:
+                return bucket
+            if bucket.index < index:
+                break
+        bucket = _Bucket(index)
+        position = len(self._buckets)
+        while position and self._buckets[position - 1].index > index:
+            position -= 1
+        self._buckets.insert(position, bucket)
+        return bucket
+
+    def _advance(self):
+        # Move the window up to the current time before a read
+        index = self._index(None)
+        if self.latest_index is None or index > self.latest_index:
+            self.latest_index = index
+            self._expire()
+
+    def _expire(self):
+        oldest = self.latest_index - self._window_buckets
+        while self._buckets and self._buckets[0].index <= oldest:
+            bucket = self._buckets.popleft()
+            for skills, project_type, budget, duration in bucket.created:
+                self._apply_created(skills, project_type, budget, duration, -1)
+            for skills, succeeded in bucket.finished:
+                self._apply_finished(skills, succeeded, -1)
+
+    def _apply_created(self, skills, project_type, budget, duration, sign: int):
+        for skill in skills:
+            self.skill_counts[skill] += sign
+            if not self.skill_counts[skill]:
+                del self.skill_counts[skill]
+        if budget > 0:
+            totals = self.budget_totals[project_type]
+            totals[0] += sign * budget
+            totals[1] += sign
+            if sign > 0:
+                bisect.insort(self.budgets[project_type], budget)
+            else:
+                budgets = self.budgets[project_type]
+                del budgets[bisect.bisect_left(budgets, budget)]
+        if duration > 0:
+            totals = self.duration_totals[project_type]
+            totals[0] += sign * duration
+            totals[1] += sign
+
+    def _apply_finished(self, skills, succeeded: bool, sign: int):
+        for table, key in [(self.skill_set_outcomes, skills)] + [(self.skill_outcomes, skill) for skill in skills]:
+            outcomes = table[key]
+            outcomes[0] += sign * int(succeeded)
+            outcomes[1] += sign
+            if not outcomes[1]:
+                del table[key]
+
+    def record_created(self, project: Dict[str, Any], at: Optional[datetime] = None):
+        """
+        Count a newly posted project
+        """
+        event = (
+            skill_set_key(project.get('required_skills', [])),
+            project.get('project_type', 'general'),
+            float(project.get('budget_range') or 0),
+            float(project.get('duration_weeks') or 0)
+        )
+        with self._lock:
+            bucket = self._bucket(self._index(at))
+            if bucket is not None:
+                bucket.created.append(event)
+                self._apply_created(*event, 1)
+
+    def record_finished(self, project: Dict[str, Any], status: Optional[str] = None, at: Optional[datetime] = None):
+        """
+        Count a project's final outcome; only status 'completed' counts as a success
+        """
+        event = (skill_set_key(project.get('required_skills', [])), (status or project.get('status')) == 'completed')
+        with self._lock:
+            bucket = self._bucket(self._index(at))
+            if bucket is not None:
+                bucket.finished.append(event)
+                self._apply_finished(*event, 1)
+
+    def trending_skills(self, count: int = 10) -> List[str]:
+        with self._lock:
+            self._advance()
+            return [skill for skill, _ in self.skill_counts.most_common(count)]
+
+    def average_budget(self, project_type: str) -> float:
+        with self._lock:
+            self._advance()
+            total, count = self.budget_totals.get(project_type, (0.0, 0))
+            return total / count if count else 0
+
+    def average_duration(self, project_type: str) -> float:
+        with self._lock:
+            self._advance()
+            total, count = self.duration_totals.get(project_type, (0.0, 0))
+            return total / count if count else 0
+
+    def budget_percentiles(self, project_type: str) -> Dict[str, float]:
+        with self._lock:
+            self._advance()
+            budgets = self.budgets.get(project_type, [])
+            return {f'p{q}': percentile(budgets, q) for q in BUDGET_PERCENTILES}
+
+    def completion_rate(self, skills) -> Optional[float]:
+        """
+        Share of finished projects with this skill set that completed
+
+        Falls back to the outcome-weighted rate of the individual skills
+        while the exact set has fewer than min_outcomes results; None when
+        there are no outcomes at all.
+        """
+        key = skill_set_key(skills)
+        with self._lock:
+            self._advance()
+            succeeded, finished = self.skill_set_outcomes.get(key, (0, 0))
+            if finished >= self.min_outcomes:
+                return succeeded / finished
+            succeeded = sum(self.skill_outcomes.get(skill, (0, 0))[0] for skill in key)
+            finished = sum(self.skill_outcomes.get(skill, (0, 0))[1] for skill in key)
+            return succeeded / finished if finished else None
+
+    def market_data(self, project: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aggregates relevant to one project, in the shape suggest_project_improvements reads
+        """
+        project_type = project.get('project_type')
+        with self._lock:
+            return {
+                'average_budget_for_type': {project_type: self.average_budget(project_type)},
+                'average_duration_for_type': {project_type: self.average_duration(project_type)},
+                'budget_percentiles_for_type': {project_type: self.budget_percentiles(project_type)},
+                'trending_skills': self.trending_skills(),
+                'similar_project_success_rate': self.completion_rate(project.get('required_skills', []))
+            }
+
+
+# Market aggregates shared by the recommendation engines
+market_data_service = MarketDataService()
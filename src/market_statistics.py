@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Market Statistics for NeuraSynth Matching
+Materialized freelancer pool statistics: skill frequencies, experience histogram and rate percentiles
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+from .skill_registry import SkillRegistry, bitset_skill_scores, bitset_words, pack_skill_ids, pad_words, skill_registry
+
+# Upper bounds (exclusive) of the experience buckets, in years
+EXPERIENCE_BUCKETS = (('beginner', 2), ('intermediate', 5), ('advanced', 8), ('expert', float('inf')))
+
+RATE_PERCENTILES = (25, 50, 75, 90)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Linearly interpolated percentile of an already sorted list, 0 when empty
+    """
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def experience_bucket(years) -> str:
+    """
+    Experience level of a number of years
+    """
+    for name, upper in EXPERIENCE_BUCKETS:
+        if (years or 0) < upper:
+            return name
+    return EXPERIENCE_BUCKETS[-1][0]
+
+
+class MarketStatistics:
+    """
+    Pool statistics kept up to date instead of recounted per request
+
+    Holds how many freelancers list each skill, the experience histogram
+    and the sorted hourly rates, plus every freelancer's skill bitset for
+    the qualification count. upsert and remove adjust the counters for
+    one profile change; refresh rebuilds everything from a full pool and
+    is due again once refresh_interval seconds have passed.
+    """
+
+    def __init__(self, registry: Optional[SkillRegistry] = None, refresh_interval: Optional[float] = 3600):
+        self.registry = skill_registry if registry is None else registry
+        self.refresh_interval = refresh_interval
+        self.refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.skill_counts: Counter = Counter()
+        self.experience_counts = {name: 0 for name, _ in EXPERIENCE_BUCKETS}
+        self.rates: List[float] = []
+        self.profiles: Dict[Hashable, Tuple[np.ndarray, str, float]] = {}
+        self._rows: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, user_id):
+        return user_id in self.profiles
+
+    def is_built(self) -> bool:
+        """
+        Whether the statistics were ever rebuilt from a full pool
+        """
+        return self.refreshed_at is not None
+
+    def is_stale(self) -> bool:
+        """
+        Whether a scheduled refresh is due
+        """
+        if self.refreshed_at is None:
+            return True
+        return self.refresh_interval is not None and time.monotonic() - self.refreshed_at > self.refresh_interval
+
+    def refresh(self, users: Iterable[Dict[str, Any]]) -> int:
+        """
+        Rebuild the statistics from a whole user pool
+
+        Users without an id are counted but cannot be updated later.
+        """
+        with self._lock:
+            self._reset()
+            for position, user in enumerate(users):
+                key = user.get('id')
+                key = ('unkeyed', position) if key is None else key
+                rate = self._count(key, user)
+                if rate > 0:
+                    self.rates.append(rate)
+                self._rows[key] = position
+                self._keys.append(key)
+
+            # Packed and sorted once rather than row by row
+            self.rates.sort()
+            self._bits = self.registry.bitsets(self.profiles[key][0] for key in self._keys)
+            self.refreshed_at = time.monotonic()
+            return len(self._keys)
+
+    def upsert(self, user: Dict[str, Any]):
+        """
+        Apply one added or changed profile
+        """
+        if user.get('id') is None:
+            return
+        with self._lock:
+            if user['id'] in self.profiles:
+                self._discard(user['id'])
+            self._add(user['id'], user)
+
+    def remove(self, user_id):
+        """
+        Drop one profile from the statistics
+        """
+        with self._lock:
+            if user_id in self.profiles:
+                self._discard(user_id)
+
+    def _count(self, key, user: Dict[str, Any]) -> float:
+        # Skill and experience counters of one profile; the caller files its rate.
+        # Rows mirror stored profiles, so their skills are interned
+        skill_ids = self.registry.skill_ids(user.get('skills', []), add=True)
+        bucket = experience_bucket(user.get('experience_years', 0))
+        rate = float(user.get('hourly_rate') or 0)
+
+        self.skill_counts.update(self.registry.name(skill_id) for skill_id in skill_ids)
+        self.experience_counts[bucket] += 1
+        self.profiles[key] = (skill_ids, bucket, rate)
+        return rate
+
+    def _add(self, key, user: Dict[str, Any]):
+        rate = self._count(key, user)
+        if rate > 0:
+            bisect.insort(self.rates, rate)
+        self._set_row(key, self.profiles[key][0])
+
+    def _discard(self, key):
+        skill_ids, bucket, rate = self.profiles.pop(key)
+        for skill_id in skill_ids:
+            name = self.registry.name(skill_id)
+            self.skill_counts[name] -= 1
+            if not self.skill_counts[name]:
+                del self.skill_counts[name]
+        self.experience_counts[bucket] -= 1
+        if rate > 0:
+            del self.rates[bisect.bisect_left(self.rates, rate)]
+
+        # The last row fills the gap
+        row = self._rows.pop(key)
+        last = self._keys.pop()
+        if last != key:
+            self._bits[row] = self._bits[len(self._keys)]
+            self._keys[row] = last
+            self._rows[last] = row
+
+    def _set_row(self, key, skill_ids: np.ndarray):
+        n_words = max(self._bits.shape[1], bitset_words(int(skill_ids[-1]) + 1 if len(skill_ids) else 0))
+        bits = pad_words(self._bits, n_words)
+        if len(self._keys) == len(bits):
+            # Grow the row buffer geometrically so appends stay amortized O(1)
+            bits = np.vstack([bits, np.zeros((max(len(bits), 16), n_words), dtype=np.uint64)])
+        self._bits = bits
+
+        self._rows[key] = len(self._keys)
+        self._keys.append(key)
+        self._bits[self._rows[key]] = pack_skill_ids([skill_ids], n_words)[0]
+
+    def skill_frequency(self, skill) -> int:
+        """
+        Number of freelancers listing a skill or one of its aliases
+        """
+        return self.skill_counts.get(self.registry.canonical(skill), 0)
+
+    def top_skills(self, count: int = 10) -> List[Tuple[str, int]]:
+        return self.skill_counts.most_common(count)
+
+    def rate_percentile(self, q: float) -> float:
+        """
+        Linearly interpolated percentile of the positive hourly rates
+        """
+        return percentile(self.rates, q)
+
+    def rate_percentiles(self) -> Dict[str, float]:
+        return {f'p{q}': self.rate_percentile(q) for q in RATE_PERCENTILES}
+
+    def qualified_count(self, required_skills, threshold: float = 0.3) -> int:
+        """
+        Freelancers whose skill match score with the required skills exceeds threshold
+
+        One popcount pass over the stored bitsets, scored like
+        calculate_skill_match_score. Required skills no profile lists get
+        temporary ids, so they count against the match without being interned.
+        """
+        with self._lock:
+            project_bits = self.registry.bitsets(self.registry.local_ids([required_skills]))[0]
+            _, _, scores = bitset_skill_scores(self._bits[:len(self._keys)], project_bits)
+            return int(np.count_nonzero(scores > threshold))
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Match Result Cache for NeuraSynth
+LRU/TTL cache of project match results, invalidated by version stamps
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Default of configure arguments that were not passed, since None is a valid TTL
+_UNSET = object()
+
+
+class MatchResultCache:
+    """
+    Caches match results keyed by project id plus version stamps
+
+    Every entry key carries the project's version and the freelancer pool
+    version at the time it was computed. Editing a project bumps its
+    version and editing any freelancer profile bumps the pool version, so
+    stale entries can never be hit again and are dropped straight away.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pool_version = 0
+        self.project_versions = {}
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def configure(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = _UNSET):
+        """
+        Apply size and expiry settings, evicting entries past the new size
+
+        Settings left out keep their current value; ttl_seconds=None turns
+        expiry off.
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not _UNSET:
+                self.ttl_seconds = ttl_seconds
+            self._evict()
+
+    def key(self, project_id, *params: Hashable) -> Tuple:
+        """
+        Current cache key for a project and any result-shaping parameters
+
+        Take the key before computing the result, so an invalidation that
+        lands mid-computation leaves the result stored under a stale key.
+        """
+        with self._lock:
+            return (project_id, self.project_versions.get(project_id, 0), self.pool_version) + params
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """
+        Cached value for the key, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Tuple, value: Any):
+        """
+        Store a value, ignoring keys already made stale by an invalidation
+        """
+        with self._lock:
+            if key != self.key(key[0], *key[3:]):
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def invalidate_project(self, project_id):
+        """
+        Drop results for one project after it is edited
+        """
+        with self._lock:
+            self.project_versions[project_id] = self.project_versions.get(project_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == project_id]:
+                del self._entries[key]
+
+    def invalidate_pool(self):
+        """
+        Drop every result after a freelancer profile changes
+        """
+        with self._lock:
+            self.pool_version += 1
+            self._entries.clear()
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Size and hit/miss counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'pool_version': self.pool_version
+            }
+
+    def _evict(self):
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+
+
+match_cache = MatchResultCache()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Offline Training for the NeuraSynth Match Success Model
+Streams historical matches with their project outcomes and fits the success model
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional
+import click
+import numpy as np
+from flask.cli import with_appcontext
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler, normalize
+from .models import db, User, Project, Match
+from .skill_index import skill_text
+
+
+def outcome_labels(progress, budget_used, total_budget) -> np.ndarray:
+    """
+    Success label per project: completed share scaled down by budget overrun
+    """
+    progress = np.clip(np.asarray(progress, dtype=float) / 100.0, 0.0, 1.0)
+    budget_used = np.asarray(budget_used, dtype=float)
+    total_budget = np.asarray(total_budget, dtype=float)
+
+    adherence = np.ones(len(progress))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overrun = (budget_used > total_budget) & (total_budget > 0)
+        adherence[overrun] = total_budget[overrun] / budget_used[overrun]
+    return progress * adherence
+
+
+class SuccessModelTrainer:
+    """
+    Fits the success model of an AdvancedMatchingEngine from match history
+
+    Rows are streamed from the database chunk_size at a time. The scaler is
+    fitted incrementally on every row, while the forest is fitted on a
+    uniform sample of at most max_train_rows rows, so memory stays bounded
+    however large the history is.
+    """
+
+    # Matches, their freelancer and their project outcome, one row per match
+    COLUMNS = [
+        Project.required_skills, Project.budget_max, Project.estimated_hours,
+        Project.urgency_level, Project.progress_percentage, Project.budget_used,
+        Project.total_budget, User.skills, User.hourly_rate, User.completion_rate
+    ]
+
+    def __init__(self, engine, chunk_size: int = 10000, max_train_rows: int = 200000,
+                 n_jobs: Optional[int] = -1, random_state: int = 42):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.max_train_rows = max_train_rows
+        self.n_jobs = n_jobs
+        self.rng = np.random.default_rng(random_state)
+        self.logger = logging.getLogger(__name__)
+
+    def stream_rows(self) -> Iterator[List[Any]]:
+        """
+        Yield historical match rows with a known project outcome, in chunks
+        """
+        statement = (
+            db.select(*self.COLUMNS)
+            .select_from(Match)
+            .join(Project, Match.project_id == Project.id)
+            .join(User, Match.user_id == User.id)
+            .where(Project.progress_percentage.isnot(None))
+        )
+        result = db.session.execute(statement, execution_options={'yield_per': self.chunk_size})
+        for partition in result.partitions():
+            yield partition
+
+    def build_features(self, rows):
+        """
+        Build the five success-prediction features and labels for a chunk
+
+        Same columns as prediction_features in extract_features; missing
+        values take the defaults extract_features uses.
+        """
+        (required_skills, budget_max, estimated_hours, urgency_level, progress,
+         budget_used, total_budget, skills, hourly_rate, completion_rate) = zip(*rows)
+
+        def column(values, default):
+            return np.array([default if value is None else value for value in values], dtype=float)
+
+        budget_max = column(budget_max, 0)
+        estimated_hours = column(estimated_hours, 40)
+        hourly_rate = column(hourly_rate, 0)
+
+        budget_adequacy = np.full(len(rows), 0.5)
+        priced = (hourly_rate > 0) & (budget_max > 0) & (estimated_hours > 0)
+        budget_adequacy[priced] = np.minimum(
+            budget_max[priced] / (hourly_rate[priced] * estimated_hours[priced]), 1.0
+        )
+
+        timeline_realism = 1.0 - (column(urgency_level, 1) - 1) * 0.2
+
+        # Row-wise cosine similarity of L2-normalized skill vectors
+        vectorizer = self.engine.skill_vectorizer
+        freelancer_vectors = normalize(vectorizer.transform([skill_text(value) for value in skills]))
+        project_vectors = normalize(vectorizer.transform([skill_text(value) for value in required_skills]))
+        skill_match = np.asarray(freelancer_vectors.multiply(project_vectors).sum(axis=1)).ravel()
+
+        features = np.column_stack([
+            budget_adequacy,
+            timeline_realism,
+            skill_match,
+            column(completion_rate, self.engine.DEFAULT_COMPLETION_RATE),
+            np.full(len(rows), 0.8)
+        ])
+        labels = outcome_labels(progress, column(budget_used, 0), column(total_budget, 0))
+        return features, labels
+
+    def _sample(self, sample, features, labels):
+        """
+        Keep a uniform sample of max_train_rows rows across chunks
+
+        Every row draws a random key and the rows with the smallest keys
+        are kept, so the sample never grows past max_train_rows.
+        """
+        keys = self.rng.random(len(labels))
+        if sample is not None:
+            keys = np.concatenate([sample[0], keys])
+            features = np.vstack([sample[1], features])
+            labels = np.concatenate([sample[2], labels])
+
+        if len(keys) > self.max_train_rows:
+            keep = np.argpartition(keys, self.max_train_rows - 1)[:self.max_train_rows]
+            keys, features, labels = keys[keep], features[keep], labels[keep]
+        return keys, features, labels
+
+    def measure_latency(self, features, repeats: int = 100) -> Dict[str, float]:
+        """
+        Per-row prediction latency in a batch and for single rows
+        """
+        batch = features[:10000]
+        start = time.perf_counter()
+        self.engine.success_model.predict(self.engine.scaler.transform(batch))
+        batch_seconds = time.perf_counter() - start
+
+        row = features[:1]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            self.engine.success_model.predict(self.engine.scaler.transform(row))
+        single_seconds = (time.perf_counter() - start) / repeats
+
+        return {
+            'batch_latency_us_per_row': round(batch_seconds / len(batch) * 1e6, 3),
+            'single_row_latency_ms': round(single_seconds * 1e3, 3)
+        }
+
+    def train(self, publish: bool = True) -> Dict[str, Any]:
+        """
+        Stream the history, fit scaler and forest, and optionally publish
+
+        Returns a report with row counts, fit time, inference latency and
+        the published version, if any. Publishing needs a model store
+        attached to the engine; without one it raises ValueError before
+        any training starts.
+        """
+        if publish and self.engine.model_store is None:
+            raise ValueError('No model store attached to publish the trained model to')
+        if not hasattr(self.engine.skill_vectorizer, 'vocabulary_'):
+            self.engine.build_skill_index()
+        if not hasattr(self.engine.skill_vectorizer, 'vocabulary_'):
+            raise ValueError('No freelancer skills to fit the skill vectorizer on')
+
+        # Fresh components, swapped into the engine only once fitted
+        scaler = StandardScaler()
+        model = clone(self.engine.success_model)
+        sample = None
+        rows_streamed = 0
+
+        stream_start = time.perf_counter()
+        for rows in self.stream_rows():
+            features, labels = self.build_features(rows)
+            scaler.partial_fit(features)
+            sample = self._sample(sample, features, labels)
+            rows_streamed += len(rows)
+        stream_seconds = time.perf_counter() - stream_start
+
+        if sample is None:
+            raise ValueError('No historical matches with a project outcome to train on')
+
+        _, features, labels = sample
+        model.set_params(n_jobs=self.n_jobs)
+        fit_start = time.perf_counter()
+        model.fit(scaler.transform(features), labels)
+        fit_seconds = time.perf_counter() - fit_start
+
+        # Request-time predictions score one shortlist at a time, where
+        # spinning up parallel workers costs more than it saves
+        model.set_params(n_jobs=None)
+        self.engine.scaler = scaler
+        self.engine.success_model = model
+        self.engine.model_version = None
+
+        report = {
+            'rows_streamed': rows_streamed,
+            'training_rows': len(labels),
+            'stream_seconds': round(stream_seconds, 3),
+            'fit_seconds': round(fit_seconds, 3),
+            'n_jobs': self.n_jobs
+        }
+        report.update(self.measure_latency(features))
+
+        report['version'] = None
+        if publish:
+            report['version'] = self.engine.save_models(metadata={
+                'description': 'Match success model trained on historical matches',
+                'training': report
+            })
+
+        self.logger.info(f"Trained success model on {len(labels)} of {rows_streamed} rows")
+        return report
+
+
+@click.command('train-match-model')
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows fetched per database round trip.')
+@click.option('--max-train-rows', default=200000, show_default=True, help='Sample size the forest is fitted on.')
+@click.option('--n-jobs', default=-1, show_default=True, help='Parallel jobs for fitting the forest.')
+@click.option('--publish/--no-publish', default=True, show_default=True, help='Save the model as the current artifact.')
+@click.option('--artifact-dir', default=None, help='Model artifact directory; defaults to MODEL_ARTIFACT_DIR.')
+@with_appcontext
+def train_match_model_command(chunk_size, max_train_rows, n_jobs, publish, artifact_dir):
+    """Train the match success model from historical matches."""
+    from .utils import ai_matching_engine
+
+    if artifact_dir:
+        from .model_store import ModelArtifactStore
+        ai_matching_engine.attach_model_store(ModelArtifactStore(artifact_dir))
+    if publish and ai_matching_engine.model_store is None:
+        raise click.UsageError('No model artifact directory to publish to; set MODEL_ARTIFACT_DIR, '
+                               'pass --artifact-dir or use --no-publish')
+
+    trainer = SuccessModelTrainer(
+        ai_matching_engine,
+        chunk_size=chunk_size,
+        max_train_rows=max_train_rows,
+        n_jobs=n_jobs
+    )
+    click.echo(json.dumps(trainer.train(publish=publish), indent=2))
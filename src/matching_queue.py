@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Background Matching Queue for NeuraSynth
+Runs project matching off the request path, tracked in the matching_jobs table
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from .models import db, MatchingJob
+from .utils import ai_matching_engine
+from .match_cache import match_cache
+from .automation_blueprint import automation_engine
+
+
+class MatchingJobQueue:
+    """
+    In-process worker pool for AI matching jobs
+
+    Job state lives in the database so any worker or request can poll it;
+    the thread pool is a local stand-in for an external task queue.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _get_executor(self, app):
+        with self._lock:
+            if self._executor is None:
+                workers = app.config.get('MATCHING_WORKERS', self.max_workers)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='matching')
+            return self._executor
+
+    def submit(self, app, project_id, requested_by=None):
+        """
+        Record a pending job and hand it to a worker
+
+        Returns the job id straight away; with MATCHING_JOBS_EAGER the job
+        runs inline before returning.
+        """
+        job = MatchingJob(project_id=project_id, requested_by=requested_by, status='pending')
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+        if app.config.get('MATCHING_JOBS_EAGER'):
+            self.run_job(job_id)
+        else:
+            self._get_executor(app).submit(self._run_in_context, app, job_id)
+
+        return job_id
+
+    def _run_in_context(self, app, job_id):
+        with app.app_context():
+            self.run_job(job_id)
+
+    def run_job(self, job_id):
+        """
+        Fire the project_created event and run matching for one job
+        """
+        job = db.session.get(MatchingJob, job_id)
+        if not job:
+            return
+
+        try:
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+
+            asyncio.run(automation_engine.trigger_event(
+                'project_created',
+                {'project_id': job.project_id, 'client_id': job.requested_by}
+            ))
+
+            candidate_limit = current_app.config.get('MATCH_CANDIDATE_LIMIT')
+            persist_top_k = current_app.config.get('MATCH_PERSIST_TOP_K')
+            ai_matching_engine.reload_models()
+            cache_key = match_cache.key(job.project_id, candidate_limit, persist_top_k)
+
+            matches = ai_matching_engine.find_matches_for_project(
+                job.project_id,
+                candidate_limit=candidate_limit,
+                persist_top_k=persist_top_k,
+                raise_errors=True
+            )
+            if matches:
+                match_cache.set(cache_key, matches)
+
+            job = db.session.get(MatchingJob, job_id)
+            job.status = 'completed'
+            job.result = matches
+            job.completed_at = datetime.utcnow()
+            db.session.commit()
+
+        except Exception as e:
+            self.logger.error(f"Matching job {job_id} failed: {str(e)}")
+            db.session.rollback()
+            job = db.session.get(MatchingJob, job_id)
+            if job:
+                job.status = 'failed'
+                job.error = str(e)
+                job.completed_at = datetime.utcnow()
+                db.session.commit()
+
+    def get_job(self, job_id):
+        """
+        Get a job by id
+        """
+        return db.session.get(MatchingJob, job_id)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker pool
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+matching_queue = MatchingJobQueue()
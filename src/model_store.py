@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Model Artifact Store for NeuraSynth
+Versioned on-disk storage for fitted model components, loaded with memory mapping
+"""
+
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import joblib
+from flask import has_app_context
+from .models import db, AIModel
+
+
+class ModelArtifactStore:
+    """
+    Fitted components saved per model name and version tag
+
+    Layout is <root>/<name>/<version>/<component>.joblib plus a
+    metadata.json, and <root>/<name>/CURRENT names the live version.
+    Components are written uncompressed so their NumPy arrays can be
+    memory mapped read-only and shared between worker processes.
+    """
+
+    CURRENT_FILE = 'CURRENT'
+    METADATA_FILE = 'metadata.json'
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.logger = logging.getLogger(__name__)
+
+    def _model_dir(self, name: str) -> str:
+        return os.path.join(self.root_dir, name)
+
+    def _version_dir(self, name: str, version: str) -> str:
+        return os.path.join(self._model_dir(name), version)
+
+    def new_version(self) -> str:
+        """
+        Sortable version tag for a new artifact set
+        """
+        return datetime.utcnow().strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:6]
+
+    def save(self, name: str, components: Dict[str, Any], version: Optional[str] = None,
+             metadata: Optional[Dict[str, Any]] = None, activate: bool = True) -> str:
+        """
+        Write a set of fitted components under a version tag
+
+        The version directory is fully written before CURRENT moves to it,
+        so readers never see a half-saved version. Returns the version tag.
+        """
+        version = version or self.new_version()
+        version_dir = self._version_dir(name, version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        for component, value in components.items():
+            joblib.dump(value, os.path.join(version_dir, f'{component}.joblib'))
+
+        info = {
+            'name': name,
+            'version': version,
+            'created_at': datetime.utcnow().isoformat(),
+            'components': sorted(components)
+        }
+        info.update(metadata or {})
+        with open(os.path.join(version_dir, self.METADATA_FILE), 'w') as f:
+            json.dump(info, f, indent=2, default=str)
+
+        if activate:
+            self.activate(name, version, description=info.get('description'))
+
+        self.logger.info(f"Saved {name} artifacts version {version}")
+        return version
+
+    def activate(self, name: str, version: str, description: Optional[str] = None):
+        """
+        Point CURRENT at an existing version
+
+        The pointer is swapped with an atomic rename; inside an app context
+        the version is also recorded in the AIModel registry.
+        """
+        if not os.path.isdir(self._version_dir(name, version)):
+            raise ValueError(f'Unknown {name} version: {version}')
+
+        pointer = os.path.join(self._model_dir(name), self.CURRENT_FILE)
+        temp_pointer = f'{pointer}.{uuid.uuid4().hex}.tmp'
+        with open(temp_pointer, 'w') as f:
+            f.write(version)
+        os.replace(temp_pointer, pointer)
+
+        if has_app_context():
+            self.register_version(name, version, description)
+
+    def register_version(self, name: str, version: str, description: Optional[str] = None):
+        """
+        Record a version as the production AIModel entry for name
+        """
+        try:
+            for model in AIModel.query.filter_by(name=name, status='production').all():
+                if model.version != version:
+                    model.status = 'archived'
+
+            model = AIModel.query.filter_by(name=name, version=version).first()
+            if not model:
+                model = AIModel(name, description or f'{name} artifacts', version, None)
+                db.session.add(model)
+            model.status = 'production'
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error registering {name} version {version}: {str(e)}")
+
+    def current_version(self, name: str) -> Optional[str]:
+        """
+        Version CURRENT points at, or None if nothing has been saved
+        """
+        try:
+            with open(os.path.join(self._model_dir(name), self.CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self, name: str) -> List[str]:
+        """
+        All saved versions of a model, oldest first
+        """
+        model_dir = self._model_dir(name)
+        if not os.path.isdir(model_dir):
+            return []
+        return sorted(
+            entry for entry in os.listdir(model_dir)
+            if os.path.isdir(os.path.join(model_dir, entry))
+        )
+
+    def metadata(self, name: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Metadata written with a version, the current one by default
+        """
+        version = version or self.current_version(name)
+        if not version:
+            return None
+        with open(os.path.join(self._version_dir(name, version), self.METADATA_FILE)) as f:
+            return json.load(f)
+
+    def load(self, name: str, version: Optional[str] = None, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+        """
+        Load every component of a version, the current one by default
+
+        Returns an empty dict when nothing has been saved under name.
+        """
+        version = version or self.current_version(name)
+        if not version:
+            return {}
+
+        version_dir = self._version_dir(name, version)
+        components = {}
+        for component in self.metadata(name, version)['components']:
+            components[component] = joblib.load(
+                os.path.join(version_dir, f'{component}.joblib'),
+                mmap_mode=mmap_mode
+            )
+        return components
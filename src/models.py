@@ -64,6 +64,7 @@ class User(db.Model):
     location = db.Column(db.String(128))
     completion_rate = db.Column(db.Float)
     average_rating = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     @property
     def password(self):
@@ -112,6 +113,7 @@ class Project(db.Model):
     end_date = db.Column(db.DateTime)
     progress_percentage = db.Column(db.Integer)
     open_bugs = db.Column(db.Integer)
+    status = db.Column(db.String(32), default='open')  # open, completed, cancelled
 
     def __repr__(self):
         return '<Project %r>' % self.name
@@ -128,13 +130,42 @@ class Equity(db.Model):
 class Match(db.Model):
     __tablename__ = 'matches'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'))
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), index=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'))
     score = db.Column(db.Float)
 
     def __repr__(self):
         return '<Match %r>' % self.id
 
+class MatchingJob(db.Model):
+    """Background AI matching job for a project"""
+    __tablename__ = 'matching_jobs'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), index=True)
+    requested_by = db.Column(db.String(36), db.ForeignKey('users.id'))
+    status = db.Column(db.String(32), default='pending')  # pending, running, completed, failed
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        """Convert matching job to dictionary."""
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'status': self.status,
+            'matches': self.result or [],
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
+    def __repr__(self):
+        return '<MatchingJob %r>' % self.id
+
 class AutomationRule(db.Model):
     __tablename__ = 'automation_rules'
     id = db.Column(db.String(64), primary_key=True)
@@ -316,6 +316,20 @@ class PerformanceOptimizer:
             self.logger.error(f"Error optimizing hyperparameters for {component_name}: {e}")
             return self.best_parameters.get(component_name, {})
     
+    def apply_matching_parameters(self, *engines):
+        """
+        Push the best matching_engine weights into matching engines
+        
+        Args:
+            engines: Engines exposing apply_optimizer_parameters, i.e.
+                AdvancedMatchingEngine, ProjectMatchingEngine or AIMatchingEngine
+        
+        Returns:
+            list: Weights each engine changed, in the order given
+        """
+        parameters = self.best_parameters.get('matching_engine', {})
+        return [engine.apply_optimizer_parameters(parameters) for engine in engines]
+    
     def _generate_synthetic_performance_data(self, component_name):
         """
         Generate synthetic performance data for testing
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Profile Snapshots for NeuraSynth Matching
+Decoded, canonicalized matching fields of freelancer and project rows, cached per profile version
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from .skill_registry import normalize_skill
+
+
+class FreelancerSnapshot:
+    """
+    Matching fields of one freelancer with the skills JSON already decoded
+
+    skill_levels maps canonical skill names to levels, as
+    calculate_skill_match sees them. get_skills returns the decoded
+    column, so a snapshot can stand in wherever a profile is read.
+    """
+
+    __slots__ = ('id', 'version', 'skills', 'skill_levels', 'hourly_rate', 'projects_completed', 'average_rating')
+
+    # Columns whose values make up the profile version
+    VERSION_FIELDS = ('updated_at', 'skills', 'hourly_rate', 'projects_completed', 'average_rating')
+
+    def __init__(self, id, skills, hourly_rate, projects_completed, average_rating, version=None):
+        self.id = id
+        self.version = version
+        self.skills = skills
+        self.skill_levels: Dict[str, Any] = {
+            normalize_skill(skill): level for skill, level in skills.items()
+        } if isinstance(skills, dict) else {}
+        self.hourly_rate = hourly_rate
+        self.projects_completed = projects_completed
+        self.average_rating = average_rating
+
+    def __repr__(self):
+        return f"FreelancerSnapshot(id={self.id!r}, skills={len(self.skill_levels)})"
+
+    @classmethod
+    def from_profile(cls, freelancer, version=None) -> 'FreelancerSnapshot':
+        return cls(
+            getattr(freelancer, 'id', None),
+            freelancer.get_skills() if hasattr(freelancer, 'get_skills') else {},
+            freelancer.hourly_rate,
+            freelancer.projects_completed,
+            freelancer.average_rating,
+            version
+        )
+
+    def get_skills(self):
+        return self.skills
+
+
+class ProjectSnapshot:
+    """
+    Matching fields of one project with the required skills already decoded
+    """
+
+    __slots__ = ('id', 'version', 'required_skills', 'skill_set', 'budget_min', 'budget_max', 'experience_level')
+
+    VERSION_FIELDS = ('updated_at', 'required_skills', 'budget_min', 'budget_max', 'experience_level')
+
+    def __init__(self, id, required_skills, budget_min, budget_max, experience_level, version=None):
+        self.id = id
+        self.version = version
+        self.required_skills = required_skills
+        self.skill_set: FrozenSet[str] = frozenset(
+            normalize_skill(skill) for skill in required_skills
+        ) if isinstance(required_skills, list) else frozenset()
+        self.budget_min = budget_min
+        self.budget_max = budget_max
+        self.experience_level = experience_level
+
+    def __repr__(self):
+        return f"ProjectSnapshot(id={self.id!r}, skills={len(self.skill_set)})"
+
+    @classmethod
+    def from_profile(cls, project, version=None) -> 'ProjectSnapshot':
+        return cls(
+            getattr(project, 'id', None),
+            project.get_required_skills() if hasattr(project, 'get_required_skills') else [],
+            project.budget_min,
+            project.budget_max,
+            project.experience_level,
+            version
+        )
+
+    def get_required_skills(self):
+        return self.required_skills
+
+
+def profile_version(profile, fields: Tuple[str, ...]) -> Optional[Tuple]:
+    """
+    Raw column values a snapshot was decoded from, or None when the profile cannot be cached
+
+    Caching needs an id and the raw column behind the decoded skills;
+    profiles that only offer a getter are decoded every time.
+    """
+    if getattr(profile, 'id', None) is None or not hasattr(profile, fields[1]):
+        return None
+    return tuple(getattr(profile, field, None) for field in fields)
+
+
+class ProfileSnapshotCache:
+    """
+    LRU cache of profile snapshots keyed by kind and id
+
+    A cached snapshot is reused while the profile's raw column values are
+    unchanged, so skills JSON is decoded once per profile version rather
+    than once per scored pair. Snapshots passed in are returned as is.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _snapshot(self, kind, snapshot_class, profile):
+        if isinstance(profile, snapshot_class):
+            return profile
+
+        version = profile_version(profile, snapshot_class.VERSION_FIELDS)
+        if version is None:
+            return snapshot_class.from_profile(profile)
+
+        key = (kind, profile.id)
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None and snapshot.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return snapshot
+
+        snapshot = snapshot_class.from_profile(profile, version)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def freelancer(self, freelancer) -> FreelancerSnapshot:
+        return self._snapshot('freelancer', FreelancerSnapshot, freelancer)
+
+    def project(self, project) -> ProjectSnapshot:
+        return self._snapshot('project', ProjectSnapshot, project)
+
+    def invalidate(self, kind: str, profile_id):
+        """
+        Drop one cached snapshot
+        """
+        with self._lock:
+            self._entries.pop((kind, profile_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,10 +1,57 @@
 from .models import db, Project
+from .match_cache import match_cache
+from .market_data import market_data_service
+from .project_matching import project_matching_engine
+from .skill_registry import skill_registry
+from .team_assembly import HOURS_PER_WEEK
+
+PROJECT_STATUSES = ('open', 'completed', 'cancelled')
+
+# Statuses that close a project and count as its outcome in the market data
+FINAL_STATUSES = ('completed', 'cancelled')
+
+def is_complete(project):
+    """
+    Whether a project's stored progress has reached 100 percent
+    """
+    try:
+        return float(project.progress_percentage or 0) >= 100
+    except (TypeError, ValueError):
+        return False
+
+# Names of the numeric Project.complexity_level values, as ProjectMatchingEngine reads them
+COMPLEXITY_LEVELS = {1: 'beginner', 2: 'intermediate', 3: 'advanced', 4: 'expert'}
+
+def market_project(project):
+    """
+    A project row in the dict shape the market data service reads
+    """
+    return {
+        'required_skills': project.required_skills,
+        'budget_range': project.budget_max or project.total_budget or 0,
+        'duration_weeks': (project.estimated_hours or 0) / HOURS_PER_WEEK
+    }
+
+def matching_project(project):
+    """
+    A project row in the dict shape ProjectMatchingEngine reads
+    """
+    return {
+        'id': project.id,
+        'title': project.name or '',
+        'required_skills': skill_registry.parse(project.required_skills),
+        'budget_range': project.budget_max or 0,
+        'duration_weeks': (project.estimated_hours or 0) / HOURS_PER_WEEK,
+        'complexity_level': COMPLEXITY_LEVELS.get(project.complexity_level, 'medium')
+    }
 
 class ProjectManager:
     def create_project(self, data):
         project = Project(**data)
         db.session.add(project)
         db.session.commit()
+        market_data_service.record_created(market_project(project))
+        project_matching_engine.update_project_index(matching_project(project))
         return {'success': True, 'project_id': project.id}
 
     def get_project(self, project_id):
@@ -13,6 +60,38 @@ class ProjectManager:
             return {
                 'id': project.id,
                 'name': project.name,
-                'client_id': project.client_id
+                'client_id': project.client_id,
+                'status': project.status
             }
         return None
+
+    def get_project_owners(self, project_ids):
+        """
+        Client id of each existing project, in one query
+        """
+        rows = db.session.query(Project.id, Project.client_id).filter(Project.id.in_(list(project_ids)))
+        return {project_id: client_id for project_id, client_id in rows}
+
+    def update_project(self, project_id, data):
+        project = Project.query.get(project_id)
+        if project:
+            if 'status' in data and data['status'] not in PROJECT_STATUSES:
+                return {'success': False, 'message': f"status must be one of {', '.join(PROJECT_STATUSES)}"}
+            was_finished = project.status in FINAL_STATUSES
+            for key, value in data.items():
+                if hasattr(project, key) and key not in ('id', 'client_id'):
+                    setattr(project, key, value)
+            # Reaching full progress completes an open project
+            if is_complete(project) and project.status not in FINAL_STATUSES:
+                project.status = 'completed'
+            db.session.commit()
+            match_cache.invalidate_project(project.id)
+            # The stored status closing the project is the outcome the market data counts
+            if project.status in FINAL_STATUSES:
+                if not was_finished:
+                    market_data_service.record_finished(market_project(project), project.status)
+                project_matching_engine.remove_project_from_index(project.id)
+            else:
+                project_matching_engine.update_project_index(matching_project(project))
+            return {'success': True}
+        return {'success': False, 'message': 'Project not found'}
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Project Feature Index for NeuraSynth
+Column arrays, a skill matrix and TF-IDF vectors of open projects for recommendations
+"""
+
+import copy
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+from .skill_index import SkillVectorIndex, vectorizer_is_fitted
+from .skill_registry import skill_registry, skill_match_scores
+
+# Years of experience each project complexity level asks for
+COMPLEXITY_REQUIREMENTS = {
+    'beginner': 0,
+    'intermediate': 2,
+    'advanced': 5,
+    'expert': 8
+}
+
+
+def _rearrange_rows(matrix: sparse.csr_matrix, source: np.ndarray, rows: sparse.csr_matrix,
+                    positions: np.ndarray) -> sparse.csr_matrix:
+    """
+    Rows of matrix picked by source, with rows placed at positions
+
+    source holds one old row index per output row, or -1 where the output
+    row comes from rows instead. Both selections are sparse products, so
+    no row is copied in Python.
+    """
+    n_rows = len(source)
+    width = max(matrix.shape[1], rows.shape[1])
+    kept = np.flatnonzero(source >= 0)
+    pick = sparse.csr_matrix((np.ones(len(kept)), (kept, source[kept])), shape=(n_rows, matrix.shape[0]))
+    place = sparse.csr_matrix(
+        (np.ones(len(positions)), (positions, np.arange(len(positions)))), shape=(n_rows, rows.shape[0])
+    )
+    picked = pick @ matrix
+    placed = place @ rows
+    return sparse.csr_matrix(
+        sparse.csr_matrix((picked.data, picked.indices, picked.indptr), shape=(n_rows, width)) +
+        sparse.csr_matrix((placed.data, placed.indices, placed.indptr), shape=(n_rows, width))
+    )
+
+
+class ProjectIndexSnapshot:
+    """
+    Arrays of the indexed projects as of one build, never changed afterwards
+
+    Holds the projects and their extracted features in row order, the
+    budget, duration and required experience arrays, the coded project
+    types and industries, the binary project x skill matrix and the
+    projects' TF-IDF rows. A query keeps scoring against the same rows even
+    if projects are upserted meanwhile; updated derives the next snapshot
+    from this one without touching it.
+    """
+
+    def __init__(self, project_ids: List[Any], projects: List[Dict[str, Any]], features: List[Dict[str, Any]],
+                 vectorizer=None, text_vectors=None):
+        self.project_ids = project_ids
+        self.projects = projects
+        self.project_features = features
+        self.rows = {project_id: row for row, project_id in enumerate(project_ids)}
+        self.vectorizer = vectorizer
+        self.text_vectors = text_vectors
+
+        # Temporary ids of required skills the registry did not know at build time
+        self.local_skills: Dict[str, int] = {}
+        self.base = len(skill_registry)
+        self.skill_matrix = skill_registry.skill_matrix(skill_registry.local_ids(
+            (f['required_skills'] for f in features), self.local_skills, self.base
+        ))
+
+        self.budget = np.array([f['budget_range'] or 0 for f in features], dtype=float)
+        self.duration = np.array([f['duration_weeks'] or 0 for f in features], dtype=float)
+        self.required_experience = np.array([
+            COMPLEXITY_REQUIREMENTS.get(f['complexity_level'].lower(), 2) for f in features
+        ], dtype=float)
+        self.category_codes: Dict[Any, int] = {}
+        self.project_types = self._codes(f['project_type'] for f in features)
+        self.industries = self._codes(f['industry'] for f in features)
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def updated(self, upserts: List[Tuple[Any, Dict[str, Any], Dict[str, Any]]],
+                removals: Iterable[Any]) -> 'ProjectIndexSnapshot':
+        """
+        New snapshot with projects removed and (id, project, features) upserts applied
+
+        A removed row is filled by the last row, an edited project keeps
+        its row and a new one is appended. The arrays are gathered with
+        one fancy index each and only the changed rows are extracted and
+        vectorized, so the cost does not include a Python pass over every
+        indexed project.
+        """
+        snapshot = copy.copy(self)
+        project_ids = snapshot.project_ids = list(self.project_ids)
+        projects = snapshot.projects = list(self.projects)
+        features = snapshot.project_features = list(self.project_features)
+        rows = snapshot.rows = dict(self.rows)
+        source = np.arange(len(project_ids))
+
+        for project_id in removals:
+            row = rows.pop(project_id, None)
+            if row is None:
+                continue
+            last = len(project_ids) - 1
+            if row != last:
+                project_ids[row], projects[row], features[row] = project_ids[last], projects[last], features[last]
+                source[row] = source[last]
+                rows[project_ids[row]] = row
+            project_ids.pop()
+            projects.pop()
+            features.pop()
+            source = source[:last]
+
+        changed = {}
+        for project_id, project, project_features in upserts:
+            row = rows.get(project_id)
+            if row is None:
+                row = rows[project_id] = len(project_ids)
+                project_ids.append(project_id)
+                projects.append(project)
+                features.append(project_features)
+            else:
+                projects[row] = project
+                features[row] = project_features
+            changed[row] = project_features
+
+        source = np.concatenate([source, np.full(len(project_ids) - len(source), -1)])
+        source[list(changed)] = -1
+        positions = np.array(sorted(changed), dtype=np.int64)
+        changed = [changed[row] for row in positions]
+
+        def gather(values: np.ndarray, new_values) -> np.ndarray:
+            result = values[np.maximum(source, 0)] if len(values) else np.zeros(len(source), dtype=values.dtype)
+            result[positions] = new_values
+            return result
+
+        snapshot.local_skills = dict(self.local_skills)
+        snapshot.skill_matrix = _rearrange_rows(self.skill_matrix, source, skill_registry.skill_matrix(
+            skill_registry.local_ids((f['required_skills'] for f in changed), snapshot.local_skills, self.base)
+        ), positions)
+        if self.text_vectors is not None:
+            text_rows = sparse.csr_matrix((0, self.text_vectors.shape[1]))
+            if changed:
+                text_rows = sparse.csr_matrix(self.vectorizer.transform([f['combined_text'] for f in changed]))
+            snapshot.text_vectors = _rearrange_rows(self.text_vectors, source, text_rows, positions)
+
+        snapshot.budget = gather(self.budget, [f['budget_range'] or 0 for f in changed])
+        snapshot.duration = gather(self.duration, [f['duration_weeks'] or 0 for f in changed])
+        snapshot.required_experience = gather(self.required_experience, [
+            COMPLEXITY_REQUIREMENTS.get(f['complexity_level'].lower(), 2) for f in changed
+        ])
+        snapshot.category_codes = dict(self.category_codes)
+        snapshot.project_types = gather(self.project_types, snapshot._codes(f['project_type'] for f in changed))
+        snapshot.industries = gather(self.industries, snapshot._codes(f['industry'] for f in changed))
+        return snapshot
+
+    def _codes(self, values) -> np.ndarray:
+        return np.array([
+            self.category_codes.setdefault(value, len(self.category_codes)) for value in values
+        ], dtype=np.int64)
+
+    def project(self, row: int) -> Dict[str, Any]:
+        return self.projects[row]
+
+    def features(self, row: int) -> Dict[str, Any]:
+        return self.project_features[row]
+
+    def matches_any(self, codes: np.ndarray, values: Iterable[Any]) -> np.ndarray:
+        """
+        Whether each coded project type or industry is one of values
+        """
+        wanted = [self.category_codes[value] for value in values if value in self.category_codes]
+        return np.isin(codes, wanted)
+
+    def skill_scores(self, user_skills):
+        """
+        Jaccard and coverage of each project's required skills against a user's
+        """
+        user_skill_ids = skill_registry.local_ids([user_skills], dict(self.local_skills), self.base)[0]
+        return skill_match_scores(self.skill_matrix, user_skill_ids, rows_required=True)
+
+    def text_similarity(self, text: str) -> Optional[np.ndarray]:
+        """
+        TF-IDF similarity of text to every project, None before the vectorizer was fitted
+        """
+        if self.text_vectors is None:
+            return None
+        return cosine_similarity(self.text_vectors, self.vectorizer.transform([text or ''])).ravel()
+
+
+class ProjectFeatureIndex:
+    """
+    Projects held as arrays so a user can be scored against all of them at once
+
+    Keeps the extracted features of every project and a TF-IDF index of
+    their combined_text. Projects are added or changed with upsert; the
+    first query after a change derives a new immutable ProjectIndexSnapshot
+    from the last one, updating only the changed rows. Arrays are rebuilt
+    from scratch only after fit or a vectorizer refit, or once more than
+    rebuild_fraction of the projects changed in between.
+    """
+
+    rebuild_fraction = 0.25
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.text_index = SkillVectorIndex(engine.vectorizer)
+        self._projects: Dict[Any, Dict[str, Any]] = {}
+        self._features: Dict[Any, Dict[str, Any]] = {}
+        self._snapshot: Optional[ProjectIndexSnapshot] = None
+        # Project ids changed since the snapshot, in order; True when upserted
+        self._changes: Dict[Any, bool] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._projects)
+
+    def __contains__(self, project_id):
+        return project_id in self._projects
+
+    def fit(self, projects: Iterable[Dict[str, Any]], key_by_position: bool = False, text: bool = True):
+        """
+        Replace the indexed projects
+
+        Projects are keyed by id, or by list position for a throwaway index
+        over a caller's list that may repeat or lack ids. With text=False the
+        projects are not vectorized and text similarity stays unavailable.
+        """
+        with self._lock:
+            self._projects = {}
+            self._features = {}
+            for position, project in enumerate(projects):
+                key = position if key_by_position else project.get('id')
+                self._projects[key] = project
+                self._features[key] = self.engine.extract_project_features(project)
+            if text:
+                self.refresh_text()
+            else:
+                self.text_index = SkillVectorIndex(self.engine.vectorizer)
+                self._snapshot = None
+
+    def refresh_text(self):
+        """
+        Re-vectorize every project, e.g. after the shared vectorizer is refitted
+        """
+        with self._lock:
+            if vectorizer_is_fitted(self.engine.vectorizer):
+                self.text_index.vectorizer = self.engine.vectorizer
+                self.text_index.fit(
+                    {key: features['combined_text'] for key, features in self._features.items()},
+                    refit=False
+                )
+            self._snapshot = None
+
+    def upsert(self, project: Dict[str, Any]):
+        """
+        Add a new project or refresh an edited one
+        """
+        project_id = project.get('id')
+        with self._lock:
+            features = self.engine.extract_project_features(project)
+            self._projects[project_id] = project
+            self._features[project_id] = features
+            self._changes.pop(project_id, None)
+            self._changes[project_id] = True
+            self.text_index.upsert(project_id, features['combined_text'])
+
+    def remove(self, project_id):
+        """
+        Drop a project, e.g. once it is closed
+        """
+        with self._lock:
+            if self._projects.pop(project_id, None) is not None:
+                self._features.pop(project_id, None)
+                self._changes.pop(project_id, None)
+                self._changes[project_id] = False
+                self.text_index.remove(project_id)
+
+    def snapshot(self) -> ProjectIndexSnapshot:
+        """
+        Consistent arrays of the current projects, updated only if projects changed since the last one
+        """
+        with self._lock:
+            if self._snapshot is not None and self._changes:
+                if len(self._changes) > self.rebuild_fraction * max(len(self._snapshot), 1):
+                    self._snapshot = None
+                else:
+                    self._snapshot = self._snapshot.updated(
+                        [(project_id, self._projects[project_id], self._features[project_id])
+                         for project_id, upserted in self._changes.items() if upserted],
+                        [project_id for project_id, upserted in self._changes.items() if not upserted]
+                    )
+            self._changes = {}
+            if self._snapshot is None:
+                project_ids = list(self._projects)
+                vectorizer = text_vectors = None
+                if self.text_index.is_fitted:
+                    vectorizer = self.text_index.vectorizer
+                    text_vectors = self.text_index.vectors_for(project_ids)
+                self._snapshot = ProjectIndexSnapshot(
+                    project_ids,
+                    [self._projects[project_id] for project_id in project_ids],
+                    [self._features[project_id] for project_id in project_ids],
+                    vectorizer, text_vectors
+                )
+            return self._snapshot
@@ -1,9 +1,9 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from . import projects
 from ..project import ProjectManager
 from ..utils import ai_matching_engine, token_required
-from ..automation_blueprint import automation_engine
-import asyncio
+from ..matching_queue import matching_queue
+from ..match_cache import match_cache
 
 project_manager = ProjectManager()
 
@@ -25,38 +25,101 @@ def create_project(current_user_id):
         if result['success']:
             project_id = result['project_id']
 
-            # Trigger project creation event
-            asyncio.run(automation_engine.trigger_event(
-                'project_created',
-                {'project_id': project_id, 'client_id': current_user_id}
-            ))
-
-            # Trigger AI matching for the new project
-            try:
-                matches = ai_matching_engine.find_matches_for_project(project_id)
-
-                return jsonify({
-                    'success': True,
-                    'project_id': project_id,
-                    'ai_matches': matches[:5],  # Return top 5 matches
-                    'message': 'Project created successfully'
-                }), 201
-
-            except Exception as matching_error:
-                # Project created but matching failed
-                return jsonify({
-                    'success': True,
-                    'project_id': project_id,
-                    'ai_matches': [],
-                    'message': 'Project created but AI matching failed',
-                    'matching_error': str(matching_error)
-                }), 201
+            # Event and AI matching run in a background job; poll its status
+            job_id = matching_queue.submit(
+                current_app._get_current_object(), project_id, current_user_id
+            )
+
+            return jsonify({
+                'success': True,
+                'project_id': project_id,
+                'ai_matches': [],
+                'matching_job_id': job_id,
+                'matching_status': matching_queue.get_job(job_id).status,
+                'message': 'Project created successfully'
+            }), 201
         else:
             return jsonify({'error': result['message']}), 400
 
     except Exception as e:
         return jsonify({'error': f'Failed to create project: {str(e)}'}), 500
 
+@projects.route('/matches/batch', methods=['POST'])
+@token_required
+def find_matches_batch(current_user_id):
+    """
+    Find AI-powered matches for several projects in one pass
+    """
+    try:
+        import datetime
+        start_time = datetime.datetime.utcnow()
+
+        data = request.get_json() or {}
+        project_ids = data.get('project_ids') or []
+        max_projects = current_app.config.get('MATCH_BATCH_MAX_PROJECTS', 100)
+
+        if not isinstance(project_ids, list) or not project_ids:
+            return jsonify({'error': 'project_ids must be a non-empty list'}), 400
+        if not all(isinstance(project_id, str) for project_id in project_ids):
+            return jsonify({'error': 'project_ids must contain project id strings'}), 400
+        if len(project_ids) > max_projects:
+            return jsonify({'error': f'At most {max_projects} projects per batch'}), 400
+        try:
+            max_matches = int(data.get('max_matches', 10))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_matches must be an integer'}), 400
+        if max_matches < 1:
+            return jsonify({'error': 'max_matches must be positive'}), 400
+
+        # Check if user can run matching for every project in the batch
+        owners = project_manager.get_project_owners(project_ids)
+        if any(client_id != current_user_id for client_id in owners.values()):
+            return jsonify({'error': 'Unauthorized to find matches for these projects'}), 403
+
+        results = ai_matching_engine.find_matches_for_projects(
+            project_ids,
+            max_matches=max_matches,
+            persist_top_k=current_app.config.get('MATCH_PERSIST_TOP_K')
+        )
+
+        end_time = datetime.datetime.utcnow()
+        processing_time = (end_time - start_time).total_seconds() * 1000
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'total_projects': len(results),
+            'processing_time_ms': round(processing_time, 2)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Failed to find matches: {str(e)}'}), 500
+
+@projects.route('/matching-jobs/<job_id>', methods=['GET'])
+@token_required
+def get_matching_job(current_user_id, job_id):
+    """
+    Get the status and result of a matching job
+    """
+    try:
+        job = matching_queue.get_job(job_id)
+
+        if not job:
+            return jsonify({'error': 'Matching job not found'}), 404
+
+        # Check if user can view this project's jobs
+        project_data = project_manager.get_project(job.project_id)
+        if not project_data or project_data['client_id'] != current_user_id:
+            return jsonify({'error': 'Unauthorized to view this matching job'}), 403
+
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Failed to get matching job: {str(e)}'}), 500
+
 @projects.route('/<project_id>', methods=['GET'])
 @token_required
 def get_project(current_user_id, project_id):
@@ -77,6 +140,37 @@ def get_project(current_user_id, project_id):
     except Exception as e:
         return jsonify({'error': f'Failed to get project: {str(e)}'}), 500
 
+@projects.route('/<project_id>', methods=['PUT'])
+@token_required
+def update_project(current_user_id, project_id):
+    """
+    Update project details
+    """
+    try:
+        project_data = project_manager.get_project(project_id)
+
+        if not project_data:
+            return jsonify({'error': 'Project not found'}), 404
+
+        # Check if user can update this project
+        if project_data['client_id'] != current_user_id:
+            return jsonify({'error': 'Unauthorized to update this project'}), 403
+
+        data = request.get_json()
+
+        result = project_manager.update_project(project_id, data)
+
+        if result['success']:
+            return jsonify({
+                'success': True,
+                'message': 'Project updated successfully'
+            }), 200
+        else:
+            return jsonify({'error': result['message']}), 400
+
+    except Exception as e:
+        return jsonify({'error': f'Failed to update project: {str(e)}'}), 500
+
 @projects.route('/<project_id>/matches', methods=['GET'])
 @token_required
 def find_matches(current_user_id, project_id):
@@ -87,8 +181,26 @@ def find_matches(current_user_id, project_id):
         import datetime
         start_time = datetime.datetime.utcnow()
 
-        # Get matches using AI engine
-        matches = ai_matching_engine.find_matches_for_project(project_id)
+        candidate_limit = current_app.config.get('MATCH_CANDIDATE_LIMIT')
+        persist_top_k = current_app.config.get('MATCH_PERSIST_TOP_K')
+
+        # Pick up a hot-swapped model first; swapping invalidates the cache
+        ai_matching_engine.reload_models()
+
+        # Serve unchanged projects and freelancer pools from the cache
+        cache_key = match_cache.key(project_id, candidate_limit, persist_top_k)
+        matches = match_cache.get(cache_key)
+        cache_status = 'hit' if matches is not None else 'miss'
+
+        if matches is None:
+            # Get matches using AI engine
+            matches = ai_matching_engine.find_matches_for_project(
+                project_id,
+                candidate_limit=candidate_limit,
+                persist_top_k=persist_top_k
+            )
+            if matches:
+                match_cache.set(cache_key, matches)
 
         end_time = datetime.datetime.utcnow()
         processing_time = (end_time - start_time).total_seconds() * 1000
@@ -97,6 +209,7 @@ def find_matches(current_user_id, project_id):
             'success': True,
             'matches': matches,
             'total_matches': len(matches),
+            'cache': cache_status,
             'processing_time_ms': round(processing_time, 2)
         }), 200
 
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Top-k Ranking Helpers for NeuraSynth Matching
+Select the best k results without sorting or materializing the whole pool
+"""
+
+import numpy as np
+
+
+def top_k_indices(scores, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, ties by lower index
+
+    Uses argpartition so only the selected k entries get sorted. NaN
+    scores rank last, as if they were -inf.
+    """
+    scores = np.asarray(scores, dtype=float)
+    if np.isnan(scores).any():
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+    n = len(scores)
+    k = max(min(int(k), n), 0)
+    if k == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k == n:
+        return np.argsort(-scores, kind='stable')
+
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    selected = np.sort(np.concatenate([above, ties]))
+    return selected[np.argsort(-scores[selected], kind='stable')]
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Scoring Pipeline for NeuraSynth Matching
+Registered feature stages combined with one weight vector, evaluated a batch at a time
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# PerformanceOptimizer matching_engine parameters and the feature each one weights
+OPTIMIZER_PARAMETERS = {
+    'skill_similarity_weight': 'skill',
+    'experience_weight': 'experience',
+    'budget_weight': 'budget',
+    'success_prediction_weight': 'success_prediction'
+}
+
+
+class ScoringPipeline:
+    """
+    Named feature stages plus the weights that blend them into one score
+
+    A stage is a callable that takes the batch the engine packed (a dict of
+    arrays and records) and returns either one feature array or a dict of
+    named feature arrays, so related features can share intermediate work.
+    Feature arrays cover the whole batch, shaped (n,) or (n, m). The score
+    is the weighted sum of the features in weight order, optionally
+    clipped; features without a weight are computed but not blended.
+
+    parameter_names maps generic tuning names ('skill', 'budget', ...) to
+    this pipeline's feature names, which is how one set of optimizer
+    parameters drives every engine's configuration.
+    """
+
+    def __init__(self, name: str, weights: Dict[str, float], clip: Optional[Tuple[float, float]] = None,
+                 parameter_names: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.weights: Dict[str, float] = dict(weights)
+        self.clip = clip
+        self.parameter_names: Dict[str, str] = dict(parameter_names or {})
+        self.stages: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ScoringPipeline({self.name!r}, stages={[name for name, _ in self.stages]}, weights={self.weights})"
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.weights)
+
+    @property
+    def weight_vector(self) -> np.ndarray:
+        """
+        Weights as an array aligned with feature_names
+        """
+        return np.array(list(self.weights.values()), dtype=float)
+
+    def register(self, name: str, stage: Callable[[Dict[str, Any]], Any], weight: Optional[float] = None):
+        """
+        Add or replace a stage; with a weight its feature joins the score
+        """
+        with self._lock:
+            self.stages = [(stage_name, existing) for stage_name, existing in self.stages if stage_name != name]
+            self.stages.append((name, stage))
+            if weight is not None:
+                self.weights[name] = weight
+        return stage
+
+    def unregister(self, name: str):
+        """
+        Drop a stage and its weight
+        """
+        with self._lock:
+            self.stages = [(stage_name, stage) for stage_name, stage in self.stages if stage_name != name]
+            self.weights.pop(name, None)
+
+    def set_weights(self, weights: Dict[str, float]):
+        """
+        Replace the weight vector
+        """
+        with self._lock:
+            self.weights = dict(weights)
+
+    def apply_parameters(self, parameters: Dict[str, float]) -> Dict[str, float]:
+        """
+        Take weights from PerformanceOptimizer matching_engine parameters
+
+        Parameters this pipeline has no feature for are ignored. Returns the
+        weights that changed.
+        """
+        changed = {}
+        with self._lock:
+            weights = dict(self.weights)
+            for parameter, value in parameters.items():
+                feature = self.parameter_names.get(OPTIMIZER_PARAMETERS.get(parameter))
+                if feature in weights and weights[feature] != value:
+                    weights[feature] = value
+                    changed[feature] = value
+            self.weights = weights
+        return changed
+
+    def features(self, batch: Dict[str, Any], names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Run the stages over a batch, optionally only those named
+        """
+        names = set(names) if names is not None else None
+        features = {}
+        for name, stage in list(self.stages):
+            if names is not None and name not in names:
+                continue
+            values = stage(batch)
+            if isinstance(values, dict):
+                features.update(values)
+            else:
+                features[name] = values
+        return features
+
+    def combine(self, features: Dict[str, np.ndarray], shape) -> np.ndarray:
+        """
+        Weighted sum of the feature arrays, accumulated in weight order
+        """
+        total = np.zeros(shape)
+        for name, weight in list(self.weights.items()):
+            values = features.get(name)
+            if values is not None:
+                total += values * weight
+
+        if self.clip is not None:
+            total = np.clip(total, *self.clip)
+        return total
+
+    def score(self, batch: Dict[str, Any], shape) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Features and combined scores for a batch
+        """
+        features = self.features(batch)
+        return self.combine(features, shape), features
+
+    def score_one(self, features: Dict[str, float]) -> float:
+        """
+        Combined score of one candidate's scalar features
+        """
+        total = 0.0
+        for name, weight in list(self.weights.items()):
+            total += features.get(name, 0.0) * weight
+
+        if self.clip is not None:
+            total = max(self.clip[0], min(self.clip[1], total))
+        return total
+
+    def explain(self, features: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Per-feature breakdown of one candidate's score
+
+        Contributions are weight times feature value, before any clipping.
+        """
+        weights = dict(self.weights)
+        return {
+            'score': self.score_one(features),
+            'features': {name: float(value) for name, value in features.items()},
+            'weights': weights,
+            'contributions': {name: float(features.get(name, 0.0) * weight) for name, weight in weights.items()}
+        }
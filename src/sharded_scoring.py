@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Sharded Match Scoring for NeuraSynth
+Scores very large freelancer pools across worker processes over shared memory
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+import numpy as np
+from .ranking import top_k_indices
+
+# Engine rebuilt in each worker process by _init_worker
+_worker_engine = None
+
+
+def _init_worker(feature_weights, scaler, success_model, store_root=None, artifact_version=None):
+    """
+    Build the worker's scoring engine once per process
+
+    With a model artifact store the fitted components are memory mapped
+    from disk, so every worker shares the same pages instead of holding
+    its own unpickled copy.
+    """
+    global _worker_engine
+    from .advanced_ai_systems import AdvancedMatchingEngine
+
+    engine = AdvancedMatchingEngine()
+    engine.feature_weights = dict(feature_weights)
+    if store_root and artifact_version:
+        from .model_store import ModelArtifactStore
+        components = ModelArtifactStore(store_root).load(engine.ARTIFACT_NAME, artifact_version)
+        scaler, success_model = components['scaler'], components['success_model']
+    engine.scaler = scaler
+    engine.success_model = success_model
+    _worker_engine = engine
+
+
+def _score_shard(columns_name, scores_name, shape, start, stop, project_data, k):
+    """
+    Score rows [start, stop) of the shared column array
+
+    Scores are written into the shared output array; only the shard's
+    top-k positions travel back to the parent.
+    """
+    columns_memory = shared_memory.SharedMemory(name=columns_name)
+    scores_memory = shared_memory.SharedMemory(name=scores_name)
+    columns = scores = None
+    try:
+        columns = np.ndarray(shape, dtype=np.float64, buffer=columns_memory.buf)
+        scores = np.ndarray((shape[0],), dtype=np.float64, buffer=scores_memory.buf)
+
+        features = _worker_engine.features_from_columns(columns[start:stop], project_data)
+        shard_scores = _worker_engine.weighted_scores(features, stop - start)
+        scores[start:stop] = shard_scores
+        return start + top_k_indices(shard_scores, k)
+    finally:
+        # Views must go before the buffers can be closed
+        columns = scores = None
+        columns_memory.close()
+        scores_memory.close()
+
+
+class ShardedMatchScorer:
+    """
+    Splits AdvancedMatchingEngine scoring across a process pool
+
+    The parent packs the pool into engine.freelancer_columns once and
+    places it in shared memory; each worker scores a contiguous shard in
+    place and returns its own top k, which the parent merges. Pools under
+    min_rows_per_shard rows per worker are scored in process.
+    """
+
+    def __init__(self, engine, workers: Optional[int] = None, min_rows_per_shard: int = 20000):
+        self.engine = engine
+        self.workers = workers or multiprocessing.cpu_count()
+        self.min_rows_per_shard = min_rows_per_shard
+        self._executor = None
+        self._executor_key = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _model_key(self):
+        engine = self.engine
+        return (
+            engine.model_version, id(engine.scaler), id(engine.success_model),
+            tuple(engine.feature_weights.items())
+        )
+
+    def _get_executor(self):
+        """
+        Pool whose workers hold the engine's current models
+
+        The pool is rebuilt whenever the engine swaps models or weights.
+        """
+        with self._lock:
+            key = self._model_key()
+            if self._executor is None or self._executor_key != key:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+
+                engine = self.engine
+                store = engine.model_store
+                if store is not None and engine.model_version:
+                    initargs = (engine.feature_weights, None, None, store.root_dir, engine.model_version)
+                else:
+                    initargs = (engine.feature_weights, engine.scaler, engine.success_model)
+
+                # Spawned workers do not inherit the web server's threads and locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=initargs
+                )
+                self._executor_key = key
+            return self._executor
+
+    def shard_bounds(self, n: int):
+        """
+        Contiguous (start, stop) row ranges, one per shard
+        """
+        shards = max(1, min(self.workers, n // max(self.min_rows_per_shard, 1)))
+        edges = np.linspace(0, n, shards + 1).astype(int)
+        return [(int(edges[i]), int(edges[i + 1])) for i in range(shards) if edges[i] < edges[i + 1]]
+
+    def score(self, freelancers_data, project_data, k: int, skill_vectors=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every freelancer and select the best k
+
+        Returns (scores, top_indices) with the same values and order as
+        calculate_match_scores followed by top_k_indices.
+        """
+        columns = self.engine.freelancer_columns(freelancers_data, project_data, skill_vectors)
+        return self.score_columns(columns, project_data, k)
+
+    def score_columns(self, columns, project_data, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score already packed freelancer columns and select the best k
+        """
+        n = len(columns)
+        bounds = self.shard_bounds(n)
+
+        if len(bounds) <= 1:
+            features = self.engine.features_from_columns(columns, project_data)
+            scores = self.engine.weighted_scores(features, n)
+            return scores, top_k_indices(scores, k)
+
+        columns_memory = shared_memory.SharedMemory(create=True, size=columns.nbytes)
+        scores_memory = shared_memory.SharedMemory(create=True, size=n * np.dtype(np.float64).itemsize)
+        shared_columns = shared_scores = None
+        try:
+            shared_columns = np.ndarray(columns.shape, dtype=np.float64, buffer=columns_memory.buf)
+            shared_columns[:] = columns
+            shared_scores = np.ndarray((n,), dtype=np.float64, buffer=scores_memory.buf)
+
+            executor = self._get_executor()
+            futures = [
+                executor.submit(
+                    _score_shard, columns_memory.name, scores_memory.name,
+                    columns.shape, start, stop, project_data, k
+                )
+                for start, stop in bounds
+            ]
+            candidates = np.concatenate([future.result() for future in futures])
+            scores = shared_scores.copy()
+
+        finally:
+            shared_columns = shared_scores = None
+            columns_memory.close()
+            columns_memory.unlink()
+            scores_memory.close()
+            scores_memory.unlink()
+
+        # Shard winners in index order so ties break as in one global pass
+        candidates = np.sort(candidates)
+        return scores, candidates[top_k_indices(scores[candidates], k)]
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+                self._executor_key = None
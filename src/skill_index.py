@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Vector Index for NeuraSynth
+Precomputed sparse skill vectors keyed by user id, stored with their fitted vectorizer
+"""
+
+import pickle
+import threading
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Iterable
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+
+def skill_text(skills) -> str:
+    """
+    Build the text that gets vectorized for a skill list or comma separated string
+    """
+    if not skills:
+        return ''
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return ' '.join(skills)
+
+
+def vectorizer_is_fitted(vectorizer) -> bool:
+    """
+    Whether a TfidfVectorizer or IncrementalTfidfVectorizer can transform yet
+    """
+    return hasattr(vectorizer, 'vocabulary_') or getattr(vectorizer, 'is_fitted', False) is True
+
+
+def vectorizer_n_features(vectorizer) -> int:
+    """
+    Width of the vectors a fitted vectorizer produces
+    """
+    if hasattr(vectorizer, 'vocabulary_'):
+        return len(vectorizer.vocabulary_)
+    return vectorizer.n_features
+
+
+class SkillVectorIndex:
+    """
+    Sparse matrix of skill vectors, one row per user id
+
+    Profiles are vectorized once when they are added or changed, so matching
+    only has to vectorize the project side and run one sparse product.
+    Upserts count how many of their terms were absent from the profiles the
+    index was last fitted on; once that share passes refit_threshold,
+    needs_refit tells the owner to rebuild so new skills enter the
+    vocabulary.
+    """
+
+    def __init__(self, vectorizer: Optional[TfidfVectorizer] = None, refit_threshold: float = 0.05):
+        self.vectorizer = vectorizer or TfidfVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        self.user_ids: List[str] = []
+        self.row_index: Dict[str, int] = {}
+        self.texts: Dict[str, str] = {}
+        self.matrix = None
+        self.is_fitted = False
+        self.refit_threshold = refit_threshold
+        self._known_terms = None
+        self._upserted_terms = 0
+        self._unseen_terms = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self):
+        with self._lock:
+            self._apply_pending()
+            return len(self.user_ids)
+
+    def __contains__(self, user_id):
+        with self._lock:
+            if user_id in self._pending:
+                return self._pending[user_id] is not None
+            return user_id in self.row_index
+
+    def fit(self, documents: Dict[str, str], refit: bool = True) -> bool:
+        """
+        Build the index from a mapping of user id to skill text
+
+        With refit=False an already fitted vectorizer is reused as is.
+        """
+        try:
+            with self._lock:
+                user_ids = list(documents.keys())
+                texts = [documents[user_id] or '' for user_id in user_ids]
+
+                if refit:
+                    self.vectorizer.fit(texts)
+
+                self.matrix = sparse.csr_matrix(self.vectorizer.transform(texts)) if texts else None
+                self.user_ids = user_ids
+                self.row_index = {user_id: row for row, user_id in enumerate(user_ids)}
+                self.texts = dict(zip(user_ids, texts))
+                self._pending = {}
+                self._track_terms(texts)
+                self.is_fitted = True
+                self.logger.info(f"Built skill index with {len(user_ids)} profiles")
+                return True
+
+        except Exception as e:
+            self.logger.error(f"Error building skill index: {str(e)}")
+            return False
+
+    def _analyzer(self):
+        # Single words of a text; only vocabulary-based vectorizers drop
+        # unseen terms, hashed ones keep them. New pairings of known words
+        # are left out, since they carry no new skill
+        if hasattr(self.vectorizer, 'vocabulary_') and hasattr(self.vectorizer, 'build_analyzer'):
+            analyzer = self.vectorizer.build_analyzer()
+            return lambda text: [term for term in analyzer(text) if ' ' not in term]
+        return None
+
+    def _track_terms(self, texts: List[str]):
+        """
+        Remember the terms of the fitted profiles and restart the unseen-term count
+        """
+        analyzer = self._analyzer()
+        self._known_terms = None if analyzer is None else {term for text in texts for term in analyzer(text)}
+        self._upserted_terms = 0
+        self._unseen_terms = 0
+
+    def unseen_term_share(self) -> float:
+        """
+        Share of the terms upserted since the last fit that the fitted profiles lacked
+        """
+        with self._lock:
+            return self._unseen_terms / self._upserted_terms if self._upserted_terms else 0.0
+
+    def needs_refit(self) -> bool:
+        """
+        Whether enough new terms arrived through upserts to warrant refitting
+        """
+        return self.is_fitted and self.unseen_term_share() > self.refit_threshold
+
+    def use_vectorizer(self, vectorizer: TfidfVectorizer) -> bool:
+        """
+        Swap in another fitted vectorizer
+
+        Profiles already indexed are re-vectorized with it.
+        """
+        with self._lock:
+            documents = self.documents()
+            self.vectorizer = vectorizer
+            if self.is_fitted:
+                return self.fit(documents, refit=False)
+            return True
+
+    def documents(self) -> Dict[str, str]:
+        """
+        Current text of every indexed profile, pending edits included
+        """
+        with self._lock:
+            self._apply_pending()
+            return {user_id: self.texts.get(user_id, '') for user_id in self.user_ids}
+
+    def upsert(self, user_id: str, text: str) -> bool:
+        """
+        Add or refresh a single profile
+
+        Terms outside the fitted vocabulary are ignored until the next
+        refit; they count towards needs_refit.
+        """
+        if not self.is_fitted:
+            return False
+
+        text = text or ''
+        with self._lock:
+            if self._current_text(user_id) == text:
+                return True
+            analyzer = self._analyzer()
+            if analyzer is not None and self._known_terms is not None:
+                terms = analyzer(text)
+                self._upserted_terms += len(terms)
+                self._unseen_terms += sum(1 for term in terms if term not in self._known_terms)
+            self._pending[user_id] = (text, sparse.csr_matrix(self.vectorizer.transform([text])))
+            return True
+
+    def remove(self, user_id: str):
+        """
+        Drop a profile from the index
+        """
+        with self._lock:
+            if user_id in self.row_index or user_id in self._pending:
+                self._pending[user_id] = None
+
+    def _current_text(self, user_id):
+        """
+        Text the index holds for user_id, including queued changes
+        """
+        if user_id in self._pending:
+            entry = self._pending[user_id]
+            return entry[0] if entry is not None else None
+        return self.texts.get(user_id)
+
+    def _apply_pending(self):
+        """
+        Fold queued upserts and removals into the CSR matrix
+        """
+        if not self._pending:
+            return
+
+        keep = [row for row, user_id in enumerate(self.user_ids) if user_id not in self._pending]
+        user_ids = [self.user_ids[row] for row in keep]
+        blocks = [self.matrix[keep]] if self.matrix is not None and keep else []
+
+        for user_id, entry in self._pending.items():
+            if entry is None:
+                self.texts.pop(user_id, None)
+                continue
+            text, vector = entry
+            user_ids.append(user_id)
+            blocks.append(vector)
+            self.texts[user_id] = text
+
+        self.matrix = sparse.vstack(blocks, format='csr') if blocks else None
+        self.user_ids = user_ids
+        self.row_index = {user_id: row for row, user_id in enumerate(user_ids)}
+        self._pending = {}
+
+    def vectors_for(self, user_ids: Iterable[str], texts: Optional[List[str]] = None):
+        """
+        Get the stored vectors for user_ids as a CSR matrix in the given order
+
+        Unknown ids get an all-zero row. When texts are given, profiles whose
+        text no longer matches the stored one are re-vectorized first.
+        """
+        user_ids = list(user_ids)
+        with self._lock:
+            if texts is not None:
+                for user_id, text in zip(user_ids, texts):
+                    if self._current_text(user_id) != (text or ''):
+                        self.upsert(user_id, text)
+
+            self._apply_pending()
+
+            n_features = vectorizer_n_features(self.vectorizer)
+            if self.matrix is None:
+                return sparse.csr_matrix((len(user_ids), n_features))
+
+            rows = [self.row_index.get(user_id, -1) for user_id in user_ids]
+            known = [i for i, row in enumerate(rows) if row >= 0]
+            if len(known) == len(rows):
+                return self.matrix[rows]
+
+            selector = sparse.csr_matrix(
+                ([1.0] * len(known), (known, [rows[i] for i in known])),
+                shape=(len(rows), self.matrix.shape[0])
+            )
+            return sparse.csr_matrix(selector @ self.matrix)
+
+    def similarity(self, text: str, user_ids: Optional[Iterable[str]] = None):
+        """
+        Cosine similarity between text and indexed profiles
+
+        Returns (user_ids, scores) for the whole index, or scores aligned with
+        user_ids when they are given.
+        """
+        query = self.vectorizer.transform([text or ''])
+        with self._lock:
+            if user_ids is None:
+                self._apply_pending()
+                ids = list(self.user_ids)
+                if self.matrix is None:
+                    return ids, np.zeros(0)
+                return ids, cosine_similarity(self.matrix, query).ravel()
+
+        vectors = self.vectors_for(user_ids)
+        return cosine_similarity(vectors, query).ravel()
+
+    def save(self, path: str):
+        """
+        Persist the index together with its fitted vectorizer
+        """
+        with self._lock:
+            self._apply_pending()
+            state = {
+                'vectorizer': self.vectorizer,
+                'user_ids': self.user_ids,
+                'texts': self.texts,
+                'matrix': self.matrix,
+                'is_fitted': self.is_fitted
+            }
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillVectorIndex':
+        """
+        Load an index previously written with save
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        index = cls(state['vectorizer'])
+        index.user_ids = state['user_ids']
+        index.row_index = {user_id: row for row, user_id in enumerate(index.user_ids)}
+        index.texts = state['texts']
+        index.matrix = state['matrix']
+        index.is_fitted = state['is_fitted']
+        return index
+
+
+# Shared index of freelancer skills, kept current by profile updates
+freelancer_skill_index = SkillVectorIndex()
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Registry for NeuraSynth
+Central skill dictionary mapping skill names and their aliases to integer ids
+"""
+
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+
+# Common spellings folded onto one canonical skill name
+DEFAULT_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'node.js': 'node',
+    'nodejs': 'node',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'cpp': 'c++',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp'
+}
+
+
+class SkillRegistry:
+    """
+    Interns skills so profiles and projects can hold them as id arrays
+
+    A skill is canonicalized (trimmed, lowercased, whitespace collapsed and
+    mapped through the alias table) and then given the next free id. Ids are
+    never reused or renumbered, so arrays built at different times stay
+    comparable.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.aliases: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for alias, canonical in (DEFAULT_ALIASES if aliases is None else aliases).items():
+            self.add_alias(alias, canonical)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, skill):
+        return self.canonical(skill) in self.ids
+
+    @staticmethod
+    def _clean(skill) -> str:
+        return ' '.join(str(skill).lower().split())
+
+    def add_alias(self, alias: str, canonical: str):
+        """
+        Fold alias onto canonical from now on
+        """
+        self.aliases[self._clean(alias)] = self._clean(canonical)
+
+    def canonical(self, skill) -> str:
+        """
+        Canonical name of a skill or alias
+        """
+        name = self._clean(skill)
+        return self.aliases.get(name, name)
+
+    def intern(self, skill) -> int:
+        """
+        Id of a skill, assigning the next id to an unseen one
+        """
+        name = self.canonical(skill)
+        skill_id = self.ids.get(name)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self.ids.setdefault(name, len(self.names))
+                if skill_id == len(self.names):
+                    self.names.append(name)
+        return skill_id
+
+    def lookup(self, skill) -> Optional[int]:
+        """
+        Id of a known skill, None otherwise
+        """
+        return self.ids.get(self.canonical(skill))
+
+    def name(self, skill_id: int) -> str:
+        return self.names[skill_id]
+
+    @staticmethod
+    def parse(skills) -> List[str]:
+        """
+        Skill names from any stored form
+
+        Accepts a list, a dict of skill to level, a JSON string of either,
+        or a comma separated string.
+        """
+        if not skills:
+            return []
+        if isinstance(skills, str):
+            try:
+                parsed = json.loads(skills)
+            except ValueError:
+                parsed = None
+            if not isinstance(parsed, (dict, list)):
+                return skills.split(',')
+            skills = parsed
+        if isinstance(skills, dict):
+            return list(skills.keys())
+        return list(skills)
+
+    def skill_ids(self, skills, add: bool = False) -> np.ndarray:
+        """
+        Sorted unique ids of a skill collection in any stored form
+
+        Unknown skills are dropped; pass add=True where profiles or projects
+        are written to intern them instead.
+        """
+        ids = set()
+        for skill in self.parse(skills):
+            if not self._clean(skill):
+                continue
+            skill_id = self.intern(skill) if add else self.lookup(skill)
+            if skill_id is not None:
+                ids.add(skill_id)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def local_ids(self, collections: Iterable, scratch: Optional[Dict[str, int]] = None,
+                  base: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Sorted unique ids of several skill collections scored together, without growing the registry
+
+        Skills the registry has not seen, or learned at or after base
+        (its size by default), get temporary ids from base on. They are
+        recorded in scratch, so a later call with the same scratch and base
+        gives the same skills the same ids.
+        """
+        base = len(self) if base is None else base
+        scratch = {} if scratch is None else scratch
+        arrays = []
+        for skills in collections:
+            ids = set()
+            for skill in self.parse(skills):
+                if not self._clean(skill):
+                    continue
+                name = self.canonical(skill)
+                skill_id = self.ids.get(name)
+                if skill_id is None or skill_id >= base:
+                    skill_id = scratch.setdefault(name, base + len(scratch))
+                ids.add(skill_id)
+            arrays.append(np.array(sorted(ids), dtype=np.int32))
+        return arrays
+
+    def _width(self, id_arrays: List[np.ndarray]) -> int:
+        # Registry size, or more when temporary ids run past it
+        return max([len(self)] + [int(ids[-1]) + 1 for ids in id_arrays if len(ids)])
+
+    def bitsets(self, id_arrays: Iterable[np.ndarray]) -> np.ndarray:
+        """
+        Packed uint64 bitsets, one row per id array; bit i of a row is skill id i
+        """
+        id_arrays = list(id_arrays)
+        return pack_skill_ids(id_arrays, bitset_words(self._width(id_arrays)))
+
+    def skill_matrix(self, id_arrays: Iterable[np.ndarray]) -> sparse.csr_matrix:
+        """
+        Binary CSR matrix with one row per id array and one column per skill id
+        """
+        id_arrays = list(id_arrays)
+        indptr = np.zeros(len(id_arrays) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(ids) for ids in id_arrays])
+        indices = np.concatenate(id_arrays) if id_arrays else np.zeros(0, dtype=np.int32)
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(id_arrays), self._width(id_arrays))
+        )
+
+
+def skill_match_scores(skill_matrix: sparse.csr_matrix, skill_ids: np.ndarray,
+                       rows_required: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Jaccard and coverage of every row of a binary skill matrix against one id array
+
+    Coverage is the share of the required skills that are present: those
+    in skill_ids when the rows are candidates, or each row's own when
+    rows_required is set and the rows are projects. One sparse product
+    gives every overlap; rows or queries without skills score zero.
+    """
+    n = skill_matrix.shape[0]
+    jaccard = np.zeros(n)
+    coverage = np.zeros(n)
+    if len(skill_ids) == 0:
+        return jaccard, coverage
+
+    query = np.zeros(skill_matrix.shape[1])
+    query[skill_ids[skill_ids < skill_matrix.shape[1]]] = 1.0
+    overlap = skill_matrix @ query
+    counts = np.diff(skill_matrix.indptr)
+
+    scored = counts > 0
+    union = counts[scored] + len(skill_ids) - overlap[scored]
+    jaccard[scored] = overlap[scored] / union
+    coverage[scored] = overlap[scored] / (counts[scored] if rows_required else len(skill_ids))
+    return jaccard, coverage
+
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """
+        Set bits per row of a uint64 bitset matrix
+        """
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """
+        Set bits per row of a uint64 bitset matrix, via a byte lookup table
+        """
+        words = np.ascontiguousarray(words)
+        return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int64)
+
+
+def bitset_words(n_skills: int) -> int:
+    return max(1, (n_skills + 63) // 64)
+
+
+def pack_skill_ids(id_arrays: Iterable[np.ndarray], n_words: int) -> np.ndarray:
+    """
+    Pack sorted id arrays into an (n, n_words) uint64 bitset matrix
+    """
+    id_arrays = list(id_arrays)
+    bits = np.zeros((len(id_arrays), n_words), dtype=np.uint64)
+    lengths = [len(ids) for ids in id_arrays]
+    if sum(lengths):
+        rows = np.repeat(np.arange(len(id_arrays)), lengths)
+        ids = np.concatenate(id_arrays).astype(np.int64)
+        # Ids within a row are unique, so adding the bits is the same as or-ing them
+        np.add.at(bits, (rows, ids >> 6), np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+    return bits
+
+
+def pad_words(bits: np.ndarray, n_words: int) -> np.ndarray:
+    """
+    Zero-pad the last (word) axis of bitsets out to n_words, so bitsets packed at different widths line up
+    """
+    if bits.shape[-1] >= n_words:
+        return bits
+    padding = [(0, 0)] * (bits.ndim - 1) + [(0, n_words - bits.shape[-1])]
+    return np.pad(bits, padding)
+
+
+def bitset_skill_scores(freelancer_bits: np.ndarray, project_bits: np.ndarray,
+                        weights: Tuple[float, float] = (0.6, 0.4)) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Jaccard, coverage and their weighted blend for every freelancer at once
+
+    freelancer_bits is an (n, words) bitset matrix and project_bits one
+    project's bitset row. Overlap and union come from popcounts of the
+    and/or of the rows; bitsets packed before the registry grew are padded
+    with zero words. Freelancers or projects without skills score zero,
+    as in calculate_skill_match_score.
+    """
+    n_words = max(freelancer_bits.shape[-1], project_bits.shape[-1])
+    freelancer_bits = pad_words(freelancer_bits, n_words)
+    project_bits = pad_words(project_bits.reshape(1, -1), n_words)
+
+    n = freelancer_bits.shape[0]
+    jaccard = np.zeros(n)
+    coverage = np.zeros(n)
+    required = int(popcount(project_bits)[0])
+    if required:
+        overlap = popcount(freelancer_bits & project_bits)
+        union = popcount(freelancer_bits | project_bits)
+        jaccard = overlap / union
+        coverage = overlap / required
+    return jaccard, coverage, weights[0] * jaccard + weights[1] * coverage
+
+
+def normalize_skill(skill) -> str:
+    """
+    Normalize a skill name for lookups
+    """
+    return skill_registry.canonical(skill)
+
+
+# Skill dictionary shared by the feature store, project index and scorers
+skill_registry = SkillRegistry()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Team Assembly for NeuraSynth
+Picks a team that covers a project's required skills within its budget, over packed skill bitsets
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .skill_registry import SkillRegistry, pad_words, popcount, skill_registry
+
+# Billed hours per team member per week, as in analyze_team_composition
+HOURS_PER_WEEK = 40
+
+
+class TeamCandidatePool:
+    """
+    Freelancers packed for team assembly: skill bitsets, hourly rates and an optional score
+
+    Build it once per pool and reuse it across projects; assemble only
+    touches the bitset words the project's required skills fall in. The
+    score breaks ties between candidates adding the same coverage and
+    fills the seats left once every required skill is covered.
+    """
+
+    def __init__(self, user_ids: List[Any], skill_bits: np.ndarray, hourly_rates: np.ndarray,
+                 scores: Optional[np.ndarray] = None, members: Optional[List[Dict[str, Any]]] = None,
+                 registry: Optional[SkillRegistry] = None, store=None,
+                 local_skills: Optional[Dict[str, int]] = None, base: Optional[int] = None):
+        self.registry = skill_registry if registry is None else registry
+        self.store = store
+        # Temporary ids of member skills the registry did not know when the pool was packed
+        self.local_skills = local_skills or {}
+        self.base = len(self.registry) if base is None else base
+        self.user_ids = list(user_ids)
+        self.skill_bits = skill_bits
+        # Missing rates count as zero, as in analyze_team_composition
+        self.hourly_rates = np.nan_to_num(np.asarray(hourly_rates, dtype=float))
+        self.scores = None if scores is None else np.asarray(scores, dtype=float)
+        self.members = members
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    @classmethod
+    def from_users(cls, users: List[Dict[str, Any]], registry: SkillRegistry = None,
+                   scores: Optional[np.ndarray] = None) -> 'TeamCandidatePool':
+        """
+        Pool of ProjectMatchingEngine user dicts
+        """
+        registry = skill_registry if registry is None else registry
+        local_skills, base = {}, len(registry)
+        skill_ids = registry.local_ids((user.get('skills', []) for user in users), local_skills, base)
+        return cls(
+            [user.get('id') for user in users],
+            registry.bitsets(skill_ids),
+            [user.get('hourly_rate', 0) or 0 for user in users],
+            scores=scores,
+            members=users,
+            registry=registry,
+            local_skills=local_skills,
+            base=base
+        )
+
+    @classmethod
+    def from_feature_store(cls, store, scores: Optional[np.ndarray] = None) -> 'TeamCandidatePool':
+        """
+        Pool over a loaded FreelancerFeatureStore, reusing its cached bitsets
+        """
+        return cls(
+            store.user_ids, store.skill_bitsets(), store.column('hourly_rate'),
+            scores=scores, registry=store.registry, store=store
+        )
+
+    def member(self, position: int) -> Dict[str, Any]:
+        """
+        User dict of one pool position, rebuilt from the feature store when the pool has no dicts
+        """
+        if self.members is not None:
+            return self.members[position]
+        user = {'id': self.user_ids[position], 'hourly_rate': float(self.hourly_rates[position])}
+        if self.store is not None:
+            experience = self.store.column('experience_years')[position]
+            user['skills'] = self.store.skills[position]
+            user['experience_years'] = 0 if np.isnan(experience) else float(experience)
+        return user
+
+    def assemble(self, required_skills, team_size: int, budget: Optional[float] = None,
+                 duration_weeks: float = 0, beam_width: int = 1) -> Dict[str, Any]:
+        """
+        Team for a project's required skills; see assemble_team
+
+        Required skills nobody has get temporary ids past the pool's, so
+        they count against coverage instead of silently dropping out.
+        """
+        project_ids = self.registry.local_ids([required_skills], dict(self.local_skills), self.base)
+        project_bits = self.registry.bitsets(project_ids)[0]
+        return assemble_team(
+            self.skill_bits, self.hourly_rates, project_bits, team_size,
+            budget=budget, duration_weeks=duration_weeks, scores=self.scores, beam_width=beam_width
+        )
+
+
+def _ranked_candidates(gains: np.ndarray, scores: np.ndarray, rates: np.ndarray, allowed: np.ndarray,
+                       count: int) -> np.ndarray:
+    """
+    The best allowed candidates: most new coverage, then highest score, then cheapest rate, then lowest position
+    """
+    candidates = np.flatnonzero(allowed)
+    if len(candidates) > count:
+        # Only candidates at or above the count-th largest gain can make the cut
+        threshold = np.partition(gains[candidates], len(candidates) - count)[len(candidates) - count]
+        candidates = candidates[gains[candidates] >= threshold]
+    order = np.lexsort((candidates, rates[candidates], -scores[candidates], -gains[candidates]))
+    return candidates[order[:count]]
+
+
+def assemble_team(freelancer_bits: np.ndarray, hourly_rates: np.ndarray, project_bits: np.ndarray,
+                  team_size: int, budget: Optional[float] = None, duration_weeks: float = 0,
+                  scores: Optional[np.ndarray] = None, beam_width: int = 1) -> Dict[str, Any]:
+    """
+    Choose up to team_size freelancers maximizing required-skill coverage within budget
+
+    Coverage is a submodular set function, so adding at each step the
+    member with the largest marginal gain is the classic greedy
+    (1 - 1/e)-approximation; beam_width > 1 keeps that many partial teams
+    per step instead of one. Only the words of the project bitset holding
+    required skills are scanned, so a step is one popcount over an
+    (n, few words) matrix. The team cost is the sum of member rates times
+    HOURS_PER_WEEK times duration_weeks and must stay within budget when
+    one is given. Seats left once coverage stops growing go to the best
+    scored affordable candidates (by default the most required skills
+    held); the team is smaller than team_size only when nobody else fits.
+
+    Returns the chosen positions in pick order, the number of required
+    skills covered out of the total, and the weekly and total cost.
+    """
+    n = freelancer_bits.shape[0]
+    n_words = max(freelancer_bits.shape[-1], project_bits.shape[-1])
+    project_bits = pad_words(project_bits.reshape(1, -1), n_words)[0]
+    words = np.flatnonzero(project_bits)
+    required = int(popcount(project_bits.reshape(1, -1))[0])
+
+    # Each freelancer reduced to the required skills they hold
+    relevant = pad_words(freelancer_bits, n_words)[:, words] & project_bits[words]
+    rates = np.nan_to_num(np.asarray(hourly_rates, dtype=float))
+    if scores is None:
+        scores = popcount(relevant) / required if required else np.zeros(n)
+    scores = np.asarray(scores, dtype=float)
+
+    member_cost = rates * HOURS_PER_WEEK * (duration_weeks or 0)
+    limit = budget if budget else np.inf
+
+    # A beam entry is (positions, covered words, covered count, cost, score sum)
+    beam: List[Tuple[Tuple[int, ...], np.ndarray, int, float, float]] = [
+        ((), np.zeros(len(words), dtype=np.uint64), 0, 0.0, 0.0)
+    ]
+    for _ in range(min(team_size, n)):
+        expanded = {}
+        for positions, covered, covered_count, cost, score_sum in beam:
+            allowed = member_cost <= limit - cost
+            allowed[list(positions)] = False
+            if not allowed.any():
+                continue
+            gains = popcount(relevant & ~covered) if len(words) else np.zeros(n, dtype=np.int64)
+            for position in _ranked_candidates(gains, scores, rates, allowed, beam_width):
+                team = tuple(sorted(positions + (int(position),)))
+                if team in expanded:
+                    continue
+                expanded[team] = (
+                    positions + (int(position),), covered | relevant[position],
+                    covered_count + int(gains[position]), cost + member_cost[position],
+                    score_sum + scores[position]
+                )
+        if not expanded:
+            break
+        # Most coverage, then highest score sum, then cheapest
+        beam = sorted(expanded.values(), key=lambda entry: (-entry[2], -entry[4], entry[3]))[:beam_width]
+
+    positions, _, covered_count, cost, _ = beam[0]
+    weekly_rate = float(rates[list(positions)].sum()) if positions else 0.0
+    return {
+        'positions': list(positions),
+        'covered_skills': covered_count,
+        'required_skills': required,
+        'weekly_cost': weekly_rate * HOURS_PER_WEEK,
+        'estimated_total_cost': float(cost)
+    }
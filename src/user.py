@@ -1,4 +1,34 @@
 from .models import User, db
+from .skill_index import freelancer_skill_index, skill_text
+from .match_cache import match_cache
+from .project_matching import project_matching_engine
+from .skill_registry import skill_registry
+
+def matching_user(user):
+    """
+    A user row in the dict shape ProjectMatchingEngine reads
+    """
+    return {
+        'id': user.id,
+        'skills': skill_registry.parse(user.skills),
+        'experience_years': user.experience_years or 0,
+        'hourly_rate': user.hourly_rate or 0,
+        'availability_hours': user.availability_hours_per_week or 40,
+        'rating': user.average_rating or 0,
+        'location': user.location or ''
+    }
+
+def refresh_freelancer_profile(user):
+    """
+    Propagate a saved profile change to the precomputed matching indexes
+    """
+    if user.user_type == 'freelancer':
+        freelancer_skill_index.upsert(user.id, skill_text(user.skills))
+        project_matching_engine.update_user_index(matching_user(user))
+    else:
+        freelancer_skill_index.remove(user.id)
+        project_matching_engine.remove_user_from_index(user.id)
+    match_cache.invalidate_pool()
 
 class UserManager:
     def get_user_profile(self, user_id):
@@ -19,5 +49,6 @@ class UserManager:
                 if hasattr(user, key) and key != 'id':
                     setattr(user, key, value)
             db.session.commit()
+            refresh_freelancer_profile(user)
             return {'success': True}
         return {'success': False, 'message': 'User not found'}
@@ -4,6 +4,8 @@ from .project import ProjectManager
 from .matching import MatchingEngine
 from .contributors_hub import ContributorsHub
 from .advanced_ai_systems import AdvancedMatchingEngine
+from .skill_index import freelancer_skill_index
+from .feature_store import freelancer_feature_store
 from flask import request, jsonify
 import jwt
 from functools import wraps
@@ -15,7 +17,10 @@ user_manager = UserManager()
 project_manager = ProjectManager()
 matching_engine = MatchingEngine()
 contributors_hub = ContributorsHub()
-ai_matching_engine = AdvancedMatchingEngine()
+ai_matching_engine = AdvancedMatchingEngine(
+    skill_index=freelancer_skill_index,
+    feature_store=freelancer_feature_store
+)
 
 # JWT token verification decorator
 def token_required(f):
@@ -9,6 +9,8 @@ if basedir not in os.sys.path:
 
 from src.app import create_app
 from src.models import db, User
+from src.user import UserManager
+from src.project_matching import project_matching_engine
 
 class AuthTestCase(unittest.TestCase):
     def setUp(self):
@@ -37,6 +39,18 @@ class AuthTestCase(unittest.TestCase):
         self.assertEqual(User.query.count(), 1)
         self.assertEqual(User.query.first().email, 'test@example.com')
 
+    def test_profile_changes_reach_matching_engine(self):
+        self.test_register()
+        user = User.query.first()
+        self.assertIn(user.id, project_matching_engine.market_stats)
+
+        UserManager().update_user_profile(user.id, {'skills': 'python,indexed-skill'})
+        self.assertEqual(project_matching_engine.market_stats.skill_frequency('indexed-skill'), 1)
+
+        UserManager().update_user_profile(user.id, {'user_type': 'client'})
+        self.assertNotIn(user.id, project_matching_engine.market_stats)
+        self.assertEqual(project_matching_engine.market_stats.skill_frequency('indexed-skill'), 0)
+
     def test_login(self):
         self.test_register()
         response = self.client.post(
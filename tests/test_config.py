@@ -29,5 +29,9 @@ class TestConfig(unittest.TestCase):
             app.config['SQLALCHEMY_DATABASE_URI'], 'sqlite:///' + os.path.join(basedir, 'database', 'data.sqlite')
         )
 
+    def test_model_store_is_opt_in(self):
+        if not os.environ.get('MODEL_ARTIFACT_DIR'):
+            self.assertIsNone(create_app('production').config['MODEL_ARTIFACT_DIR'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import os
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.app import create_app
+from src.models import db, User
+from src.feature_store import FreelancerFeatureStore
+from src.skill_registry import SkillRegistry
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.user import UserManager
+
+class FeatureStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        db.session.add_all([
+            User(email='a@example.com', user_type='freelancer', skills='Python,SQL',
+                 experience_years=3, hourly_rate=40, completion_rate=0.9, location='cairo'),
+            User(email='b@example.com', user_type='freelancer', skills='react',
+                 experience_years=None, hourly_rate=25),
+            User(email='c@example.com', user_type='client')
+        ])
+        db.session.commit()
+        self.store = FreelancerFeatureStore(SkillRegistry())
+        self.store.load()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def user(self, email):
+        return User.query.filter_by(email=email).first()
+
+    def test_load_builds_columns(self):
+        self.assertEqual(len(self.store), 2)
+        a = self.store.row_index[self.user('a@example.com').id]
+        b = self.store.row_index[self.user('b@example.com').id]
+        self.assertEqual(self.store.column('hourly_rate')[a], 40)
+        self.assertTrue(np.isnan(self.store.column('experience_years')[b]))
+        self.assertEqual(self.store.skill_texts[a], 'Python SQL')
+
+        matrix = self.store.skill_matrix()
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix[a, self.store.skill_vocabulary['python']], 1)
+
+    def test_refresh_applies_changes_since_watermark(self):
+        manager = UserManager()
+        a = self.user('a@example.com')
+        manager.update_user_profile(a.id, {'hourly_rate': 60, 'skills': 'go'})
+        manager.update_user_profile(self.user('b@example.com').id, {'user_type': 'client'})
+        manager.update_user_profile(self.user('c@example.com').id, {'user_type': 'freelancer', 'skills': 'sql'})
+
+        self.store.refresh()
+        self.assertEqual(len(self.store), 2)
+        self.assertNotIn(self.user('b@example.com').id, self.store)
+        self.assertIn(self.user('c@example.com').id, self.store)
+        row = self.store.row_index[a.id]
+        self.assertEqual(self.store.column('hourly_rate')[row], 60)
+        self.assertEqual(self.store.skill_matrix().shape[0], 2)
+
+    def test_refresh_keeps_skill_caches_when_skills_are_unchanged(self):
+        manager = UserManager()
+        a = self.user('a@example.com')
+        manager.update_user_profile(a.id, {'hourly_rate': 55})
+        self.store.refresh()
+        matrix, bitsets = self.store.skill_matrix(), self.store.skill_bitsets()
+
+        # The row at the watermark is fetched again but changed nothing
+        self.assertGreater(self.store.refresh(), 0)
+        self.assertIs(self.store.skill_matrix(), matrix)
+        self.assertIs(self.store.skill_bitsets(), bitsets)
+
+        manager.update_user_profile(a.id, {'skills': 'go,python'})
+        self.store.refresh()
+        self.assertIsNot(self.store.skill_matrix(), matrix)
+        self.assertIsNot(self.store.skill_bitsets(), bitsets)
+
+    def test_refresh_reloads_after_hard_delete(self):
+        a_id, b_id = self.user('a@example.com').id, self.user('b@example.com').id
+        db.session.delete(self.user('a@example.com'))
+        db.session.commit()
+
+        # The count check is throttled, so the delete shows up once the interval has passed
+        self.store.refresh()
+        self.assertIn(a_id, self.store)
+        self.store.delete_checked_at -= self.store.delete_check_interval
+        self.store.refresh()
+        self.assertEqual(self.store.user_ids, [b_id])
+
+    def test_store_columns_match_dict_columns(self):
+        engine = AdvancedMatchingEngine(feature_store=self.store)
+        engine.build_skill_index()
+        project_data = {'required_skills': ['python'], 'budget_max': 2000, 'location': 'cairo'}
+        freelancers_data = [
+            {
+                'skills': self.store.skills[row],
+                'experience_years': user.experience_years,
+                'hourly_rate': user.hourly_rate,
+                'availability_hours_per_week': user.availability_hours_per_week,
+                'location': user.location,
+                'completion_rate': user.completion_rate
+            }
+            for row, user in enumerate(db.session.get(User, user_id) for user_id in self.store.user_ids)
+        ]
+        np.testing.assert_array_equal(
+            engine.store_columns(self.store, np.arange(len(self.store)), project_data),
+            engine.freelancer_columns(freelancers_data, project_data)
+        )
+
+if __name__ == '__main__':
+    unittest.main()
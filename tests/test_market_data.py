@@ -0,0 +1,114 @@
+import unittest
+import os
+from datetime import datetime, timedelta
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.market_data import MarketDataService, skill_set_key
+from src.project_matching import AIProjectRecommendationEngine
+
+class MarketDataServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2026, 1, 1)
+        self.now = self.start + timedelta(days=39, hours=23)
+        self.service = MarketDataService(window_seconds=10 * 86400, bucket_seconds=86400, min_outcomes=2,
+                                         clock=lambda: self.now)
+        self.rng = np.random.default_rng(9)
+
+    def random_project(self):
+        return {
+            'required_skills': list(self.rng.choice(['python', 'React', 'sql', 'golang', 'nlp'],
+                                                    self.rng.integers(1, 4), replace=False)),
+            'project_type': str(self.rng.choice(['web', 'ai'])),
+            'budget_range': int(self.rng.integers(0, 20000)),
+            'duration_weeks': int(self.rng.integers(0, 12)),
+            'status': str(self.rng.choice(['completed', 'cancelled']))
+        }
+
+    def test_rolling_window_matches_recount(self):
+        events = []
+        for day in range(40):
+            for _ in range(int(self.rng.integers(0, 6))):
+                project = self.random_project()
+                at = self.start + timedelta(days=day, hours=int(self.rng.integers(0, 24)))
+                events.append((day, project))
+                self.service.record_created(project, at)
+                self.service.record_finished(project, at=at)
+
+        recent = [project for day, project in events if day > 39 - 10]
+        skills = {}
+        for project in recent:
+            for skill in skill_set_key(project['required_skills']):
+                skills[skill] = skills.get(skill, 0) + 1
+        self.assertEqual(dict(self.service.skill_counts), skills)
+
+        for project_type in ('web', 'ai'):
+            budgets = sorted(p['budget_range'] for p in recent if p['project_type'] == project_type and p['budget_range'] > 0)
+            self.assertAlmostEqual(self.service.average_budget(project_type), np.mean(budgets))
+            self.assertEqual(self.service.budgets[project_type], budgets)
+            self.assertAlmostEqual(self.service.budget_percentiles(project_type)['p75'], np.percentile(budgets, 75))
+
+        key = ('python', 'sql')
+        outcomes = [p['status'] == 'completed' for p in recent if skill_set_key(p['required_skills']) == key]
+        if len(outcomes) >= 2:
+            self.assertAlmostEqual(self.service.completion_rate(['SQL', 'python']), np.mean(outcomes))
+
+    def test_completion_rate_falls_back_to_single_skills(self):
+        self.now = self.start
+        self.service.record_finished({'required_skills': ['python']}, 'completed', self.start)
+        self.service.record_finished({'required_skills': ['python', 'sql']}, 'cancelled', self.start)
+        self.assertEqual(self.service.completion_rate(['python', 'sql']), 1 / 3)
+        self.assertIsNone(self.service.completion_rate(['cobol']))
+
+    def test_skill_set_key(self):
+        self.assertEqual(skill_set_key('SQL, python,,'), ('python', 'sql'))
+        self.assertEqual(skill_set_key(['python', 3]), ('3', 'python'))
+
+    def test_late_events_outside_window_are_dropped(self):
+        self.service.record_created({'required_skills': ['go']}, self.start + timedelta(days=30))
+        self.service.record_created({'required_skills': ['go']}, self.start)
+        self.assertEqual(self.service.trending_skills(), ['go'])
+        self.assertEqual(self.service.skill_counts['go'], 1)
+
+    def test_reads_expire_without_new_events(self):
+        self.service.record_created({'required_skills': ['go'], 'budget_range': 100}, self.start + timedelta(days=35))
+        self.service.record_finished({'required_skills': ['go']}, 'completed', self.start + timedelta(days=35))
+        self.assertEqual(self.service.trending_skills(), ['go'])
+
+        self.now = self.start + timedelta(days=46)
+        self.assertEqual(self.service.trending_skills(), [])
+        self.assertEqual(self.service.average_budget('general'), 0)
+        self.assertIsNone(self.service.completion_rate(['go']))
+        self.assertEqual(dict(self.service.skill_set_outcomes), {})
+        self.assertEqual(dict(self.service.skill_outcomes), {})
+
+class ProjectImprovementsTestCase(unittest.TestCase):
+    def test_suggestions_from_service_aggregates(self):
+        engine = AIProjectRecommendationEngine(MarketDataService(min_outcomes=1))
+        for i in range(10):
+            history = {'required_skills': ['Python', 'NLP'], 'project_type': 'ai',
+                       'budget_range': 10000, 'duration_weeks': 10}
+            engine.record_project_created(history)
+            engine.record_project_finished(history, 'completed' if i < 5 else 'cancelled')
+
+        project = {'required_skills': ['nlp', 'python'], 'project_type': 'ai', 'budget_range': 5000,
+                   'duration_weeks': 5}
+        suggestions = engine.suggest_project_improvements(project)
+        self.assertEqual(len(suggestions['budget_optimization']), 1)
+        self.assertEqual(len(suggestions['timeline_optimization']), 1)
+        self.assertEqual(suggestions['skill_requirements'], [])
+        self.assertEqual(len(suggestions['market_positioning']), 1)
+
+    def test_caller_market_data_still_accepted(self):
+        engine = AIProjectRecommendationEngine(MarketDataService())
+        market_data = {'trending_skills': ['Docker'], 'similar_projects': [{'status': 'completed'}]}
+        suggestions = engine.suggest_project_improvements({'required_skills': ['python']}, market_data)
+        self.assertEqual(suggestions['skill_requirements'], ['Consider adding trending skills: Docker'])
+        self.assertEqual(suggestions['market_positioning'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import os
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.skill_registry import SkillRegistry
+from src.market_statistics import MarketStatistics, experience_bucket
+from src.project_matching import ProjectMatchingEngine
+
+class MarketStatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = SkillRegistry()
+        self.rng = np.random.default_rng(3)
+        self.skills = ['Python', 'sql', 'React', 'reactjs', 'Docker', 'k8s', 'Kubernetes', 'Go', 'NLP'] + \
+            [f'skill-{i}' for i in range(80)]
+
+    def random_user(self, user_id):
+        return {
+            'id': user_id,
+            'skills': list(self.rng.choice(self.skills, self.rng.integers(0, 6), replace=False)),
+            'experience_years': int(self.rng.integers(0, 12)),
+            'hourly_rate': int(self.rng.integers(0, 120))
+        }
+
+    def assert_matches_recount(self, stats, users):
+        fresh = MarketStatistics(self.registry)
+        fresh.refresh(users)
+        self.assertEqual(len(stats), len(users))
+        self.assertEqual(dict(stats.skill_counts), dict(fresh.skill_counts))
+        self.assertEqual(stats.experience_counts, fresh.experience_counts)
+        self.assertEqual(stats.rates, sorted(user['hourly_rate'] for user in users if user['hourly_rate'] > 0))
+
+        required = ['python', 'sql', 'k8s']
+        expected = sum(
+            ProjectMatchingEngine().calculate_skill_match_score(required, user['skills']) > 0.3 for user in users
+        )
+        self.assertEqual(stats.qualified_count(required), expected)
+
+    def test_incremental_updates_match_full_refresh(self):
+        users = {f'u{i}': self.random_user(f'u{i}') for i in range(60)}
+        stats = MarketStatistics(self.registry)
+        stats.refresh(users.values())
+
+        for step in range(200):
+            user_id = f'u{int(self.rng.integers(0, 80))}'
+            if step % 5 == 0 and user_id in users:
+                del users[user_id]
+                stats.remove(user_id)
+            else:
+                users[user_id] = self.random_user(user_id)
+                stats.upsert(users[user_id])
+            # New skills widen the bitsets mid-stream
+            if step == 100:
+                self.skills += [f'late-skill-{i}' for i in range(100)]
+
+        self.assert_matches_recount(stats, list(users.values()))
+
+    def test_rate_percentiles_match_numpy(self):
+        stats = MarketStatistics(self.registry)
+        users = [self.random_user(f'u{i}') for i in range(101)]
+        stats.refresh(users)
+        rates = [user['hourly_rate'] for user in users if user['hourly_rate'] > 0]
+        for name, value in stats.rate_percentiles().items():
+            self.assertAlmostEqual(value, np.percentile(rates, int(name[1:])))
+
+    def test_staleness(self):
+        stats = MarketStatistics(self.registry, refresh_interval=None)
+        self.assertTrue(stats.is_stale())
+        self.assertFalse(stats.is_built())
+        stats.refresh([])
+        self.assertFalse(stats.is_stale())
+        self.assertTrue(stats.is_built())
+        stats.refresh_interval = 0
+        stats.refreshed_at -= 1
+        self.assertTrue(stats.is_stale())
+
+    def test_experience_buckets(self):
+        self.assertEqual([experience_bucket(years) for years in (0, 1.9, 2, 4, 5, 7, 8, 30, None)],
+                         ['beginner', 'beginner', 'intermediate', 'intermediate', 'advanced',
+                          'advanced', 'expert', 'expert', 'beginner'])
+
+class MatchingInsightsTestCase(unittest.TestCase):
+    def test_unbuilt_view_is_not_reported_as_empty_pool(self):
+        engine = ProjectMatchingEngine()
+        with self.assertRaises(ValueError):
+            engine.get_matching_insights({'required_skills': ['python']})
+        engine.refresh_market_statistics([])
+        self.assertEqual(engine.get_matching_insights({'required_skills': ['python']})['total_users_in_pool'], 0)
+
+    def test_insights_follow_profile_updates(self):
+        engine = ProjectMatchingEngine()
+        users = [
+            {'id': 'u1', 'skills': ['Python', 'NLP'], 'experience_years': 9, 'hourly_rate': 60},
+            {'id': 'u2', 'skills': ['python'], 'experience_years': 1, 'hourly_rate': 20},
+            {'id': 'u3', 'skills': ['React'], 'experience_years': 3, 'hourly_rate': 40}
+        ]
+        project = {'title': 'Chatbot', 'required_skills': ['python', 'nlp'], 'complexity_level': 'expert'}
+
+        insights = engine.get_matching_insights(project, users)
+        self.assertEqual(insights['total_users_in_pool'], 3)
+        self.assertEqual(insights['qualified_users'], 2)
+        self.assertEqual(insights['rare_required_skills'], ['python', 'nlp'])
+        self.assertEqual(insights['experience_distribution'],
+                         {'beginner': 1, 'intermediate': 1, 'advanced': 0, 'expert': 1})
+        self.assertEqual(insights['hourly_rate_percentiles']['p50'], 40)
+
+        engine.refresh_market_statistics(users)
+        engine.update_user_index({'id': 'u3', 'skills': ['Python', 'nlp'], 'experience_years': 3})
+        insights = engine.get_matching_insights(project)
+        self.assertEqual(insights['qualified_users'], 3)
+        self.assertEqual(insights['rare_required_skills'], ['nlp'])
+        self.assertEqual(insights['top_skills_in_pool'], [('python', 3), ('nlp', 2)])
+
+    def test_given_pool_is_not_answered_from_the_view(self):
+        engine = ProjectMatchingEngine()
+        pool = [{'id': f'u{i}', 'skills': ['Python'], 'experience_years': 3, 'hourly_rate': 30} for i in range(300)]
+        engine.refresh_market_statistics(pool)
+
+        insights = engine.get_matching_insights({'required_skills': ['python']}, pool[:50])
+        self.assertEqual(insights['total_users_in_pool'], 50)
+
+        registry_size = len(engine.market_stats.registry)
+        insights = engine.get_matching_insights(
+            {'required_skills': ['python', 'k8s']},
+            [{'id': 'x', 'skills': ['Kubernetes', 'never-interned-skill'], 'experience_years': 1}]
+        )
+        self.assertEqual(len(engine.market_stats.registry), registry_size)
+        self.assertNotIn('never-interned-skill', engine.market_stats.registry)
+        self.assertEqual(insights['qualified_users'], 1)
+        self.assertEqual(engine.get_matching_insights({'required_skills': ['python']})['total_users_in_pool'], 300)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+from unittest import mock
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.match_cache import MatchResultCache
+
+class MatchResultCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = MatchResultCache(max_entries=2, ttl_seconds=60)
+
+    def test_hit_and_miss(self):
+        key = self.cache.key('p1', 300)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, [{'freelancer_id': 'f1', 'match_score': 0.9}])
+        self.assertEqual(self.cache.get(self.cache.key('p1', 300))[0]['freelancer_id'], 'f1')
+        self.assertIsNone(self.cache.get(self.cache.key('p1', 50)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        for project_id in ('p1', 'p2'):
+            self.cache.set(self.cache.key(project_id), [project_id])
+        self.cache.get(self.cache.key('p1'))
+        self.cache.set(self.cache.key('p3'), ['p3'])
+        self.assertIsNotNone(self.cache.get(self.cache.key('p1')))
+        self.assertIsNone(self.cache.get(self.cache.key('p2')))
+
+    def test_ttl_expiry(self):
+        key = self.cache.key('p1')
+        with mock.patch('src.match_cache.time.monotonic', return_value=100.0):
+            self.cache.set(key, ['p1'])
+        with mock.patch('src.match_cache.time.monotonic', return_value=161.0):
+            self.assertIsNone(self.cache.get(key))
+
+    def test_configure_keeps_settings_left_out(self):
+        self.cache.configure(max_entries=5)
+        self.assertEqual((self.cache.max_entries, self.cache.ttl_seconds), (5, 60))
+        self.cache.configure(ttl_seconds=None)
+        self.assertEqual((self.cache.max_entries, self.cache.ttl_seconds), (5, None))
+
+    def test_project_invalidation_is_targeted(self):
+        self.cache.set(self.cache.key('p1'), ['p1'])
+        self.cache.set(self.cache.key('p2'), ['p2'])
+        self.cache.invalidate_project('p1')
+        self.assertIsNone(self.cache.get(self.cache.key('p1')))
+        self.assertEqual(self.cache.get(self.cache.key('p2')), ['p2'])
+
+    def test_pool_invalidation_drops_everything(self):
+        self.cache.set(self.cache.key('p1'), ['p1'])
+        self.cache.invalidate_pool()
+        self.assertIsNone(self.cache.get(self.cache.key('p1')))
+
+    def test_stale_key_is_not_stored(self):
+        key = self.cache.key('p1')
+        self.cache.invalidate_pool()
+        self.cache.set(key, ['stale'])
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
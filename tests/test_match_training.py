@@ -0,0 +1,147 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.app import create_app
+from src.models import db, User, Project, Match
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.model_store import ModelArtifactStore
+from src.match_training import SuccessModelTrainer, outcome_labels, train_match_model_command
+
+class MatchTrainingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.root_dir = tempfile.mkdtemp()
+
+        rng = np.random.default_rng(0)
+        skills = ['python,sql', 'react,javascript', 'python,django', 'sql,tableau']
+        users = [
+            User(email=f'freelancer{i}@example.com', user_type='freelancer', skills=skills[i % 4],
+                 hourly_rate=20 + 5 * i, completion_rate=None if i == 0 else 0.6 + 0.04 * i)
+            for i in range(10)
+        ]
+        projects = [
+            Project(name=f'Project {i}', required_skills=skills[i % 4], budget_max=2000 + 500 * i,
+                    estimated_hours=40, urgency_level=1 + i % 3, total_budget=5000,
+                    budget_used=4000 + 300 * i, progress_percentage=None if i == 5 else 10 * i)
+            for i in range(6)
+        ]
+        db.session.add_all(users + projects)
+        db.session.commit()
+        for project in projects:
+            for user in users:
+                db.session.add(Match(project_id=project.id, user_id=user.id, score=float(rng.random())))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.root_dir)
+
+    def test_outcome_labels(self):
+        labels = outcome_labels([50, 100, 100], [100, 200, 0], [100, 100, 0])
+        np.testing.assert_allclose(labels, [0.5, 0.5, 1.0])
+
+    def test_train_streams_every_row_with_bounded_sample(self):
+        engine = AdvancedMatchingEngine()
+        trainer = SuccessModelTrainer(engine, chunk_size=7, max_train_rows=20, n_jobs=2)
+        report = trainer.train(publish=False)
+
+        # Project 5 has no outcome yet
+        self.assertEqual(report['rows_streamed'], 50)
+        self.assertEqual(report['training_rows'], 20)
+        self.assertEqual(engine.scaler.n_samples_seen_, 50)
+        self.assertIsNone(engine.success_model.n_jobs)
+        self.assertIsNone(report['version'])
+        self.assertGreater(report['single_row_latency_ms'], 0)
+
+        features = engine.extract_features(
+            {'skills': ['python'], 'hourly_rate': 30, 'completion_rate': 0.9},
+            {'required_skills': ['python'], 'budget_max': 3000}
+        )
+        self.assertNotEqual(features['success_prediction'], 0.7)
+
+    def test_train_features_match_request_path(self):
+        engine = AdvancedMatchingEngine()
+        trainer = SuccessModelTrainer(engine)
+        engine.build_skill_index()
+        rows = next(trainer.stream_rows())
+        features, _ = trainer.build_features(rows[:1])
+
+        required_skills, budget_max, estimated_hours, urgency_level = rows[0][:4]
+        skills, hourly_rate, completion_rate = rows[0][7:]
+        expected = engine.extract_features(
+            {'skills': skills.split(','), 'hourly_rate': hourly_rate, 'completion_rate': completion_rate,
+             'experience_years': 0, 'availability_hours_per_week': 40},
+            {'required_skills': required_skills.split(','), 'budget_max': budget_max,
+             'estimated_hours': estimated_hours, 'urgency_level': urgency_level}
+        )
+        self.assertAlmostEqual(features[0, 0], expected['budget_compatibility'])
+        self.assertAlmostEqual(features[0, 2], expected['skill_similarity'])
+
+    def test_missing_completion_rate_matches_between_training_and_serving(self):
+        engine = AdvancedMatchingEngine()
+        trainer = SuccessModelTrainer(engine, n_jobs=1)
+        trainer.train(publish=False)
+        row = next(row for rows in trainer.stream_rows() for row in rows if row[9] is None)
+        features, _ = trainer.build_features([row])
+        expected = np.clip(engine.success_model.predict(engine.scaler.transform(features)), 0, 1)[0]
+
+        required_skills, budget_max, estimated_hours, urgency_level = row[:4]
+        skills, hourly_rate, completion_rate = row[7:]
+        freelancer = {'skills': skills.split(','), 'hourly_rate': hourly_rate, 'completion_rate': completion_rate,
+                      'experience_years': 0, 'availability_hours_per_week': 40}
+        project = {'required_skills': required_skills.split(','), 'budget_max': budget_max,
+                   'estimated_hours': estimated_hours, 'urgency_level': urgency_level}
+        self.assertAlmostEqual(engine.extract_features(freelancer, project)['success_prediction'], expected)
+        self.assertAlmostEqual(
+            engine.extract_features_batch([freelancer], project)['success_prediction'][0], expected
+        )
+
+    def test_cli_publishes_artifact(self):
+        from src.utils import ai_matching_engine
+        store = ModelArtifactStore(self.root_dir)
+        previous_store = ai_matching_engine.model_store
+        ai_matching_engine.model_store = store
+        try:
+            result = self.app.test_cli_runner().invoke(
+                train_match_model_command, ['--chunk-size', '16', '--n-jobs', '1']
+            )
+        finally:
+            ai_matching_engine.model_store = previous_store
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('"fit_seconds"', result.output)
+        self.assertIsNotNone(store.current_version('advanced_matching'))
+
+    def test_cli_refuses_to_publish_without_a_store(self):
+        from src.utils import ai_matching_engine
+        previous_store = ai_matching_engine.model_store
+        ai_matching_engine.model_store = None
+        try:
+            runner = self.app.test_cli_runner()
+            refused = runner.invoke(train_match_model_command, ['--chunk-size', '16', '--n-jobs', '1'])
+            published = runner.invoke(
+                train_match_model_command, ['--chunk-size', '16', '--n-jobs', '1', '--artifact-dir', self.root_dir]
+            )
+        finally:
+            ai_matching_engine.model_store = previous_store
+
+        self.assertEqual(refused.exit_code, 2, refused.output)
+        self.assertIn('--artifact-dir', refused.output)
+        self.assertEqual(published.exit_code, 0, published.output)
+        self.assertIsNotNone(ModelArtifactStore(self.root_dir).current_version('advanced_matching'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,735 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from unittest import mock
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.app import create_app
+from src.models import db, User, Project, Match
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.ranking import top_k_indices
+from src.project_matching import ProjectMatchingEngine
+from src.project_index import ProjectFeatureIndex
+from src.ai_engine import AIMatchingEngine
+from src.skill_index import SkillVectorIndex
+from src.incremental_tfidf import IncrementalTfidfVectorizer
+from src.candidate_retrieval import CandidateSkillIndex, InvertedSkillIndex, shortlist_positions, recall_at_k
+from src.user import UserManager
+
+SKILLS = ['python', 'django', 'react', 'sql', 'machine learning', 'nlp', 'docker', 'aws']
+
+def make_freelancers(count, seed=0):
+    rng = np.random.default_rng(seed)
+    freelancers = []
+    for i in range(count):
+        skills = list(rng.choice(SKILLS, rng.integers(0, 4), replace=False)) or ['']
+        freelancers.append({
+            'skills': skills,
+            'experience_years': None if i % 17 == 0 else int(rng.integers(0, 12)),
+            'hourly_rate': None if i % 19 == 0 else int(rng.integers(0, 120)),
+            'availability_hours_per_week': int(rng.integers(0, 45)),
+            'location': str(rng.choice(['', 'cairo', 'dubai'])),
+            'completion_rate': None if i % 13 == 0 else float(rng.random()),
+            'average_rating': float(rng.random() * 5)
+        })
+    return freelancers
+
+class BatchScoringTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = AdvancedMatchingEngine()
+        self.freelancers = make_freelancers(300)
+        self.project = {
+            'required_skills': ['python', 'machine learning', 'sql'],
+            'budget_max': 5000,
+            'estimated_hours': 60,
+            'complexity_level': 3,
+            'urgency_level': 2,
+            'location': 'cairo'
+        }
+
+    def fit_engine(self):
+        rng = np.random.default_rng(1)
+        self.engine.skill_vectorizer.fit([' '.join(f['skills']) for f in self.freelancers])
+        X = rng.random((100, 5))
+        self.engine.scaler.fit(X)
+        self.engine.success_model.set_params(n_estimators=5)
+        self.engine.success_model.fit(self.engine.scaler.transform(X), rng.random(100))
+
+    def assert_batch_matches_scalar(self, project):
+        batch = self.engine.extract_features_batch(self.freelancers, project)
+        for i, freelancer in enumerate(self.freelancers):
+            scalar = self.engine.extract_features(freelancer, project)
+            for name, value in scalar.items():
+                self.assertAlmostEqual(batch[name][i], value, places=12)
+
+        scores = self.engine.calculate_match_scores(self.freelancers, project)
+        expected = [self.engine.calculate_match_score(f, project) for f in self.freelancers]
+        np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-12)
+
+    def test_batch_matches_scalar_unfitted(self):
+        self.assert_batch_matches_scalar(self.project)
+        self.assert_batch_matches_scalar(dict(self.project, budget_max=None))
+
+    def test_batch_matches_scalar_fitted(self):
+        self.fit_engine()
+        self.assert_batch_matches_scalar(self.project)
+        self.assert_batch_matches_scalar(dict(self.project, estimated_hours=None))
+        self.assert_batch_matches_scalar(dict(self.project, urgency_level=None))
+
+    def test_empty_pool(self):
+        self.assertEqual(len(self.engine.calculate_match_scores([], self.project)), 0)
+
+    def test_sharded_scoring_matches_single_process(self):
+        self.fit_engine()
+        scorer = self.engine.enable_sharding(workers=2, min_rows_per_shard=100)
+        try:
+            self.assertEqual(scorer.shard_bounds(300), [(0, 150), (150, 300)])
+            scores, best = scorer.score(self.freelancers, self.project, 10)
+        finally:
+            scorer.shutdown()
+
+        expected = self.engine.calculate_match_scores(self.freelancers, self.project)
+        np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-12)
+        self.assertEqual(list(best), list(top_k_indices(expected, 10)))
+
+class SkillVectorIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = SkillVectorIndex()
+        self.index.fit({'u1': 'python sql', 'u2': 'react docker', 'u3': 'python machine learning'})
+
+    def test_similarity_matches_direct_transform(self):
+        ids, scores = self.index.similarity('python sql')
+        self.assertEqual(ids, ['u1', 'u2', 'u3'])
+        self.assertAlmostEqual(scores[0], 1.0)
+        self.assertEqual(scores[1], 0.0)
+
+    def test_incremental_upsert_and_remove(self):
+        self.index.upsert('u2', 'python sql')
+        self.index.upsert('u4', 'docker')
+        self.index.remove('u3')
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn('u3', self.index)
+
+        scores = self.index.similarity('python sql', ['u2', 'u3', 'u4'])
+        self.assertAlmostEqual(scores[0], 1.0)
+        self.assertEqual(scores[1], 0.0)
+
+    def test_unseen_terms_trigger_refit(self):
+        self.index.upsert('u2', 'react sql')
+        self.assertFalse(self.index.needs_refit())
+
+        self.index.upsert('u4', 'kubernetes terraform')
+        self.assertTrue(self.index.needs_refit())
+        self.assertEqual(self.index.similarity('kubernetes', ['u4'])[0], 0.0)
+
+        self.index.fit(self.index.documents())
+        self.assertFalse(self.index.needs_refit())
+        self.assertGreater(self.index.similarity('kubernetes', ['u4'])[0], 0.0)
+
+    def test_vectors_for_refreshes_stale_text(self):
+        vectors = self.index.vectors_for(['u1'], ['react docker'])
+        expected = self.index.vectorizer.transform(['react docker'])
+        self.assertEqual((vectors != expected).nnz, 0)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'skills.pkl')
+            self.index.save(path)
+            loaded = SkillVectorIndex.load(path)
+        np.testing.assert_allclose(
+            loaded.similarity('python', ['u1', 'u3']),
+            self.index.similarity('python', ['u1', 'u3'])
+        )
+
+    def test_project_matching_uses_index(self):
+        engine = ProjectMatchingEngine()
+        users = [
+            {'id': 'u1', 'skills': ['Python', 'NLP'], 'rating': 4.5},
+            {'id': 'u2', 'skills': ['React'], 'rating': 4.0}
+        ]
+        project = {'title': 'Chatbot', 'required_skills': ['Python', 'NLP']}
+        engine.train_matching_model([project], users)
+        self.assertEqual(len(engine.user_index), 2)
+
+        before = engine.find_best_matches(project, users)
+        engine.user_index = SkillVectorIndex(engine.vectorizer)
+        after = engine.find_best_matches(project, users)
+        self.assertEqual(
+            [match['text_similarity'] for match in before],
+            [match['text_similarity'] for match in after]
+        )
+
+class CompactMatchesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = ProjectMatchingEngine()
+        self.users = [
+            {'id': f'u{i}', 'name': f'User {i}', 'skills': skills, 'rating': 3.5 + i * 0.3,
+             'hourly_rate': 20 + 15 * i, 'experience_years': i, 'availability_hours': 10 * i}
+            for i, skills in enumerate([['Python'], ['React'], ['Python', 'NLP'], [], ['nlp', 'go']])
+        ]
+        self.project = {'title': 'Chatbot', 'description': 'NLP assistant', 'required_skills': ['Python', 'NLP'],
+                        'budget_range': 4000, 'complexity_level': 'medium'}
+        self.engine.train_matching_model([self.project], self.users)
+
+    def test_compact_matches_carry_only_ids_and_scores(self):
+        full = self.engine.find_best_matches(self.project, self.users, top_k=3)
+        compact = self.engine.find_best_matches(self.project, self.users, top_k=3, compact=True)
+        self.assertEqual(
+            compact,
+            [{'user_id': match['user_id'], 'overall_score': match['overall_score']} for match in full]
+        )
+
+    def test_explain_reproduces_pooled_scores(self):
+        for match in self.engine.find_best_matches(self.project, self.users, top_k=5):
+            user = next(user for user in self.users if user['id'] == match['user_id'])
+            explanation = self.engine.explain_match(self.project, user)
+
+            self.assertEqual(explanation['overall_score'], match['overall_score'])
+            self.assertEqual(explanation['user_details']['combined_text'], match['user_details']['combined_text'])
+            for name, weight in self.engine.candidate_pipeline.weights.items():
+                self.assertEqual(explanation['scores'][name], match[name])
+                self.assertEqual(explanation['contributions'][name], match[name] * weight)
+            self.assertAlmostEqual(sum(explanation['contributions'].values()), match['overall_score'])
+
+class CandidateRetrievalTestCase(unittest.TestCase):
+    def test_shortlist_prefers_skill_overlap(self):
+        index = InvertedSkillIndex([['React'], ['python', 'sql'], ['docker'], ['Python']])
+        self.assertEqual(index.shortlist(['python', 'sql'], 2), [1, 3])
+
+    def test_shortlist_pads_with_remaining_candidates(self):
+        index = InvertedSkillIndex([['react'], ['go'], ['python'], ['docker']])
+        self.assertEqual(index.shortlist(['python'], 3), [0, 1, 2])
+
+    def test_persistent_index_ranks_like_one_off_index(self):
+        skills = [['React'], ['python', 'sql'], ['docker'], ['Python'], ['go', 'python']]
+        index = CandidateSkillIndex()
+        for i, candidate_skills in enumerate(skills):
+            index.upsert(f'u{i}', candidate_skills)
+        ids = [f'u{i}' for i in range(len(skills))]
+        for required, limit in ((['python', 'sql'], 2), (['python'], 3), (['rust'], 2)):
+            self.assertEqual(index.shortlist(ids, required, limit), InvertedSkillIndex(skills).shortlist(required, limit))
+
+        index.upsert('u2', ['SQL', 'python'])
+        index.remove('u1')
+        self.assertEqual(index.shortlist(ids, ['python', 'sql'], 1), [2])
+        self.assertNotIn('u1', index.postings['sql'])
+
+    def test_engine_shortlist_follows_profile_updates(self):
+        engine = ProjectMatchingEngine()
+        users = [{'id': f'u{i}', 'skills': ['React']} for i in range(5)]
+        project = {'title': 'API', 'required_skills': ['Go']}
+        for user in users:
+            engine.update_user_index(user)
+
+        users[3] = {'id': 'u3', 'skills': ['Go']}
+        engine.update_user_index(users[3])
+        with mock.patch('src.candidate_retrieval.InvertedSkillIndex') as one_off:
+            matches = engine.find_best_matches(project, users, top_k=1, candidate_limit=1)
+        one_off.assert_not_called()
+        self.assertEqual(matches[0]['user_id'], 'u3')
+
+    def test_no_limit_keeps_every_candidate(self):
+        self.assertEqual(shortlist_positions([['a'], ['b']], ['a'], None), [0, 1])
+
+    def test_two_stage_matches_exhaustive_when_pool_fits(self):
+        engine = ProjectMatchingEngine()
+        users = [
+            {'id': f'u{i}', 'skills': skills, 'rating': 4.0, 'hourly_rate': 20 + i}
+            for i, skills in enumerate([['Python'], ['React'], ['Python', 'NLP'], []])
+        ]
+        project = {'title': 'Chatbot', 'required_skills': ['Python', 'NLP']}
+        exact = engine.find_best_matches(project, users, top_k=2)
+        staged = engine.find_best_matches(project, users, top_k=2, candidate_limit=10)
+        self.assertEqual([m['user_id'] for m in exact], [m['user_id'] for m in staged])
+
+    def test_recall_at_k(self):
+        self.assertEqual(recall_at_k(['a', 'b', 'c'], ['a', 'c', 'd'], 2), 0.5)
+        self.assertEqual(recall_at_k([], ['a'], 3), 1.0)
+
+def reference_recommendations(engine, user, projects, top_k):
+    user_features = engine.extract_user_features(user)
+    scored = []
+    for project in projects:
+        features = engine.extract_project_features(project)
+        score = (
+            0.30 * engine.calculate_skill_match_score(features['required_skills'], user_features['skills']) +
+            0.25 * engine.calculate_budget_compatibility(features['budget_range'], user_features['hourly_rate'], features['duration_weeks']) +
+            0.20 * engine.calculate_experience_match(features['complexity_level'], user_features['experience_years']) +
+            0.15 * (1.0 if features['project_type'] in user_features['preferred_project_types'] else 0.5) +
+            0.10 * (1.0 if features['industry'] in user_features['preferred_industries'] else 0.5)
+        )
+        scored.append((project['id'], score))
+    return sorted(scored, key=lambda item: item[1], reverse=True)[:top_k]
+
+class ProjectRecommendationTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        skills = ['Python', 'SQL', 'React', 'Docker', 'NLP', 'Go']
+        self.projects = [
+            {
+                'id': f'p{i}',
+                'title': f'Project {i}',
+                'required_skills': list(rng.choice(skills, rng.integers(0, 4), replace=False)),
+                'budget_range': int(rng.choice([0, 5000, 20000, 60000])),
+                'duration_weeks': int(rng.integers(1, 20)),
+                'complexity_level': str(rng.choice(['beginner', 'Intermediate', 'advanced', 'expert', 'unknown'])),
+                'project_type': str(rng.choice(['ai_development', 'web', 'data'])),
+                'industry': str(rng.choice(['technology', 'finance']))
+            }
+            for i in range(200)
+        ]
+        self.user = {
+            'id': 'u1',
+            'skills': ['python', 'SQL', 'Kotlin'],
+            'experience_years': 4,
+            'hourly_rate': 50,
+            'preferred_project_types': ['web'],
+            'preferred_industries': ['finance']
+        }
+
+    def assert_same_ranking(self, recommendations, expected):
+        self.assertEqual([r['project_id'] for r in recommendations], [project_id for project_id, _ in expected])
+        for recommendation, (_, score) in zip(recommendations, expected):
+            self.assertAlmostEqual(recommendation['overall_score'], score, places=12)
+
+    def test_vectorized_scores_match_reference(self):
+        engine = ProjectMatchingEngine()
+        expected = reference_recommendations(engine, self.user, self.projects, 15)
+        self.assert_same_ranking(engine.recommend_projects_for_user(self.user, self.projects, 15), expected)
+        self.assert_same_ranking(
+            engine.recommend_projects_for_user(dict(self.user, hourly_rate=0, skills=[]), self.projects, 15),
+            reference_recommendations(engine, dict(self.user, hourly_rate=0, skills=[]), self.projects, 15)
+        )
+
+    def test_project_index_tracks_created_and_edited_projects(self):
+        engine = ProjectMatchingEngine()
+        for project in self.projects:
+            engine.update_project_index(project)
+        engine.remove_project_from_index('p0')
+        edited = dict(self.projects[1], required_skills=['Python', 'SQL'], project_type='web', industry='finance')
+        engine.update_project_index(edited)
+
+        projects = [edited] + self.projects[2:]
+        self.assert_same_ranking(
+            engine.recommend_projects_for_user(self.user, top_k=10),
+            reference_recommendations(engine, self.user, projects, 10)
+        )
+
+    def test_snapshot_updates_only_changed_rows(self):
+        engine = ProjectMatchingEngine()
+        engine.train_matching_model(self.projects, [self.user])
+        engine.project_index.fit(self.projects[:150])
+        first = engine.project_index.snapshot()
+
+        for project in self.projects[150:160]:
+            engine.update_project_index(project)
+        engine.remove_project_from_index('p3')
+        engine.update_project_index(dict(self.projects[7], required_skills=['Kotlin'], industry='finance'))
+        with mock.patch('src.project_index.ProjectIndexSnapshot.__init__') as rebuild:
+            updated = engine.project_index.snapshot()
+        rebuild.assert_not_called()
+        self.assertEqual(len(first), 150)
+        self.assertIn('p3', first.rows)
+
+        reference = ProjectMatchingEngine()
+        reference.vectorizer = engine.vectorizer
+        reference.project_index = ProjectFeatureIndex(reference)
+        reference.project_index.fit([engine.project_index._projects[project_id] for project_id in updated.project_ids])
+        rebuilt = reference.project_index.snapshot()
+
+        def by_id(recommendations):
+            return {r['project_id']: (r['overall_score'], r['text_similarity']) for r in recommendations}
+
+        scores = by_id(engine.recommend_projects_for_user(self.user, top_k=len(updated)))
+        expected = by_id(reference.recommend_projects_for_user(self.user, top_k=len(rebuilt)))
+        self.assertEqual(set(scores), set(expected))
+        self.assertNotIn('p3', scores)
+        for project_id, (score, text_similarity) in expected.items():
+            self.assertAlmostEqual(scores[project_id][0], score, places=12)
+            self.assertAlmostEqual(scores[project_id][1], text_similarity, places=12)
+
+    def test_text_similarity_after_training(self):
+        engine = ProjectMatchingEngine()
+        engine.project_index.fit(self.projects)
+        self.assertIsNone(engine.recommend_projects_for_user(self.user, top_k=1)[0]['text_similarity'])
+
+        engine.train_matching_model(self.projects, [self.user])
+        recommendation = engine.recommend_projects_for_user(self.user, top_k=1)[0]
+        self.assertGreaterEqual(recommendation['text_similarity'], 0.0)
+
+        # A caller's list is not vectorized while text similarity has no weight
+        with mock.patch.object(engine.vectorizer, 'transform') as transform:
+            recommendation = engine.recommend_projects_for_user(self.user, self.projects, top_k=1)[0]
+        transform.assert_not_called()
+        self.assertIsNone(recommendation['text_similarity'])
+
+        engine.recommendation_pipeline.set_weights(dict(engine.recommendation_pipeline.weights, text_similarity=0.1))
+        recommendation = engine.recommend_projects_for_user(self.user, self.projects, top_k=1)[0]
+        self.assertGreaterEqual(recommendation['text_similarity'], 0.0)
+
+class StreamingTrainingTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        skills = ['Python', 'SQL', 'React', 'Docker', 'NLP', 'Go', 'Rust', 'Figma']
+        self.projects = [
+            {'id': f'p{i}', 'title': f'Project {i}', 'description': 'build a data platform',
+             'required_skills': list(rng.choice(skills, 3, replace=False))}
+            for i in range(40)
+        ]
+        self.users = [
+            {'id': f'u{i}', 'bio': 'freelance engineer', 'skills': list(rng.choice(skills, 4, replace=False))}
+            for i in range(60)
+        ]
+
+    def test_batched_fit_matches_tfidf_vectorizer(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        texts = [' '.join(user['skills']) + ' ' + user['bio'] for user in self.users]
+
+        incremental = IncrementalTfidfVectorizer()
+        for start in range(0, len(texts), 7):
+            incremental.partial_fit(texts[start:start + 7])
+        reference = TfidfVectorizer(stop_words='english', ngram_range=(1, 2)).fit(texts)
+
+        np.testing.assert_allclose(
+            (incremental.transform(texts) @ incremental.transform(texts).T).toarray(),
+            (reference.transform(texts) @ reference.transform(texts).T).toarray(),
+            atol=1e-12
+        )
+
+    def test_streaming_training_from_generators(self):
+        engine = ProjectMatchingEngine()
+        stats = engine.train_matching_model(
+            (project for project in self.projects), (user for user in self.users),
+            streaming=True, batch_size=16
+        )
+        self.assertEqual(stats['projects'], 40)
+        self.assertEqual(stats['users'], 60)
+        self.assertEqual(stats['documents_seen'], 100)
+        self.assertGreater(stats['skill_chunks'], 0)
+        self.assertEqual(len(engine.user_index), 60)
+
+        labels = engine.skill_clusters.predict(engine.vectorizer.transform(['python sql']))
+        self.assertEqual(len(labels), 1)
+
+        engine.project_index.fit(self.projects)
+        recommendation = engine.recommend_projects_for_user(self.users[0], top_k=1)[0]
+        self.assertGreater(recommendation['text_similarity'], 0.0)
+
+    def test_full_fit_accepts_generators(self):
+        engine = ProjectMatchingEngine()
+        engine.train_matching_model((project for project in self.projects), (user for user in self.users))
+        self.assertEqual(len(engine.user_index), 60)
+
+    def test_second_call_is_a_delta_update(self):
+        engine = ProjectMatchingEngine()
+        engine.train_matching_model(self.projects[:20], self.users[:30], streaming=True, batch_size=16)
+        engine.train_matching_model(self.projects[20:], self.users[30:], streaming=True, batch_size=16)
+
+        combined = ProjectMatchingEngine()
+        combined.train_matching_model(self.projects, self.users, streaming=True)
+
+        np.testing.assert_array_equal(engine.vectorizer.document_frequency, combined.vectorizer.document_frequency)
+        self.assertEqual(len(engine.user_index), 60)
+        user_ids = [user['id'] for user in self.users]
+        np.testing.assert_allclose(
+            engine.user_index.vectors_for(user_ids).toarray(),
+            combined.user_index.vectors_for(user_ids).toarray()
+        )
+
+class SparseTextFeaturesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.texts = ['python django postgresql', 'react typescript design', '', 'python machine learning']
+        self.engine = AIMatchingEngine()
+
+    def test_unfitted_vectorizer_gives_empty_rows(self):
+        features = self.engine.extract_text_features_sparse('python')
+        self.assertEqual(features.shape, (1, 1000))
+        self.assertEqual(features.nnz, 0)
+        np.testing.assert_array_equal(self.engine.extract_text_features('python'), np.zeros(1000))
+
+    def test_dense_features_match_sparse_row(self):
+        self.engine.tfidf_vectorizer.fit(self.texts)
+        dense = self.engine.extract_text_features('python django')
+        self.assertIsInstance(dense, np.ndarray)
+        np.testing.assert_array_equal(dense, self.engine.extract_text_features_sparse('python django').toarray()[0])
+
+    def test_sparse_similarity_matches_dense(self):
+        self.engine.tfidf_vectorizer.fit(self.texts)
+        features = self.engine.extract_text_features_batch(self.texts)
+        self.assertEqual(features.format, 'csr')
+
+        dense = self.engine.tfidf_vectorizer.transform(self.texts).toarray()
+        query = self.engine.tfidf_vectorizer.transform(['python api']).toarray()[0]
+        norms = np.linalg.norm(dense, axis=1) * np.linalg.norm(query)
+        expected = np.divide(dense @ query, norms, out=np.zeros(len(self.texts)), where=norms > 0)
+        np.testing.assert_allclose(self.engine.text_similarity(self.texts, 'python api'), expected)
+
+    def test_combine_features_stays_sparse(self):
+        self.engine.tfidf_vectorizer.fit(self.texts)
+        features = self.engine.extract_text_features_batch(self.texts)
+        combined = self.engine.combine_features(features, np.arange(8).reshape(4, 2))
+        self.assertEqual(combined.format, 'csr')
+        self.assertEqual(combined.shape, (4, features.shape[1] + 2))
+        np.testing.assert_array_equal(combined[:, -2:].toarray(), np.arange(8).reshape(4, 2))
+
+class PiecewiseScorersTestCase(unittest.TestCase):
+    """
+    Property checks: on random inputs, with values placed on and around every
+    threshold, the array scorers equal the scalar ones element for element
+    """
+
+    def setUp(self):
+        self.rng = np.random.default_rng(23)
+        self.project_engine = ProjectMatchingEngine()
+        self.ai_engine = AIMatchingEngine()
+
+    def around(self, thresholds, size):
+        """
+        Random draws mixed with each threshold and its nearest neighbours
+        """
+        edges = np.concatenate([[t, np.nextafter(t, -np.inf), np.nextafter(t, np.inf)] for t in thresholds])
+        values = np.concatenate([edges, self.rng.uniform(min(thresholds) - 5, max(thresholds) * 2 + 5, size)])
+        return self.rng.permutation(values)
+
+    def test_budget_compatibility(self):
+        for _ in range(50):
+            budget = float(self.rng.choice([0, -10, self.rng.uniform(1, 50000)]))
+            weeks = int(self.rng.integers(0, 30))
+            cost_points = [budget, budget * 1.2, budget * 1.5] if budget > 0 else [1.0]
+            rates = np.concatenate([
+                self.around([point / (40 * weeks) for point in cost_points] if weeks else [10.0], 40),
+                [0.0, -5.0]
+            ])
+            expected = [self.project_engine.calculate_budget_compatibility(budget, rate, weeks) for rate in rates]
+            np.testing.assert_array_equal(self.project_engine.budget_compatibility_scores(budget, rates, weeks), expected)
+
+    def test_project_experience_match(self):
+        for complexity in ['beginner', 'Intermediate', 'advanced', 'EXPERT', 'other']:
+            required = {'beginner': 0, 'intermediate': 2, 'advanced': 5, 'expert': 8}.get(complexity.lower(), 2)
+            years = self.around([required, required * 0.7, required * 0.5], 60)
+            expected = [self.project_engine.calculate_experience_match(complexity, value) for value in years]
+            np.testing.assert_array_equal(self.project_engine.experience_match_scores(required, years), expected)
+
+    def test_budget_match(self):
+        for _ in range(50):
+            budget_min = float(self.rng.choice([0, self.rng.uniform(100, 5000)]))
+            budget_max = float(self.rng.choice([0, budget_min + self.rng.uniform(0, 5000)]))
+            hours = int(self.rng.choice([40, 25]))
+            points = [value / hours for value in [budget_min, budget_max, budget_max * 1.2, budget_max * 1.5] if value]
+            rates = np.concatenate([self.around(points or [20.0], 40), [0.0]])
+
+            expected = [self.ai_engine.calculate_budget_match(budget_min, budget_max, rate, hours) for rate in rates]
+            actual = self.ai_engine.budget_match_scores(budget_min, budget_max, rates, hours)
+            np.testing.assert_array_equal(actual, expected)
+        self.assertEqual(self.ai_engine.budget_match_scores(None, 500, [10.0]).tolist(), [0.5])
+
+    def test_ai_engine_experience_match(self):
+        completed = np.concatenate([self.around([5, 10, 20, 30, 50], 100), [0]]).round()
+        ratings = self.rng.choice([0.0, 3.2, 4.5, np.nextafter(4.5, 0), 5.0], len(completed))
+        for level in ['expert', 'intermediate', 'beginner', '', None]:
+            expected = [
+                self.ai_engine.calculate_experience_match(level, count, rating)
+                for count, rating in zip(completed, ratings)
+            ]
+            np.testing.assert_array_equal(self.ai_engine.experience_match_scores(level, completed, ratings), expected)
+
+    def test_ai_engine_find_best_matches_matches_scalar(self):
+        from types import SimpleNamespace
+        project = SimpleNamespace(
+            budget_min=1000, budget_max=3000, experience_level='expert',
+            get_required_skills=lambda: ['python', 'SQL', 'docker']
+        )
+        freelancers = [
+            SimpleNamespace(
+                id=i, hourly_rate=float(self.rng.choice([0, self.rng.uniform(10, 120)])),
+                projects_completed=int(self.rng.integers(0, 80)), average_rating=float(self.rng.uniform(0, 5)),
+                get_skills=lambda skills=dict(zip(self.rng.choice(['python', 'sql', 'go', 'Docker'], 2, replace=False),
+                                                  self.rng.choice(['beginner', 'expert'], 2))): skills
+            )
+            for i in range(100)
+        ]
+        expected = sorted(
+            (dict(self.ai_engine.calculate_overall_match(project, freelancer), freelancer_id=freelancer.id)
+             for freelancer in freelancers),
+            key=lambda result: -result['overall_score']
+        )[:10]
+        results = self.ai_engine.find_best_matches(project, freelancers, limit=10)
+        self.assertEqual([r['freelancer_id'] for r in results], [r['freelancer_id'] for r in expected])
+        for result, reference in zip(results, expected):
+            for key in ('overall_score', 'skill_match_score', 'budget_match_score',
+                        'experience_match_score', 'confidence_score'):
+                self.assertEqual(result[key], reference[key])
+
+class BatchSuccessPredictionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(29)
+
+    def test_ai_engine_batch_matches_per_pair_formula(self):
+        from types import SimpleNamespace
+        engine = AIMatchingEngine()
+        projects = [
+            SimpleNamespace(budget_min=1000, budget_max=budget_max, experience_level=level,
+                            get_required_skills=lambda: ['python', 'sql'])
+            for budget_max, level in ((3000, 'expert'), (800, 'beginner'))
+        ]
+        freelancers = [
+            SimpleNamespace(
+                id=i, hourly_rate=float(self.rng.uniform(0, 120)), projects_completed=int(self.rng.integers(0, 40)),
+                average_rating=float(self.rng.uniform(0, 5)),
+                get_skills=lambda skills={str(self.rng.choice(['python', 'sql', 'go'])): 'expert'}: skills
+            )
+            for i in range(50)
+        ]
+
+        for project in projects:
+            expected = []
+            for freelancer in freelancers:
+                match = engine.calculate_overall_match(project, freelancer)
+                expected.append(min(1.0, sum((
+                    match['skill_match_score'] * 0.3, match['experience_match_score'] * 0.25,
+                    match['budget_match_score'] * 0.2, (freelancer.average_rating / 5.0) * 0.15,
+                    min(1.0, freelancer.projects_completed / 10) * 0.1
+                ))))
+            np.testing.assert_array_equal(engine.predict_project_success_batch(project, freelancers), expected)
+            self.assertEqual(engine.predict_project_success(project, freelancers[3]), expected[3])
+
+            matches = engine.find_best_matches(project, freelancers, limit=5)
+            with mock.patch.object(engine.scoring_pipeline, 'features', side_effect=AssertionError):
+                reused = engine.predict_project_success_batch(
+                    project, [match['freelancer'] for match in matches], match_scores=matches
+                )
+            np.testing.assert_array_equal(reused, [expected[match['freelancer_id']] for match in matches])
+
+        pairings = [(projects[i % 2], freelancers[i]) for i in range(10)]
+        np.testing.assert_array_equal(
+            engine.predict_pairings_success(pairings),
+            [engine.predict_project_success(project, freelancer) for project, freelancer in pairings]
+        )
+
+    def test_team_batch_matches_single_team_prediction(self):
+        from src.project_matching import AIProjectRecommendationEngine
+        engine = AIProjectRecommendationEngine()
+        users = [
+            {'id': f'u{i}', 'skills': list(self.rng.choice(['Python', 'nlp', 'React', 'sql', 'k8s'], 2, replace=False)),
+             'hourly_rate': int(self.rng.integers(0, 90)), 'experience_years': int(self.rng.integers(0, 10))}
+            for i in range(12)
+        ]
+        teams = [list(self.rng.choice(users, self.rng.integers(1, 5), replace=False)) for _ in range(30)] + [[]]
+        for project in (
+            {'required_skills': ['python', 'NLP', 'kubernetes'], 'budget_range': 20000, 'duration_weeks': 6,
+             'team_size': 3, 'complexity_level': 'advanced'},
+            {'required_skills': [], 'budget_range': 0, 'duration_weeks': 0}
+        ):
+            expected = [engine.predict_project_success(project, team)['success_probability'] for team in teams]
+            np.testing.assert_allclose(engine.predict_project_success_batch(project, teams), expected, rtol=0, atol=1e-12)
+
+class FindMatchesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_find_matches_for_project(self):
+        for i in range(5):
+            db.session.add(User(
+                email=f'freelancer{i}@example.com', user_type='freelancer',
+                skills='python,sql', experience_years=i, hourly_rate=20 + 10 * i,
+                availability_hours_per_week=40, location='cairo',
+                completion_rate=0.9, average_rating=4.5
+            ))
+        project = Project(
+            name='Data pipeline', required_skills='python,sql', budget_max=4000,
+            estimated_hours=40, complexity_level=2, urgency_level=1
+        )
+        db.session.add(project)
+        db.session.commit()
+
+        matches = AdvancedMatchingEngine().find_matches_for_project(project.id, max_matches=3)
+        self.assertEqual(len(matches), 3)
+        scores = [match['match_score'] for match in matches]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(Match.query.filter_by(project_id=project.id).count(), 5)
+
+    def test_batch_matches_equal_single_project_matches(self):
+        for i in range(6):
+            db.session.add(User(
+                email=f'freelancer{i}@example.com', user_type='freelancer',
+                skills=['python,sql', 'react', 'python,django'][i % 3], experience_years=i,
+                hourly_rate=20 + 10 * i, availability_hours_per_week=40, location='cairo',
+                completion_rate=None if i == 2 else 0.9
+            ))
+        projects = [
+            Project(name='Data pipeline', required_skills='python,sql', budget_max=4000,
+                    estimated_hours=40, complexity_level=2, urgency_level=1),
+            Project(name='Frontend', required_skills='react', budget_max=None,
+                    estimated_hours=80, complexity_level=3, urgency_level=2),
+            Project(name='Unscoped', required_skills='django', budget_max=1000,
+                    estimated_hours=10, complexity_level=1, urgency_level=None)
+        ]
+        db.session.add_all(projects)
+        db.session.commit()
+
+        engine = AdvancedMatchingEngine()
+        engine.build_skill_index()
+        rng = np.random.default_rng(0)
+        X = rng.random((50, 5))
+        engine.scaler.fit(X)
+        engine.success_model.set_params(n_estimators=5)
+        engine.success_model.fit(engine.scaler.transform(X), rng.random(50))
+
+        project_ids = [project.id for project in projects] + ['missing']
+        batch = engine.find_matches_for_projects(project_ids, max_matches=4, chunk_size=4)
+        self.assertEqual(batch['missing'], [])
+        for project in projects:
+            single = engine.find_matches_for_project(project.id, max_matches=4)
+            self.assertEqual(
+                [m['freelancer_id'] for m in batch[project.id]],
+                [m['freelancer_id'] for m in single]
+            )
+            for expected, actual in zip(single, batch[project.id]):
+                self.assertAlmostEqual(expected['match_score'], actual['match_score'], places=12)
+            self.assertEqual(Match.query.filter_by(project_id=project.id).count(), 6)
+
+        # A failed write surfaces instead of returning a partial batch
+        with mock.patch.object(db.session, 'commit', side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                engine.find_matches_for_projects(project_ids, persist_top_k=2)
+        for project in projects:
+            self.assertEqual(Match.query.filter_by(project_id=project.id).count(), 6)
+
+    def test_rerun_replaces_stored_matches(self):
+        self.test_find_matches_for_project()
+        project = Project.query.first()
+        engine = AdvancedMatchingEngine()
+        engine.find_matches_for_project(project.id)
+        self.assertEqual(Match.query.filter_by(project_id=project.id).count(), 5)
+
+        matches = engine.find_matches_for_project(project.id, max_matches=3, persist_top_k=2)
+        stored = Match.query.filter_by(project_id=project.id).order_by(Match.score.desc()).all()
+        self.assertEqual(len(stored), 2)
+        self.assertEqual([m.user_id for m in stored], [m['freelancer_id'] for m in matches[:2]])
+
+    def test_profile_update_refreshes_skill_index(self):
+        user = User(email='freelancer@example.com', user_type='freelancer', skills='python')
+        db.session.add(user)
+        db.session.commit()
+
+        index = SkillVectorIndex()
+        index.fit({user.id: 'python', 'other': 'react sql'})
+        with mock.patch('src.user.freelancer_skill_index', index):
+            UserManager().update_user_profile(user.id, {'skills': 'react,sql'})
+        self.assertAlmostEqual(index.similarity('react sql', [user.id])[0], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
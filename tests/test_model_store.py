@@ -0,0 +1,110 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.app import create_app
+from src.models import db, AIModel
+from src.model_store import ModelArtifactStore
+from src.advanced_ai_systems import AdvancedMatchingEngine
+
+def fitted_engine(seed):
+    engine = AdvancedMatchingEngine()
+    rng = np.random.default_rng(seed)
+    X = rng.random((200, 5))
+    y = X[:, 2] * 0.6 + X[:, 3] * 0.4
+    engine.skill_vectorizer.fit(['python sql', 'react javascript', 'python django', 'sql tableau'])
+    engine.scaler.fit(X)
+    engine.success_model.set_params(n_estimators=10)
+    engine.success_model.fit(engine.scaler.transform(X), y)
+    return engine
+
+FREELANCER = {
+    'skills': ['python', 'sql'], 'experience_years': 4, 'hourly_rate': 40,
+    'availability_hours_per_week': 30, 'completion_rate': 0.9
+}
+PROJECT = {'required_skills': ['python', 'django'], 'budget_max': 3000, 'estimated_hours': 60}
+
+class ModelArtifactStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.store = ModelArtifactStore(self.root_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def test_save_and_load_current_version(self):
+        self.assertIsNone(self.store.current_version('advanced_matching'))
+        self.assertEqual(self.store.load('advanced_matching'), {})
+
+        engine = fitted_engine(0)
+        engine.model_store = self.store
+        first = engine.save_models(version='v1')
+        second = engine.save_models(version='v2', metadata={'rows': 200})
+
+        self.assertEqual((first, second), ('v1', 'v2'))
+        self.assertEqual(self.store.list_versions('advanced_matching'), ['v1', 'v2'])
+        self.assertEqual(self.store.current_version('advanced_matching'), 'v2')
+        self.assertEqual(self.store.metadata('advanced_matching')['rows'], 200)
+
+        components = self.store.load('advanced_matching')
+        self.assertEqual(set(components), {'skill_vectorizer', 'success_model', 'scaler'})
+        self.assertIsInstance(components['scaler'].mean_, np.memmap)
+
+    def test_engine_hot_swaps_to_new_version(self):
+        worker = AdvancedMatchingEngine()
+        self.assertFalse(worker.attach_model_store(self.store))
+        unfitted_score = worker.calculate_match_score(FREELANCER, PROJECT)
+
+        trainer = fitted_engine(1)
+        trainer.model_store = self.store
+        trainer.save_models(version='v1')
+
+        self.assertTrue(worker.reload_models(force=True))
+        self.assertEqual(worker.model_version, 'v1')
+        self.assertFalse(worker.reload_models(force=True))
+        self.assertAlmostEqual(
+            worker.calculate_match_score(FREELANCER, PROJECT),
+            trainer.calculate_match_score(FREELANCER, PROJECT)
+        )
+        self.assertNotAlmostEqual(worker.calculate_match_score(FREELANCER, PROJECT), unfitted_score)
+
+    def test_corrupt_artifact_is_logged_and_skipped(self):
+        trainer = fitted_engine(3)
+        trainer.model_store = self.store
+        trainer.save_models(version='v1')
+        worker = AdvancedMatchingEngine()
+        self.assertTrue(worker.attach_model_store(self.store))
+
+        trainer.save_models(version='v2')
+        with open(os.path.join(self.root_dir, 'advanced_matching', 'v2', 'scaler.joblib'), 'wb') as f:
+            f.write(b'not a pickle')
+
+        with self.assertLogs('src.advanced_ai_systems', level='ERROR') as logs:
+            self.assertFalse(worker.reload_models(force=True))
+        self.assertIn('v2', logs.output[0])
+        self.assertEqual(worker.model_version, 'v1')
+
+    def test_activation_is_recorded_in_registry(self):
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            engine = fitted_engine(2)
+            engine.model_store = self.store
+            engine.save_models(version='v1')
+            engine.save_models(version='v2')
+            self.store.activate('advanced_matching', 'v1')
+
+            statuses = {model.version: model.status for model in AIModel.query.filter_by(name='advanced_matching')}
+            self.assertEqual(statuses, {'v1': 'production', 'v2': 'archived'})
+            db.session.remove()
+            db.drop_all()
+
+if __name__ == '__main__':
+    unittest.main()
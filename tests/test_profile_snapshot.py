@@ -0,0 +1,109 @@
+import unittest
+import os
+import json
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.ai_engine import AIMatchingEngine
+from src.profile_snapshot import FreelancerSnapshot, ProfileSnapshotCache
+
+class Row:
+    """
+    Stand-in for an ORM row that counts how often its JSON column is decoded
+    """
+    decodes = 0
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+    def get_skills(self):
+        Row.decodes += 1
+        return json.loads(self.skills)
+
+    def get_required_skills(self):
+        Row.decodes += 1
+        return json.loads(self.required_skills)
+
+class ProfileSnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        Row.decodes = 0
+        self.rng = np.random.default_rng(31)
+        self.engine = AIMatchingEngine()
+        self.freelancers = [
+            Row(id=i, skills=json.dumps({
+                str(skill): str(self.rng.choice(['beginner', 'intermediate', 'advanced', 'expert']))
+                for skill in self.rng.choice(['Python', 'sql', 'k8s', 'Kubernetes', 'React', 'go'],
+                                             self.rng.integers(0, 4), replace=False)
+            }), hourly_rate=float(self.rng.uniform(10, 120)), projects_completed=int(self.rng.integers(0, 60)),
+                average_rating=float(self.rng.uniform(0, 5)), updated_at=None)
+            for i in range(40)
+        ]
+        self.project = Row(id='p1', required_skills=json.dumps(['python', 'kubernetes', 'SQL']), budget_min=1000,
+                           budget_max=4000, experience_level='intermediate', updated_at=None)
+
+    def test_scores_match_decoding_every_pair(self):
+        for freelancer in self.freelancers:
+            expected = self.engine.calculate_skill_match(
+                json.loads(self.project.required_skills), json.loads(freelancer.skills)
+            )
+            self.assertEqual(self.engine.calculate_overall_match(self.project, freelancer)['skill_match_score'], expected)
+
+    def test_json_decoded_once_per_profile_version(self):
+        for _ in range(3):
+            self.engine.find_best_matches(self.project, self.freelancers, limit=5)
+            self.engine.predict_project_success_batch(self.project, self.freelancers)
+        self.assertEqual(Row.decodes, len(self.freelancers) + 1)
+
+        self.freelancers[0].skills = json.dumps({'python': 'expert'})
+        self.engine.find_best_matches(self.project, self.freelancers, limit=5)
+        self.assertEqual(Row.decodes, len(self.freelancers) + 2)
+        self.assertEqual(self.engine.snapshots.freelancer(self.freelancers[0]).skill_levels, {'python': 'expert'})
+
+    def test_only_the_shortlist_is_snapshotted(self):
+        for freelancer in self.freelancers:
+            self.engine.update_freelancer_index(freelancer)
+        self.engine.snapshots.clear()
+        self.engine.snapshots.hits = self.engine.snapshots.misses = 0
+
+        results = self.engine.find_best_matches(self.project, self.freelancers, limit=3, candidate_limit=5)
+        self.assertEqual(len(results), 3)
+        # The project once, then the five shortlisted freelancers
+        self.assertEqual(len(self.engine.snapshots), 6)
+
+    def test_missing_rating_counts_as_zero(self):
+        unrated = Row(**dict(vars(self.freelancers[2]), id='unrated', average_rating=None))
+        zero_rated = Row(**dict(vars(self.freelancers[2]), id='zero', average_rating=0.0))
+
+        probability = self.engine.predict_project_success(self.project, unrated)
+        self.assertTrue(np.isfinite(probability))
+        self.assertAlmostEqual(probability, self.engine.predict_project_success(self.project, zero_rated))
+        batch = self.engine.predict_project_success_batch(self.project, [unrated, self.freelancers[3]])
+        self.assertTrue(np.isfinite(batch).all())
+
+    def test_changed_columns_are_not_served_stale(self):
+        before = self.engine.predict_project_success(self.project, self.freelancers[1])
+        self.freelancers[1].average_rating = 0.0
+        self.freelancers[1].projects_completed = 0
+        self.assertLess(self.engine.predict_project_success(self.project, self.freelancers[1]), before)
+
+    def test_profiles_without_id_are_decoded_each_time(self):
+        cache = ProfileSnapshotCache()
+        profile = Row(skills='{"go": "expert"}', hourly_rate=10, projects_completed=0, average_rating=0)
+        self.assertIsNot(cache.freelancer(profile), cache.freelancer(profile))
+        self.assertEqual(len(cache), 0)
+
+    def test_snapshots_pass_through_and_cache_is_bounded(self):
+        cache = ProfileSnapshotCache(max_entries=10)
+        snapshot = FreelancerSnapshot('x', {'Go': 'expert'}, 10, 0, 0)
+        self.assertIs(cache.freelancer(snapshot), snapshot)
+        for freelancer in self.freelancers:
+            cache.freelancer(freelancer)
+        self.assertEqual(len(cache), 10)
+        self.assertFalse(hasattr(snapshot, '__dict__'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 import json
+from unittest import mock
 
 # Set the base directory to the project root
 basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -9,6 +10,11 @@ if basedir not in os.sys.path:
 
 from src.app import create_app
 from src.models import db, User, Project
+from src.market_data import market_data_service
+from src.project import ProjectManager
+from src.match_cache import match_cache
+from src.project_matching import project_matching_engine
+from src.utils import ai_matching_engine
 
 class ProjectTestCase(unittest.TestCase):
     def setUp(self):
@@ -24,11 +30,11 @@ class ProjectTestCase(unittest.TestCase):
         db.drop_all()
         self.app_context.pop()
 
-    def get_token(self):
+    def get_token(self, email='test@example.com'):
         self.client.post(
             '/api/v1/auth/register',
             data=json.dumps({
-                'email': 'test@example.com',
+                'email': email,
                 'password': 'password',
                 'user_type': 'client'
             }),
@@ -37,7 +43,7 @@ class ProjectTestCase(unittest.TestCase):
         response = self.client.post(
             '/api/v1/auth/login',
             data=json.dumps({
-                'email': 'test@example.com',
+                'email': email,
                 'password': 'password'
             }),
             content_type='application/json'
@@ -67,5 +73,236 @@ class ProjectTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json['project']['name'], 'Test Project')
 
+    def test_create_project_queues_matching_job(self):
+        response = self.client.post(
+            '/api/v1/projects/create',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({
+                'name': 'Queued Project',
+                'required_skills': 'python'
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['ai_matches'], [])
+        job_id = response.json['matching_job_id']
+        self.assertIsNotNone(job_id)
+
+        response = self.client.get(
+            f'/api/v1/projects/matching-jobs/{job_id}',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['job']['status'], 'completed')
+        self.assertEqual(response.json['job']['project_id'], Project.query.first().id)
+
+    def test_failed_matching_run_marks_job_failed(self):
+        with mock.patch.object(ai_matching_engine, 'project_data', side_effect=RuntimeError('scoring failed')):
+            response = self.client.post(
+                '/api/v1/projects/create',
+                headers={'Authorization': f'Bearer {self.token}'},
+                data=json.dumps({'name': 'Failing Project'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['matching_status'], 'failed')
+
+        response = self.client.get(
+            f"/api/v1/projects/matching-jobs/{response.json['matching_job_id']}",
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.json['job']['status'], 'failed')
+        self.assertIn('scoring failed', response.json['job']['error'])
+
+    def test_matching_job_is_private_to_project_owner(self):
+        job_id = self.client.post(
+            '/api/v1/projects/create',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({'name': 'Private Project'}),
+            content_type='application/json'
+        ).json['matching_job_id']
+        self.client.post(
+            '/api/v1/auth/register',
+            data=json.dumps({'email': 'other@example.com', 'password': 'password', 'user_type': 'client'}),
+            content_type='application/json'
+        )
+        token = self.client.post(
+            '/api/v1/auth/login',
+            data=json.dumps({'email': 'other@example.com', 'password': 'password'}),
+            content_type='application/json'
+        ).json['token']
+
+        response = self.client.get(
+            f'/api/v1/projects/matching-jobs/{job_id}',
+            headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_missing_matching_job(self):
+        response = self.client.get(
+            '/api/v1/projects/matching-jobs/missing',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_matches_are_cached_until_project_changes(self):
+        db.session.add(User(
+            email='freelancer@example.com', user_type='freelancer', skills='python,sql',
+            experience_years=3, hourly_rate=40, availability_hours_per_week=40
+        ))
+        db.session.commit()
+        response = self.client.post(
+            '/api/v1/projects/create',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({
+                'name': 'Cached Project',
+                'required_skills': 'python,sql',
+                'budget_max': 4000
+            }),
+            content_type='application/json'
+        )
+        project_id = response.json['project_id']
+        headers = {'Authorization': f'Bearer {self.token}'}
+
+        # The matching job already filled the cache
+        response = self.client.get(f'/api/v1/projects/{project_id}/matches', headers=headers)
+        self.assertEqual(response.json['cache'], 'hit')
+        self.assertEqual(response.json['total_matches'], 1)
+        self.assertIn('processing_time_ms', response.json)
+
+        response = self.client.put(
+            f'/api/v1/projects/{project_id}',
+            headers=headers,
+            data=json.dumps({'budget_max': 8000}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f'/api/v1/projects/{project_id}/matches', headers=headers)
+        self.assertEqual(response.json['cache'], 'miss')
+        response = self.client.get(f'/api/v1/projects/{project_id}/matches', headers=headers)
+        self.assertEqual(response.json['cache'], 'hit')
+
+        # A model hot-swap is seen before the cache lookup
+        with mock.patch.object(ai_matching_engine, 'reload_models', side_effect=match_cache.invalidate_pool):
+            response = self.client.get(f'/api/v1/projects/{project_id}/matches', headers=headers)
+        self.assertEqual(response.json['cache'], 'miss')
+
+    def test_batch_matches(self):
+        self.test_create_project()
+        project = Project.query.first()
+        response = self.client.post(
+            '/api/v1/projects/matches/batch',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({'project_ids': [project.id]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['results'], {project.id: []})
+
+        response = self.client.post(
+            '/api/v1/projects/matches/batch',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({'project_ids': []}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            '/api/v1/projects/matches/batch',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({'project_ids': [project.id], 'max_matches': 'ten'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            '/api/v1/projects/matches/batch',
+            headers={'Authorization': f'Bearer {self.token}'},
+            data=json.dumps({'project_ids': [project.id, 7]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_matches_are_private_to_project_owner(self):
+        self.test_create_project()
+        project = Project.query.first()
+        token = self.get_token('other@example.com')
+
+        response = self.client.post(
+            '/api/v1/projects/matches/batch',
+            headers={'Authorization': f'Bearer {token}'},
+            data=json.dumps({'project_ids': [project.id]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_project_events_feed_market_data(self):
+        market_data_service.reset()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = self.client.post(
+            '/api/v1/projects/create',
+            headers=headers,
+            data=json.dumps({'name': 'Market Project', 'required_skills': 'python,sql', 'budget_max': 4000}),
+            content_type='application/json'
+        )
+        project_id = response.json['project_id']
+        self.assertEqual(market_data_service.trending_skills(), ['python', 'sql'])
+        self.assertEqual(market_data_service.average_budget('general'), 4000)
+
+        self.client.put(
+            f'/api/v1/projects/{project_id}',
+            headers=headers,
+            data=json.dumps({'progress_percentage': 100}),
+            content_type='application/json'
+        )
+        self.assertEqual(market_data_service.completion_rate(['sql', 'python']), 1.0)
+
+        # A finished project's outcome is counted once
+        for data in ({'status': 'cancelled'}, {'progress_percentage': 100}):
+            self.client.put(
+                f'/api/v1/projects/{project_id}',
+                headers=headers,
+                data=json.dumps(data),
+                content_type='application/json'
+            )
+        self.assertEqual(market_data_service.skill_set_outcomes[('python', 'sql')], [1, 1])
+
+    def test_cancelled_projects_lower_the_completion_rate(self):
+        market_data_service.reset()
+        manager = ProjectManager()
+        project_ids = [
+            manager.create_project({'name': f'Project {i}', 'required_skills': 'go,rust'})['project_id']
+            for i in range(4)
+        ]
+        manager.update_project(project_ids[0], {'progress_percentage': 100})
+        manager.update_project(project_ids[1], {'status': 'completed'})
+        manager.update_project(project_ids[2], {'status': 'cancelled'})
+        self.assertFalse(manager.update_project(project_ids[3], {'status': 'abandoned'})['success'])
+
+        self.assertEqual(Project.query.get(project_ids[0]).status, 'completed')
+        self.assertAlmostEqual(market_data_service.completion_rate(['rust', 'go']), 2 / 3)
+        self.assertNotIn(project_ids[2], project_matching_engine.project_index)
+
+    def test_project_changes_reach_matching_engine(self):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        project_id = self.client.post(
+            '/api/v1/projects/create',
+            headers=headers,
+            data=json.dumps({'name': 'Indexed Project', 'required_skills': 'python,sql', 'complexity_level': 2}),
+            content_type='application/json'
+        ).json['project_id']
+        self.assertIn(project_id, project_matching_engine.project_index)
+        recommendations = project_matching_engine.recommend_projects_for_user({'skills': ['python', 'sql']}, top_k=100)
+        self.assertIn(project_id, [recommendation['project_id'] for recommendation in recommendations])
+
+        self.client.put(
+            f'/api/v1/projects/{project_id}',
+            headers=headers,
+            data=json.dumps({'progress_percentage': 100}),
+            content_type='application/json'
+        )
+        self.assertNotIn(project_id, project_matching_engine.project_index)
+
 if __name__ == '__main__':
     unittest.main()
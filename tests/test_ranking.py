@@ -0,0 +1,34 @@
+import unittest
+import os
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.ranking import top_k_indices
+
+def reference_top_k(scores, k):
+    return sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
+
+class RankingTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Coarse scores so plenty of ties land on the cut-off
+        self.scores = np.round(rng.random(2000), 2)
+
+    def test_top_k_indices_matches_stable_sort(self):
+        for k in [0, 1, 10, 137, 2000, 5000]:
+            self.assertEqual(top_k_indices(self.scores, k).tolist(), reference_top_k(self.scores.tolist(), k))
+
+    def test_all_scores_tied(self):
+        self.assertEqual(top_k_indices(np.full(50, 0.5), 3).tolist(), [0, 1, 2])
+
+    def test_nan_scores_rank_last(self):
+        scores = np.array([0.2, np.nan, 0.9, -np.inf, np.nan, 0.5])
+        self.assertEqual(top_k_indices(scores, 6).tolist(), [2, 5, 0, 1, 3, 4])
+        self.assertEqual(top_k_indices(scores, 4).tolist(), [2, 5, 0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.scoring_pipeline import ScoringPipeline
+from src.advanced_ai_systems import AdvancedMatchingEngine
+from src.project_matching import ProjectMatchingEngine
+from src.ai_engine import AIMatchingEngine
+from src.performance_optimizer import PerformanceOptimizer
+
+class ScoringPipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = ScoringPipeline(
+            'test', weights={'a': 0.5, 'b': 0.5}, clip=(0.0, 1.0), parameter_names={'skill': 'a'}
+        )
+        self.pipeline.register('a', lambda batch: batch['x'])
+        self.pipeline.register('pair', lambda batch: {'b': batch['x'] * 2, 'unweighted': batch['x'] + 1})
+
+    def test_score_blends_weighted_features(self):
+        scores, features = self.pipeline.score({'x': np.array([0.1, 0.4, 0.9])}, 3)
+        np.testing.assert_allclose(scores, [0.15, 0.6, 1.0])
+        self.assertIn('unweighted', features)
+        np.testing.assert_allclose(self.pipeline.weight_vector, [0.5, 0.5])
+
+    def test_score_one_matches_batch(self):
+        self.assertAlmostEqual(self.pipeline.score_one({'a': 0.4, 'b': 0.8}), 0.6)
+        self.assertEqual(self.pipeline.score_one({'a': 2.0}), 1.0)
+
+    def test_register_with_weight_and_unregister(self):
+        self.pipeline.register('c', lambda batch: np.ones(len(batch['x'])), weight=0.25)
+        scores, _ = self.pipeline.score({'x': np.zeros(2)}, 2)
+        np.testing.assert_allclose(scores, [0.25, 0.25])
+
+        self.pipeline.unregister('c')
+        self.assertNotIn('c', self.pipeline.weights)
+        self.assertEqual([name for name, _ in self.pipeline.stages], ['a', 'pair'])
+
+    def test_apply_parameters_maps_optimizer_names(self):
+        changed = self.pipeline.apply_parameters({'skill_similarity_weight': 0.3, 'budget_weight': 0.9})
+        self.assertEqual(changed, {'a': 0.3})
+        self.assertEqual(self.pipeline.weights, {'a': 0.3, 'b': 0.5})
+
+class EnginePipelineTestCase(unittest.TestCase):
+    def test_optimizer_drives_every_engine(self):
+        advanced, project, ai = AdvancedMatchingEngine(), ProjectMatchingEngine(), AIMatchingEngine()
+        optimizer = PerformanceOptimizer()
+        optimizer.best_parameters['matching_engine'] = {
+            'skill_similarity_weight': 0.45,
+            'experience_weight': 0.3,
+            'budget_weight': 0.15,
+            'success_prediction_weight': 0.1
+        }
+        optimizer.apply_matching_parameters(advanced, project, ai)
+
+        self.assertEqual(advanced.feature_weights['skill_similarity'], 0.45)
+        self.assertEqual(advanced.feature_weights['success_prediction'], 0.1)
+        self.assertEqual(project.candidate_pipeline.weights['budget_score'], 0.15)
+        self.assertEqual(project.recommendation_pipeline.weights['experience_score'], 0.3)
+        self.assertEqual(ai.scoring_pipeline.weights['skill_match_score'], 0.45)
+
+    def test_feature_weights_setter_reweights_batch_and_scalar_paths(self):
+        engine = AdvancedMatchingEngine()
+        engine.feature_weights = {'experience_match': 1.0}
+        freelancers = [
+            {'id': 'a', 'skills': ['python'], 'experience_years': 1, 'hourly_rate': 50,
+             'availability_hours_per_week': 40, 'location': '', 'completion_rate': 0.9},
+            {'id': 'b', 'skills': ['python'], 'experience_years': 6, 'hourly_rate': 50,
+             'availability_hours_per_week': 40, 'location': '', 'completion_rate': 0.9}
+        ]
+        project = {'required_skills': ['python'], 'complexity_level': 3, 'urgency_level': 1,
+                   'budget_max': 5000, 'estimated_hours': 40}
+
+        engine.skill_index.fit({'a': 'python', 'b': 'python'})
+
+        scores = engine.calculate_match_scores(freelancers, project)
+        np.testing.assert_allclose(scores, [1 / 6, 1.0])
+        self.assertAlmostEqual(engine.calculate_match_score(freelancers[0], project), 1 / 6)
+
+    def test_custom_stage_joins_candidate_scoring(self):
+        engine = ProjectMatchingEngine()
+        users = [
+            {'id': 'u1', 'skills': ['python'], 'languages': ['english']},
+            {'id': 'u2', 'skills': ['python'], 'languages': ['arabic', 'english']}
+        ]
+        project = {'id': 'p1', 'title': 'API', 'required_skills': ['python']}
+        self.assertEqual(engine.find_best_matches(project, users, top_k=1)[0]['user_id'], 'u1')
+
+        engine.candidate_pipeline.register(
+            'arabic_speaker',
+            lambda batch: np.array([
+                1.0 if 'arabic' in features['languages'] else 0.0 for features in batch['users_features']
+            ]),
+            weight=0.05
+        )
+        self.assertEqual(engine.find_best_matches(project, users, top_k=1)[0]['user_id'], 'u2')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import os
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.skill_registry import SkillRegistry, skill_match_scores, bitset_skill_scores, pack_skill_ids, popcount
+from src.project_matching import ProjectMatchingEngine
+
+class SkillRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = SkillRegistry()
+
+    def test_aliases_share_one_id(self):
+        self.assertEqual(self.registry.intern('Node.js'), self.registry.intern('nodejs'))
+        self.assertEqual(self.registry.intern(' Machine   Learning '), self.registry.intern('ML'))
+        self.assertEqual(self.registry.canonical('K8s'), 'kubernetes')
+        self.assertEqual(len(self.registry), 2)
+
+    def test_ids_are_stable_and_sorted(self):
+        first = self.registry.skill_ids(['sql', 'python'], add=True)
+        second = self.registry.skill_ids('Python, SQL, Docker', add=True)
+        np.testing.assert_array_equal(first, [0, 1])
+        np.testing.assert_array_equal(second, [0, 1, 2])
+        self.assertEqual(self.registry.name(2), 'docker')
+
+    def test_parse_stored_forms(self):
+        self.assertEqual(self.registry.parse('{"python": "expert", "sql": "beginner"}'), ['python', 'sql'])
+        self.assertEqual(self.registry.parse('["go"]'), ['go'])
+        self.assertEqual(self.registry.parse('go,rust'), ['go', 'rust'])
+        self.assertEqual(self.registry.parse({'react': 'advanced'}), ['react'])
+        self.assertEqual(self.registry.parse(None), [])
+
+    def test_lookup_does_not_intern(self):
+        self.assertEqual(len(self.registry.skill_ids(['cobol'])), 0)
+        self.assertNotIn('cobol', self.registry)
+
+    def test_local_ids_do_not_intern(self):
+        self.registry.intern('python')
+        scratch = {}
+        first, second = self.registry.local_ids([['Python', 'COBOL'], ['cobol', 'fortran']], scratch)
+        np.testing.assert_array_equal(first, [0, 1])
+        np.testing.assert_array_equal(second, [1, 2])
+        self.assertEqual(len(self.registry), 1)
+
+        # Skills learned after base keep their temporary ids
+        self.registry.intern('cobol')
+        np.testing.assert_array_equal(self.registry.local_ids([['cobol', 'go']], dict(scratch), 1)[0], [1, 3])
+
+    def test_scoring_unknown_skills_leaves_registry_unchanged(self):
+        from src.skill_registry import skill_registry
+        engine = ProjectMatchingEngine()
+        users = [{'id': 'u1', 'skills': ['python', 'unscored-skill-a']}, {'id': 'u2', 'skills': ['unscored-skill-b']}]
+        project = {'title': 'Legacy port', 'required_skills': ['python', 'unscored-skill-b']}
+        size = len(skill_registry)
+
+        self.assertEqual(engine.calculate_skill_match_score(['unscored-skill-b'], ['unscored-skill-b']), 1.0)
+        engine.find_best_matches(project, users)
+        engine.recommend_projects_for_user(users[1], [project])
+        team = engine.assemble_team(project, users, team_size=2)
+        self.assertEqual(len(skill_registry), size)
+        self.assertEqual((team['covered_skills'], team['required_skills']), (2, 2))
+
+    def test_pool_scores_match_scalar_score(self):
+        rng = np.random.default_rng(11)
+        skills = ['Python', 'sql', 'React', 'reactjs', 'Docker', 'k8s', 'Kubernetes', 'Go', 'golang', 'NLP']
+        pool = [list(rng.choice(skills, rng.integers(0, 5), replace=False)) for _ in range(300)]
+        engine = ProjectMatchingEngine()
+
+        for _ in range(20):
+            required = list(rng.choice(skills, rng.integers(0, 4), replace=False))
+            jaccard, coverage = skill_match_scores(
+                self.registry.skill_matrix(self.registry.skill_ids(user_skills, add=True) for user_skills in pool),
+                self.registry.skill_ids(required, add=True)
+            )
+            expected = [engine.calculate_skill_match_score(required, user_skills) for user_skills in pool]
+            np.testing.assert_allclose(0.6 * jaccard + 0.4 * coverage, expected, rtol=0, atol=1e-15)
+
+class BitsetScoringTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = SkillRegistry()
+        self.rng = np.random.default_rng(17)
+        self.skills = [f'skill-{i}' for i in range(150)]
+
+    def random_pool(self, size):
+        return [list(self.rng.choice(self.skills, self.rng.integers(0, 8), replace=False)) for _ in range(size)]
+
+    def test_pack_and_popcount(self):
+        bits = pack_skill_ids([np.array([0, 63, 64, 130]), np.array([], dtype=np.int32)], 3)
+        self.assertEqual(bits.dtype, np.uint64)
+        np.testing.assert_array_equal(popcount(bits), [4, 0])
+        self.assertEqual(int(bits[0, 0]), (1 << 63) | 1)
+        self.assertEqual(int(bits[0, 2]), 1 << 2)
+
+    def test_kernel_matches_scalar_score(self):
+        pool = self.random_pool(400)
+        engine = ProjectMatchingEngine()
+        freelancer_bits = self.registry.bitsets(self.registry.skill_ids(user_skills, add=True) for user_skills in pool)
+
+        for _ in range(20):
+            required = list(self.rng.choice(self.skills, self.rng.integers(0, 5), replace=False))
+            project_bits = self.registry.bitsets([self.registry.skill_ids(required, add=True)])[0]
+            jaccard, coverage, blend = bitset_skill_scores(freelancer_bits, project_bits)
+
+            expected = [engine.calculate_skill_match_score(required, user_skills) for user_skills in pool]
+            np.testing.assert_allclose(blend, expected, rtol=0, atol=1e-15)
+            np.testing.assert_allclose(blend, 0.6 * jaccard + 0.4 * coverage)
+
+    def test_bitsets_packed_before_registry_grew(self):
+        pool = [['python', 'sql'], ['go'], []]
+        freelancer_bits = self.registry.bitsets(self.registry.skill_ids(user_skills, add=True) for user_skills in pool)
+        for i in range(100):
+            self.registry.intern(f'late-skill-{i}')
+        project_bits = self.registry.bitsets([self.registry.skill_ids(['sql', 'late-skill-99'], add=True)])[0]
+        self.assertGreater(project_bits.shape[0], freelancer_bits.shape[1])
+
+        jaccard, coverage, _ = bitset_skill_scores(freelancer_bits, project_bits)
+        np.testing.assert_allclose(jaccard, [1 / 3, 0, 0])
+        np.testing.assert_allclose(coverage, [0.5, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import itertools
+import numpy as np
+
+# Set the base directory to the project root
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if basedir not in os.sys.path:
+    os.sys.path.insert(0, basedir)
+
+from src.skill_registry import SkillRegistry
+from src.team_assembly import TeamCandidatePool, assemble_team
+from src.project_matching import ProjectMatchingEngine
+
+class TeamAssemblyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = SkillRegistry()
+        self.rng = np.random.default_rng(5)
+        self.skills = [f'skill-{i}' for i in range(90)]
+
+    def random_users(self, size):
+        return [
+            {'id': f'u{i}', 'skills': list(self.rng.choice(self.skills, self.rng.integers(0, 6), replace=False)),
+             'hourly_rate': int(self.rng.integers(10, 100))}
+            for i in range(size)
+        ]
+
+    def coverage(self, users, required):
+        covered = set()
+        for user in users:
+            covered.update(self.registry.canonical(skill) for skill in user['skills'])
+        return len(covered & {self.registry.canonical(skill) for skill in required})
+
+    def test_greedy_is_within_bound_of_best_team(self):
+        for _ in range(10):
+            users = self.random_users(14)
+            required = list(self.rng.choice(self.skills, 12, replace=False))
+            pool = TeamCandidatePool.from_users(users, self.registry)
+            selection = pool.assemble(required, 3)
+
+            best = max(self.coverage(team, required) for team in itertools.combinations(users, 3))
+            chosen = [users[position] for position in selection['positions']]
+            self.assertEqual(selection['covered_skills'], self.coverage(chosen, required))
+            self.assertGreaterEqual(selection['covered_skills'], (1 - 1 / np.e) * best)
+            self.assertGreaterEqual(pool.assemble(required, 3, beam_width=4)['covered_skills'], (1 - 1 / np.e) * best)
+
+    def test_budget_is_respected(self):
+        users = self.random_users(200)
+        required = list(self.rng.choice(self.skills, 8, replace=False))
+        pool = TeamCandidatePool.from_users(users, self.registry)
+        for budget in (500, 4000, 20000):
+            selection = pool.assemble(required, 5, budget=budget, duration_weeks=2, beam_width=3)
+            cost = sum(users[position]['hourly_rate'] for position in selection['positions']) * 40 * 2
+            self.assertLessEqual(cost, budget)
+            self.assertEqual(selection['estimated_total_cost'], cost)
+
+    def test_prefers_cheaper_member_on_equal_coverage(self):
+        bits = self.registry.bitsets([self.registry.skill_ids(['a'], add=True), self.registry.skill_ids(['a'], add=True)])
+        project_bits = self.registry.bitsets([self.registry.skill_ids(['a'], add=True)])[0]
+        selection = assemble_team(bits, np.array([80.0, 30.0]), project_bits, 1)
+        self.assertEqual(selection['positions'], [1])
+
+    def test_unknown_required_skills_count_against_coverage(self):
+        pool = TeamCandidatePool.from_users([{'id': 'u1', 'skills': ['python']}], self.registry)
+        selection = pool.assemble(['python', 'cobol'], 2)
+        self.assertEqual((selection['covered_skills'], selection['required_skills']), (1, 2))
+
+    def test_engine_assembles_and_analyzes_team(self):
+        engine = ProjectMatchingEngine()
+        users = [
+            {'id': 'u1', 'skills': ['Python', 'NLP'], 'hourly_rate': 40, 'experience_years': 4},
+            {'id': 'u2', 'skills': ['python'], 'hourly_rate': 20, 'experience_years': 2},
+            {'id': 'u3', 'skills': ['React', 'nodejs'], 'hourly_rate': 35, 'experience_years': 6},
+            {'id': 'u4', 'skills': ['Docker'], 'hourly_rate': 90, 'experience_years': 9}
+        ]
+        project = {'title': 'Chatbot', 'required_skills': ['python', 'nlp', 'react', 'Node.js'],
+                   'budget_range': 12000, 'duration_weeks': 4, 'team_size': 2}
+
+        team = engine.assemble_team(project, users)
+        self.assertEqual(team['user_ids'], ['u3', 'u1'])
+        self.assertEqual(team['analysis']['skill_coverage_percentage'], 1.0)
+        self.assertEqual(team['analysis']['estimated_total_cost'], team['estimated_total_cost'])
+
+if __name__ == '__main__':
+    unittest.main()